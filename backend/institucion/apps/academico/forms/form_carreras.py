@@ -1,6 +1,9 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from apps.core.form_abstract import BaseForm
+from apps.core.lookup_table import LookupChoiceField
+from apps.core.validation_context import UniqueNameContext
+from ..validators import normalizar_nombre
 from ..models import Modalidad, Carrera
 
 class CarreraForm(BaseForm):
@@ -11,6 +14,8 @@ class CarreraForm(BaseForm):
     class Meta:
         model = Carrera
         fields = ['nombre', 'modalidad']
+        # Resuelve la modalidad con la tabla en memoria (sin consultas)
+        field_classes = {'modalidad': LookupChoiceField}
         widgets = {
             'nombre': forms.TextInput(attrs={
                 'placeholder': 'Ingrese el nombre de la carrera',
@@ -41,6 +46,15 @@ class CarreraForm(BaseForm):
         # Personalizar el texto vacío del select
         self.fields['modalidad'].empty_label = "Seleccione una modalidad"
 
+    @classmethod
+    def build_validation_context(cls, rows):
+        """Colisiones de nombre de todo el lote en una sola consulta (con el nombre ya normalizado)."""
+        return UniqueNameContext(
+            Carrera,
+            [normalizar_nombre(row.get('nombre')) for row in rows],
+            values=['modalidad__nombre']
+        )
+
     def clean_nombre(self):
         """
         Validación adicional del campo nombre.
@@ -82,16 +96,17 @@ class CarreraForm(BaseForm):
         modalidad = cleaned_data.get('modalidad')
         
         if nombre:
-            queryset = Carrera.all_objects.filter(nombre__iexact=nombre)
-            
-            if self.instance and self.instance.pk:
-                queryset = queryset.exclude(pk=self.instance.pk)
+            # Una sola consulta: la colisión ya trae el nombre de su modalidad
+            context = self.get_validation_context()
+            carrera_existente = context.conflicto(nombre, exclude_pk=self.instance.pk)
             
-            if queryset.exists():
-                carrera_existente = queryset.first()
+            if carrera_existente:
                 raise ValidationError(
-                    f'Ya existe la carrera "{nombre}" con la modalidad "{carrera_existente.modalidad.nombre}". '
+                    f'Ya existe la carrera "{nombre}" con la modalidad "{carrera_existente["modalidad__nombre"]}". '
                     'No se puede tener el mismo nombre de carrera con múltiples modalidades.'
                 )
+            
+            if modalidad:
+                context.registrar(nombre, pk=self.instance.pk, modalidad__nombre=modalidad.nombre)
         
         return cleaned_data
\ No newline at end of file
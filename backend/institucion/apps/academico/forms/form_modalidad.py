@@ -1,6 +1,8 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from apps.core.form_abstract import BaseForm
+from apps.core.validation_context import UniqueNameContext
+from ..validators import normalizar_nombre
 from ..models import Modalidad, Carrera
 
 
@@ -9,6 +11,9 @@ class ModalidadForm(BaseForm):
     Formulario para gestionar modalidades académicas.
     """
     
+    # La unicidad de nombre (sin distinguir mayúsculas) la valida clean_nombre
+    unique_fields_in_context = ('nombre',)
+    
     class Meta:
         model = Modalidad
         fields = ['nombre']
@@ -25,6 +30,11 @@ class ModalidadForm(BaseForm):
             'nombre': 'Nombre único de la modalidad (mínimo 3 caracteres)'
         }
 
+    @classmethod
+    def build_validation_context(cls, rows):
+        """Colisiones de nombre de todo el lote en una sola consulta (con el nombre ya normalizado)."""
+        return UniqueNameContext(Modalidad, [normalizar_nombre(row.get('nombre')) for row in rows])
+
     def clean_nombre(self):
         """
         Validación adicional del campo nombre.
@@ -38,12 +48,18 @@ class ModalidadForm(BaseForm):
         
         nombre = nombre.title()
         
-        queryset = Modalidad.all_objects.filter(nombre__iexact=nombre)
-        
-        if self.instance and self.instance.pk:
-            queryset = queryset.exclude(pk=self.instance.pk)
-        
-        if queryset.exists():
+        context = self.get_validation_context()
+        if context.conflicto(nombre, exclude_pk=self.instance.pk):
             raise ValidationError('Ya existe una modalidad con este nombre.')
         
-        return nombre
\ No newline at end of file
+        context.registrar(nombre, pk=self.instance.pk)
+        
+        return nombre
+
+    def post_save(self, instance):
+        """
+        Si cambió el nombre, actualiza el texto de búsqueda de sus carreras.
+        """
+        # initial solo tiene valores al editar (is_updating ya es True tras guardar)
+        if self.initial.get('nombre') and self.has_changed_field('nombre'):
+            instance.sincronizar_carreras()
@@ -0,0 +1,108 @@
+from apps.core.importacion import BaseImportador
+from apps.core.lookup_table import registros_por_clave
+from apps.core.validation_context import UniqueNameContext, clave_nombre
+from .models import Carrera, Modalidad
+from .validators import MENSAJES, normalizar_nombre, validar_nombres
+
+
+class NombreImportadorMixin:
+    """Validación de nombre compartida por los importadores del módulo."""
+
+    def errores_de_nombre(self, nombre, codigos):
+        if not nombre:
+            return ['El nombre no puede estar vacío.']
+        if codigos:
+            return [str(MENSAJES[codigo]) for codigo in codigos]
+        max_length = self.model._meta.get_field('nombre').max_length
+        if len(nombre) > max_length:
+            return [f'El nombre no puede superar {max_length} caracteres.']
+        return []
+
+
+class ModalidadImportador(NombreImportadorMixin, BaseImportador):
+    """Columnas: nombre."""
+    model = Modalidad
+    # Modalidad.nombre es único en la base de datos
+    ignore_conflicts = True
+    campo_conflicto = 'nombre'
+
+    def preparar(self):
+        self.vistos = set()
+
+    def validar_lote(self, lote):
+        nombres = [normalizar_nombre(fila.get('nombre')) for _, fila in lote]
+        codigos = validar_nombres(nombres)
+        context = UniqueNameContext(Modalidad, nombres)
+
+        resultado = []
+        for (numero, _), nombre, codigos_nombre in zip(lote, nombres, codigos):
+            errores = self.errores_de_nombre(nombre, codigos_nombre)
+            if errores:
+                resultado.append((numero, None, {'nombre': errores}))
+                continue
+
+            clave = clave_nombre(nombre)
+            if clave in self.vistos or context.conflicto(nombre):
+                if self.conflictos == 'omitir':
+                    resultado.append((numero, None, None))
+                else:
+                    resultado.append((numero, None, {'nombre': ['Ya existe una modalidad con este nombre.']}))
+                continue
+
+            self.vistos.add(clave)
+            resultado.append((numero, Modalidad(nombre=nombre), None))
+        return resultado
+
+
+class CarreraImportador(NombreImportadorMixin, BaseImportador):
+    """
+    Columnas: nombre, modalidad (nombre de una modalidad activa).
+    Las modalidades activas se cargan una vez (de la tabla en memoria si
+    está disponible).
+    """
+    model = Carrera
+
+    def preparar(self):
+        self.modalidades = registros_por_clave(Modalidad, activo=True)
+        self.vistos = {}
+
+    def validar_lote(self, lote):
+        nombres = [normalizar_nombre(fila.get('nombre')) for _, fila in lote]
+        codigos = validar_nombres(nombres)
+        context = UniqueNameContext(Carrera, nombres, values=['modalidad__nombre'])
+
+        resultado = []
+        for (numero, fila), nombre, codigos_nombre in zip(lote, nombres, codigos):
+            errores = {}
+            errores_nombre = self.errores_de_nombre(nombre, codigos_nombre)
+            if errores_nombre:
+                errores['nombre'] = errores_nombre
+
+            modalidad = self.modalidades.get(clave_nombre(fila.get('modalidad')))
+            if modalidad is None:
+                errores['modalidad'] = [
+                    f'La modalidad "{fila.get("modalidad") or ""}" no existe o está inactiva.'
+                ]
+
+            if errores:
+                resultado.append((numero, None, errores))
+                continue
+
+            clave = clave_nombre(nombre)
+            existente = context.conflicto(nombre)
+            modalidad_existente = existente['modalidad__nombre'] if existente else self.vistos.get(clave)
+            if modalidad_existente:
+                if self.conflictos == 'omitir':
+                    resultado.append((numero, None, None))
+                else:
+                    resultado.append((numero, None, {'__all__': [
+                        f'Ya existe la carrera "{nombre}" con la modalidad "{modalidad_existente}". '
+                        'No se puede tener el mismo nombre de carrera con múltiples modalidades.'
+                    ]}))
+                continue
+
+            self.vistos[clave] = modalidad.nombre
+            carrera = Carrera(nombre=nombre, modalidad=modalidad)
+            carrera.actualizar_campos_derivados()
+            resultado.append((numero, carrera, None))
+        return resultado
@@ -0,0 +1,326 @@
+import datetime
+import json
+import math
+import platform
+import subprocess
+import time
+from urllib.parse import urlencode
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from apps.academico.forms.form_carreras import CarreraForm
+from apps.academico.forms.form_modalidad import ModalidadForm
+from apps.academico.management.commands.benchmark_write_path import nombre_para
+from apps.academico.models import Carrera, Modalidad
+from apps.academico.serializers.serializer_carreras import CarreraSerializer
+from apps.academico.views.view_carreras import CarreraViewSet
+from apps.academico.views.view_modalidad import ModalidadViewSet
+from apps.core.columnar import a_columnas
+from apps.core.fast_serializer import get_representation_plan
+from apps.core.instrumentation import RequestMetrics
+
+# Prefijos de nombre de carrera: 'Ingenieria' es frecuente (búsqueda con
+# muchos resultados) y el resto se reparte para búsquedas más selectivas
+PREFIJOS = ['Ingenieria', 'Ingenieria', 'Licenciatura', 'Tecnologia', 'Administracion', 'Medicina']
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano sobre una lista ordenada."""
+    if not valores:
+        return None
+    indice = max(math.ceil(p / 100 * len(valores)) - 1, 0)
+    return valores[indice]
+
+
+def resumir(segundos, consultas):
+    ordenados = sorted(segundos)
+    total = sum(ordenados)
+    return {
+        'n': len(ordenados),
+        'p50_ms': round(percentil(ordenados, 50) * 1000, 3),
+        'p99_ms': round(percentil(ordenados, 99) * 1000, 3),
+        'media_ms': round(total / len(ordenados) * 1000, 3),
+        'ops_por_segundo': round(len(ordenados) / total, 1) if total else None,
+        'consultas_por_op': round(consultas / len(ordenados), 2),
+    }
+
+
+def commit_actual():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Suite de benchmarks del módulo académico: siembra el volumen indicado '
+        'de modalidades y carreras y mide p50/p99 y throughput de datatable '
+        '(offsets, cursor y búsquedas), por_modalidad, create/update por '
+        'formularios, restore y serialización. Todo se ejecuta en una '
+        'transacción que se revierte al final. Imprime JSON; con --salida lo '
+        'guarda y con --comparar lo contrasta con un resultado anterior.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modalidades', type=int, default=10)
+        parser.add_argument('--carreras', type=int, default=10000)
+        parser.add_argument('--iteraciones', type=int, default=50)
+        parser.add_argument('--calentamiento', type=int, default=5)
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument('--con-cache', action='store_true',
+                            help='Mantiene la cache de respuestas y los GET condicionales.')
+        parser.add_argument('--salida', help='Archivo donde guardar el JSON.')
+        parser.add_argument('--comparar', help='JSON de una ejecución anterior.')
+        parser.add_argument('--tolerancia', type=float, default=0.2,
+                            help='Aumento relativo de p50 que se reporta como regresión.')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.factory = APIRequestFactory()
+        self.iteraciones = options['iteraciones']
+        self.calentamiento = options['calentamiento']
+        limit = options['limit']
+
+        with transaction.atomic():
+            inicio = time.perf_counter()
+            modalidades, carreras = self.sembrar(options['modalidades'], options['carreras'])
+            segundos_siembra = time.perf_counter() - inicio
+
+            total = len(carreras)
+            ultima = carreras[-1]
+            resultados = {}
+
+            for offset in sorted({0, total // 2, max(total - limit, 0)}):
+                resultados[f'datatable.offset_{offset}'] = self.medir_vista(
+                    CarreraViewSet, 'datatable', f'/?limit={limit}&offset={offset}'
+                )
+            resultados['datatable.cursor'] = self.medir_vista(
+                CarreraViewSet, 'datatable', f'/?limit={limit}&cursor='
+            )
+            busquedas = {
+                'frecuente': 'ingenieria',
+                'selectiva': ultima.nombre,
+                'sin_resultados': 'zzzz',
+            }
+            for nombre, termino in busquedas.items():
+                resultados[f'datatable.search_{nombre}'] = self.medir_vista(
+                    CarreraViewSet, 'datatable', '/?' + urlencode({'limit': limit, 'search': termino})
+                )
+            resultados['modalidades.datatable'] = self.medir_vista(
+                ModalidadViewSet, 'datatable', f'/?limit={limit}'
+            )
+            resultados['por_modalidad'] = self.medir_vista(
+                CarreraViewSet, 'por_modalidad', f'/?modalidad_id={modalidades[-1].pk}'
+            )
+
+            resultados['restore'] = self.medir_restore(carreras)
+            resultados.update(self.medir_formularios(modalidades, carreras))
+            resultados.update(self.medir_serializacion(limit))
+
+            transaction.set_rollback(True)
+
+        reporte = {
+            'meta': {
+                'commit': commit_actual(),
+                'fecha': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                'vendor': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'modalidades': len(modalidades),
+                'carreras': total,
+                'iteraciones': self.iteraciones,
+                'limit': limit,
+                'con_cache': options['con_cache'],
+                'segundos_siembra': round(segundos_siembra, 3),
+            },
+            'resultados': resultados,
+        }
+
+        contenido = json.dumps(reporte, indent=2, ensure_ascii=False)
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                archivo.write(contenido + '\n')
+        self.stdout.write(contenido)
+
+        if options['comparar']:
+            self.comparar(reporte, options['comparar'], options['tolerancia'])
+
+    # --------------------------------------
+    # Datos
+
+    def sembrar(self, cantidad_modalidades, cantidad_carreras):
+        modalidades = Modalidad.objects.bulk_create([
+            Modalidad(nombre=nombre_para(i, 'Modalidad Bench'))
+            for i in range(cantidad_modalidades)
+        ])
+        if not modalidades[0].pk:
+            # Backends sin RETURNING en bulk_create
+            modalidades = list(Modalidad.objects.filter(nombre__startswith='Modalidad Bench').order_by('id'))
+
+        carreras = []
+        for i in range(cantidad_carreras):
+            carrera = Carrera(
+                nombre=nombre_para(i, PREFIJOS[i % len(PREFIJOS)]),
+                modalidad=modalidades[i % len(modalidades)],
+            )
+            carrera.actualizar_campos_derivados()
+            carreras.append(carrera)
+        Carrera.objects.bulk_create(carreras, batch_size=1000)
+
+        ids_modalidades = [m.pk for m in modalidades]
+        carreras = list(Carrera.objects.filter(modalidad_id__in=ids_modalidades).order_by('id'))
+        return modalidades, carreras
+
+    # --------------------------------------
+    # Medición
+
+    def medir(self, operacion, preparar=None):
+        """
+        Ejecuta `operacion` calentamiento + iteraciones veces; solo mide las
+        iteraciones. `preparar(i)` corre antes de cada una, fuera del tiempo.
+        """
+        segundos = []
+        consultas = 0
+        metricas = RequestMetrics()
+        for i in range(self.calentamiento + self.iteraciones):
+            argumento = preparar(i) if preparar else None
+            consultas_previas = metricas.consultas
+            with connection.execute_wrapper(metricas):
+                inicio = time.perf_counter()
+                operacion(argumento)
+                transcurrido = time.perf_counter() - inicio
+            if i >= self.calentamiento:
+                segundos.append(transcurrido)
+                consultas += metricas.consultas - consultas_previas
+        return resumir(segundos, consultas)
+
+    def vista(self, viewset, metodo, accion):
+        initkwargs = {}
+        if not self.options['con_cache']:
+            initkwargs = {'cache_responses': False, 'conditional_get': False}
+        return viewset.as_view({metodo: accion}, **initkwargs)
+
+    def medir_vista(self, viewset, accion, url):
+        vista = self.vista(viewset, 'get', accion)
+
+        def operacion(_):
+            response = vista(self.factory.get(url))
+            response.render()
+            if response.status_code >= 400:
+                raise CommandError(f'{accion} {url}: {response.status_code} {response.content[:200]!r}')
+
+        return self.medir(operacion)
+
+    def medir_restore(self, carreras):
+        vista = self.vista(CarreraViewSet, 'patch', 'restore')
+        objetivos = carreras[:self.calentamiento + self.iteraciones]
+
+        def preparar(i):
+            carrera = objetivos[i % len(objetivos)]
+            Carrera.all_objects.filter(pk=carrera.pk).update(estado=False)
+            return carrera.pk
+
+        def operacion(pk):
+            response = vista(self.factory.patch('/'), pk=pk)
+            response.render()
+
+        return self.medir(operacion, preparar)
+
+    def medir_formularios(self, modalidades, carreras):
+        """create/update a través de save_with_transaction, como los viewsets."""
+        modalidad = modalidades[0]
+        editable = carreras[-1]
+        modalidad_editable = modalidades[-1]
+
+        def guardar(form):
+            if not form.is_valid():
+                raise CommandError(f'Formulario inválido: {form.get_errors_as_dict()}')
+            form.save_with_transaction()
+
+        return {
+            'form.create_carrera': self.medir(
+                guardar,
+                lambda i: CarreraForm(data={'nombre': nombre_para(i, 'Bench Nueva'), 'modalidad': modalidad.pk}),
+            ),
+            'form.update_carrera': self.medir(
+                guardar,
+                lambda i: CarreraForm(
+                    data={'nombre': nombre_para(i, 'Bench Editada'), 'modalidad': modalidad.pk},
+                    instance=Carrera.objects.get(pk=editable.pk),
+                ),
+            ),
+            'form.create_modalidad': self.medir(
+                guardar,
+                lambda i: ModalidadForm(data={'nombre': nombre_para(i, 'Bench Modalidad')}),
+            ),
+            'form.update_modalidad': self.medir(
+                guardar,
+                lambda i: ModalidadForm(
+                    data={'nombre': nombre_para(i, 'Bench Renombrada')},
+                    instance=Modalidad.objects.get(pk=modalidad_editable.pk),
+                ),
+            ),
+        }
+
+    def medir_serializacion(self, limit):
+        """
+        Solo representación: instancias vs plan compilado, sin consultas.
+        Los casos render_json incluyen además la codificación JSON de la
+        página en layout objects y columnar.
+        """
+        resultados = {}
+        renderer = JSONRenderer()
+        for tamano in sorted({limit, 100, 1000}):
+            instancias = list(Carrera.objects.all()[:tamano])
+            plan = get_representation_plan(CarreraSerializer, 'datatable')
+            filas = Carrera.objects.datatable(fields=plan.paths, limit=tamano, as_tuples=True)['data']
+            resultados[f'serializer.instancias_{tamano}'] = self.medir(
+                lambda _: CarreraSerializer(instancias, many=True, context={'action': 'datatable'}).data
+            )
+            resultados[f'serializer.plan_{tamano}'] = self.medir(lambda _: plan.render(filas))
+            resultados[f'serializer.columnar_{tamano}'] = self.medir(lambda _: plan.render_columnar(filas))
+            resultados[f'render_json.objects_{tamano}'] = self.medir(
+                lambda _: renderer.render({'total': tamano, 'data': plan.render(filas)})
+            )
+            resultados[f'render_json.columnar_{tamano}'] = self.medir(
+                lambda _: renderer.render(a_columnas({'total': tamano}, *plan.render_columnar(filas)))
+            )
+        return resultados
+
+    # --------------------------------------
+    # Comparación
+
+    def comparar(self, reporte, ruta, tolerancia):
+        with open(ruta, encoding='utf-8') as archivo:
+            anterior = json.load(archivo)
+
+        self.stdout.write(
+            f"\nComparación con {anterior['meta'].get('commit') or ruta} "
+            f"(tolerancia {tolerancia:.0%}):"
+        )
+        regresiones = []
+        for caso, actual in reporte['resultados'].items():
+            previo = anterior['resultados'].get(caso)
+            if not previo:
+                continue
+            cambio = (actual['p50_ms'] - previo['p50_ms']) / previo['p50_ms'] if previo['p50_ms'] else 0
+            marca = ''
+            if cambio > tolerancia or actual['consultas_por_op'] > previo['consultas_por_op']:
+                marca = '  <-- regresión'
+                regresiones.append(caso)
+            self.stdout.write(
+                f"  {caso:<36} p50 {previo['p50_ms']:>9.3f} -> {actual['p50_ms']:>9.3f} ms "
+                f"({cambio:+.0%}), consultas {previo['consultas_por_op']} -> {actual['consultas_por_op']}{marca}"
+            )
+
+        if regresiones:
+            self.stdout.write(self.style.WARNING(f'{len(regresiones)} regresiones: {", ".join(regresiones)}'))
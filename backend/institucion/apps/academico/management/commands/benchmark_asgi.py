@@ -0,0 +1,294 @@
+import asyncio
+import datetime
+import io
+import json
+import platform
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import close_old_connections, connection
+from django.test.utils import override_settings
+
+from apps.academico.management.commands.benchmark_api import PREFIJOS, commit_actual, resumir
+from apps.academico.management.commands.benchmark_write_path import nombre_para
+from apps.academico.models import Carrera, Modalidad
+
+PREFIJO_API = '/api/academico/'
+PREFIJO_ASYNC = PREFIJO_API + 'async/'
+HOST = 'localhost'
+
+# Rutas de lectura; {modalidad} y {carrera} se completan con datos existentes
+RUTAS = [
+    'carreras/datatable?limit=10',
+    'carreras/datatable?limit=10&search=ingenieria',
+    'carreras/por_modalidad?modalidad_id={modalidad}',
+    'carreras/{carrera}',
+    'modalidades/datatable?limit=10',
+]
+
+CONSULTAS = re.compile(r'desc="(\d+) consultas"')
+
+
+def consultas_de(server_timing):
+    match = CONSULTAS.search(server_timing or '')
+    return int(match.group(1)) if match else 0
+
+
+class Command(BaseCommand):
+    help = (
+        'Prueba de carga de las lecturas del catálogo: compara el throughput '
+        'y p50/p99 de las rutas síncronas bajo WSGI (hilos), las mismas bajo '
+        'ASGI y las rutas /async/ bajo ASGI, con la concurrencia indicada. '
+        'Los handlers abren sus propias conexiones, por lo que los datos deben '
+        'estar confirmados: --sembrar (junto con --permitir-escritura) crea '
+        'carreras de prueba y las elimina al terminar. Imprime JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrencia', type=int, default=8)
+        parser.add_argument('--solicitudes', type=int, default=400,
+                            help='Solicitudes medidas por escenario.')
+        parser.add_argument('--calentamiento', type=int, default=20)
+        parser.add_argument('--sembrar', type=int, default=0,
+                            help='Carreras de prueba a crear (se eliminan al terminar).')
+        parser.add_argument('--permitir-escritura', action='store_true',
+                            help='Confirma que --sembrar puede escribir en la base de datos configurada.')
+        parser.add_argument('--con-cache', action='store_true',
+                            help='Mantiene la cache de respuestas.')
+        parser.add_argument('--salida', help='Archivo donde guardar el JSON.')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise CommandError('La prueba de carga requiere una base de datos compartida entre hilos.')
+
+        self.comprobar_escritura(options)
+        self.concurrencia = options['concurrencia']
+        self.solicitudes = options['solicitudes']
+        self.calentamiento = options['calentamiento']
+
+        modalidad = None
+        if options['sembrar']:
+            modalidad = self.sembrar(options['sembrar'])
+        try:
+            rutas = self.rutas()
+            ajustes = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, HOST]}
+            if options['con_cache']:
+                # Un solo proceso: la cache local alcanza para invalidar
+                ajustes['CACHE_SHARED'] = True
+            else:
+                ajustes['RESPONSE_CACHE_TIMEOUT'] = 0
+            with override_settings(**ajustes):
+                resultados = {
+                    'wsgi.sync': self.medir_wsgi(get_wsgi_application(), PREFIJO_API, rutas),
+                    'asgi.sync': self.medir_asgi(get_asgi_application(), PREFIJO_API, rutas),
+                    'asgi.async': self.medir_asgi(get_asgi_application(), PREFIJO_ASYNC, rutas),
+                }
+        finally:
+            if modalidad is not None:
+                # Borrado físico: delete() del queryset no pasa por el borrado lógico
+                Carrera.all_objects.filter(modalidad=modalidad).delete()
+                Modalidad.all_objects.filter(pk=modalidad.pk).delete()
+
+        reporte = {
+            'meta': {
+                'commit': commit_actual(),
+                'fecha': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                'vendor': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'concurrencia': self.concurrencia,
+                'solicitudes': self.solicitudes,
+                'con_cache': options['con_cache'],
+                'rutas': rutas,
+            },
+            'resultados': resultados,
+        }
+
+        contenido = json.dumps(reporte, indent=2, ensure_ascii=False)
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                archivo.write(contenido + '\n')
+        self.stdout.write(contenido)
+
+    # --------------------------------------
+    # Datos
+
+    def comprobar_escritura(self, options):
+        """
+        Los handlers usan sus propias conexiones: los datos sembrados deben
+        confirmarse (no caben en una transacción revertida). Se exige que
+        quien lo ejecuta lo acepte de forma explícita.
+        """
+        if options['sembrar'] and not options['permitir_escritura']:
+            raise CommandError(
+                '--sembrar confirma carreras en la base de datos configurada '
+                f'({connection.settings_dict["NAME"]}) y las borra al terminar; '
+                'agregue --permitir-escritura para continuar.'
+            )
+
+    def sembrar(self, cantidad):
+        modalidad = Modalidad.objects.create(nombre=nombre_para(0, 'Modalidad Carga'))
+        carreras = []
+        for i in range(cantidad):
+            carrera = Carrera(nombre=nombre_para(i, PREFIJOS[i % len(PREFIJOS)]), modalidad=modalidad)
+            carrera.actualizar_campos_derivados()
+            carreras.append(carrera)
+        Carrera.objects.bulk_create(carreras, batch_size=1000)
+        return modalidad
+
+    def rutas(self):
+        carrera = Carrera.objects.order_by('-id').first()
+        if carrera is None:
+            raise CommandError('No hay carreras activas; use --sembrar.')
+        return [ruta.format(modalidad=carrera.modalidad_id, carrera=carrera.pk) for ruta in RUTAS]
+
+    def verificar(self, ruta, status):
+        if status >= 400:
+            raise CommandError(f'{ruta}: status {status}')
+
+    # --------------------------------------
+    # WSGI: un hilo por cliente concurrente
+
+    def medir_wsgi(self, aplicacion, prefijo, rutas):
+        def solicitar(ruta):
+            ruta_path, _, query = (prefijo + ruta).partition('?')
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': ruta_path,
+                'QUERY_STRING': query,
+                'SERVER_NAME': HOST,
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_HOST': HOST,
+                'wsgi.input': io.BytesIO(),
+                'wsgi.errors': io.StringIO(),
+                'wsgi.url_scheme': 'http',
+                'wsgi.version': (1, 0),
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            respuesta = {}
+
+            def start_response(status, headers, exc_info=None):
+                respuesta['status'] = int(status.split()[0])
+                respuesta['headers'] = dict(headers)
+
+            cuerpo = aplicacion(environ, start_response)
+            try:
+                b''.join(cuerpo)
+            finally:
+                if hasattr(cuerpo, 'close'):
+                    cuerpo.close()
+            self.verificar(ruta, respuesta['status'])
+            return consultas_de(respuesta['headers'].get('Server-Timing'))
+
+        def ronda(cantidad):
+            contador = iter(range(cantidad))
+            lock = threading.Lock()
+            segundos, consultas = [], [0]
+
+            def cliente():
+                try:
+                    while True:
+                        with lock:
+                            i = next(contador, None)
+                        if i is None:
+                            return
+                        inicio = time.perf_counter()
+                        total_consultas = solicitar(rutas[i % len(rutas)])
+                        transcurrido = time.perf_counter() - inicio
+                        with lock:
+                            segundos.append(transcurrido)
+                            consultas[0] += total_consultas
+                finally:
+                    close_old_connections()
+
+            inicio = time.perf_counter()
+            with ThreadPoolExecutor(self.concurrencia) as executor:
+                for futuro in [executor.submit(cliente) for _ in range(self.concurrencia)]:
+                    futuro.result()
+            return segundos, consultas[0], time.perf_counter() - inicio
+
+        ronda(self.calentamiento)
+        return self.resumir(*ronda(self.solicitudes))
+
+    # --------------------------------------
+    # ASGI: una tarea por cliente concurrente en un solo event loop
+
+    def medir_asgi(self, aplicacion, prefijo, rutas):
+        async def solicitar(ruta):
+            ruta_path, _, query = (prefijo + ruta).partition('?')
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': ruta_path,
+                'raw_path': ruta_path.encode(),
+                'query_string': query.encode(),
+                'root_path': '',
+                'headers': [(b'host', HOST.encode())],
+                'client': ('127.0.0.1', 0),
+                'server': (HOST, 80),
+            }
+            respuesta = {}
+            mensajes = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+            terminada = asyncio.Event()
+
+            async def receive():
+                if mensajes:
+                    return mensajes.pop()
+                # Django escucha la desconexión hasta terminar la respuesta
+                await terminada.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(mensaje):
+                if mensaje['type'] == 'http.response.start':
+                    respuesta['status'] = mensaje['status']
+                    respuesta['headers'] = {
+                        nombre.decode().lower(): valor.decode() for nombre, valor in mensaje['headers']
+                    }
+                elif not mensaje.get('more_body', False):
+                    terminada.set()
+
+            await aplicacion(scope, receive, send)
+            self.verificar(ruta, respuesta['status'])
+            return consultas_de(respuesta['headers'].get('server-timing'))
+
+        async def ronda(cantidad):
+            contador = iter(range(cantidad))
+            segundos, consultas = [], 0
+
+            async def cliente():
+                nonlocal consultas
+                # Sin await entre next() y el uso de i: el event loop es de un solo hilo
+                for i in contador:
+                    inicio = time.perf_counter()
+                    total_consultas = await solicitar(rutas[i % len(rutas)])
+                    segundos.append(time.perf_counter() - inicio)
+                    consultas += total_consultas
+
+            inicio = time.perf_counter()
+            await asyncio.gather(*[cliente() for _ in range(self.concurrencia)])
+            return segundos, consultas, time.perf_counter() - inicio
+
+        async def ejecutar():
+            await ronda(self.calentamiento)
+            return self.resumir(*await ronda(self.solicitudes))
+
+        return asyncio.run(ejecutar())
+
+    def resumir(self, segundos, consultas, pared):
+        resumen = resumir(segundos, consultas)
+        # Con concurrencia, el throughput real es solicitudes / tiempo de pared
+        resumen['ops_por_segundo'] = round(len(segundos) / pared, 1) if pared else None
+        return resumen
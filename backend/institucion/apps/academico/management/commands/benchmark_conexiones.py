@@ -0,0 +1,123 @@
+import datetime
+import json
+import platform
+
+import django
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from django.test.utils import override_settings
+
+from apps.academico.management.commands import benchmark_asgi
+from apps.academico.management.commands.benchmark_api import commit_actual
+from apps.academico.models import Carrera, Modalidad
+from apps.core.db_pool.pool import pool_stats
+
+MODOS = ('none', 'persistent', 'pool')
+
+
+class Command(benchmark_asgi.Command):
+    help = (
+        'Latencia de las lecturas del catálogo bajo WSGI (hilos, como '
+        'gunicorn con threads) con cada modo de conexión a Postgres: none '
+        '(una conexión por request), persistent (CONN_MAX_AGE con health '
+        'checks) y pool (apps.core.db_pool). --sembrar (junto con '
+        '--permitir-escritura) crea carreras de prueba y las elimina al '
+        'terminar. Imprime JSON.'
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--modos', default=','.join(MODOS),
+                            help='Modos a medir, separados por coma.')
+        parser.add_argument('--pool-max', type=int, default=None,
+                            help='max_size del pool (por defecto, la concurrencia).')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('La comparación de modos de conexión requiere PostgreSQL.')
+        self.comprobar_escritura(options)
+        modos = [modo.strip() for modo in options['modos'].split(',') if modo.strip()]
+        invalidos = [modo for modo in modos if modo not in MODOS]
+        if invalidos:
+            raise CommandError(f'Modos no soportados: {", ".join(invalidos)}. Opciones: {", ".join(MODOS)}.')
+
+        self.concurrencia = options['concurrencia']
+        self.solicitudes = options['solicitudes']
+        self.calentamiento = options['calentamiento']
+        pool_max = options['pool_max'] or self.concurrencia
+
+        modalidad = None
+        if options['sembrar']:
+            modalidad = self.sembrar(options['sembrar'])
+        base = dict(connections.settings['default'])
+        try:
+            rutas = self.rutas()
+            ajustes = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, benchmark_asgi.HOST]}
+            if options['con_cache']:
+                # Un solo proceso: la cache local alcanza para invalidar
+                ajustes['CACHE_SHARED'] = True
+            else:
+                ajustes['RESPONSE_CACHE_TIMEOUT'] = 0
+            resultados = {}
+            with override_settings(**ajustes):
+                aplicacion = get_wsgi_application()
+                for modo in modos:
+                    self.configurar(modo, base, pool_max)
+                    resultados[modo] = self.medir_wsgi(aplicacion, benchmark_asgi.PREFIJO_API, rutas)
+                    if modo == 'pool':
+                        resultados[modo]['pool'] = pool_stats().get('default')
+        finally:
+            self.restaurar(base)
+            if modalidad is not None:
+                # Borrado físico: delete() del queryset no pasa por el borrado lógico
+                Carrera.all_objects.filter(modalidad=modalidad).delete()
+                Modalidad.all_objects.filter(pk=modalidad.pk).delete()
+
+        reporte = {
+            'meta': {
+                'commit': commit_actual(),
+                'fecha': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                'host': base['HOST'] or 'localhost',
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'concurrencia': self.concurrencia,
+                'solicitudes': self.solicitudes,
+                'pool_max': pool_max,
+                'con_cache': options['con_cache'],
+                'rutas': rutas,
+            },
+            'resultados': resultados,
+        }
+
+        contenido = json.dumps(reporte, indent=2, ensure_ascii=False)
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                archivo.write(contenido + '\n')
+        self.stdout.write(contenido)
+
+    def configurar(self, modo, base, pool_max):
+        """
+        Cambia el modo de conexión del alias default. Los hilos de cada
+        ronda son nuevos, así que crean su DatabaseWrapper con este ajuste.
+        """
+        self.restaurar(base)
+        ajuste = connections.settings['default']
+        if modo == 'persistent':
+            ajuste.update({'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True})
+        elif modo == 'pool':
+            ajuste.update({
+                'ENGINE': 'apps.core.db_pool',
+                'CONN_MAX_AGE': 0,
+                'POOL': {**base.get('POOL', {}), 'min_size': pool_max, 'max_size': pool_max},
+            })
+
+    def restaurar(self, base):
+        connection.close()
+        ajuste = connections.settings['default']
+        ajuste.clear()
+        ajuste.update(base)
+        ajuste.update({'ENGINE': 'django.db.backends.postgresql', 'CONN_MAX_AGE': 0})
+        # El wrapper del hilo principal se vuelve a crear con el ajuste actual
+        del connections['default']
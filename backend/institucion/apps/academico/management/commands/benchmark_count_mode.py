@@ -0,0 +1,139 @@
+import datetime
+import json
+import platform
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.academico.management.commands.benchmark_api import PREFIJOS, commit_actual, resumir
+from apps.academico.management.commands.benchmark_write_path import nombre_para
+from apps.academico.models import Carrera, Modalidad
+from apps.academico.serializers.serializer_carreras import CarreraSerializer
+from apps.core.counting import COUNT_MODE_SEQUENTIAL, COUNT_MODES, resolver_count_mode
+from apps.core.fast_serializer import get_representation_plan
+from apps.core.instrumentation import RequestMetrics, instrumentar
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara los modos de conteo de datatable (sequential, parallel y '
+        'window) sobre carreras: sin filtros, con una búsqueda frecuente y con '
+        'un offset profundo. Los datos se crean en una transacción que se '
+        'revierte, donde parallel se ejecuta como sequential; para medirlo '
+        '(usa otra conexión) --permitir-escritura confirma los datos y los '
+        'elimina al terminar. Imprime JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--carreras', type=int, default=20000)
+        parser.add_argument('--iteraciones', type=int, default=30)
+        parser.add_argument('--calentamiento', type=int, default=3)
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument('--permitir-escritura', action='store_true',
+                            help='Confirma las carreras de prueba para medir el modo parallel.')
+        parser.add_argument('--salida', help='Archivo donde guardar el JSON.')
+
+    def handle(self, *args, **options):
+        if options['permitir_escritura'] and connection.in_atomic_block:
+            raise CommandError('El modo parallel no aplica dentro de una transacción.')
+
+        self.iteraciones = options['iteraciones']
+        self.calentamiento = options['calentamiento']
+        limit = options['limit']
+
+        if options['permitir_escritura']:
+            modalidad = self.sembrar(options['carreras'])
+            try:
+                resultados, parallel_efectivo = self.comparar(modalidad, options['carreras'], limit)
+            finally:
+                # Borrado físico: delete() del queryset no pasa por el borrado lógico
+                Carrera.all_objects.filter(modalidad=modalidad).delete()
+                Modalidad.all_objects.filter(pk=modalidad.pk).delete()
+        else:
+            with transaction.atomic():
+                modalidad = self.sembrar(options['carreras'])
+                resultados, parallel_efectivo = self.comparar(modalidad, options['carreras'], limit)
+                transaction.set_rollback(True)
+
+        reporte = {
+            'meta': {
+                'commit': commit_actual(),
+                'fecha': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                'vendor': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'carreras': options['carreras'],
+                'iteraciones': self.iteraciones,
+                'limit': limit,
+                # En la transacción revertida o con SQLite en memoria parallel
+                # se ejecuta como sequential
+                'parallel_efectivo': parallel_efectivo,
+                'permitir_escritura': options['permitir_escritura'],
+            },
+            'resultados': resultados,
+        }
+
+        contenido = json.dumps(reporte, indent=2, ensure_ascii=False)
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                archivo.write(contenido + '\n')
+        self.stdout.write(contenido)
+
+    def comparar(self, modalidad, cantidad, limit):
+        """Resultados por caso y modo, y si parallel usó otra conexión."""
+        filtro = {'modalidad': modalidad.pk}
+        plan = get_representation_plan(CarreraSerializer, 'datatable')
+        base = {
+            'fields': plan.paths,
+            'as_tuples': True,
+            'limit': limit,
+            'search_fields': ['nombre', 'modalidad__nombre'],
+            'count_strategy': 'exact',
+        }
+        casos = {
+            'sin_filtros': {'filters': filtro},
+            'search_frecuente': {'filters': filtro, 'search': 'ingenieria'},
+            'offset_profundo': {'filters': filtro, 'offset': cantidad // 2},
+        }
+
+        resultados = {}
+        for nombre, parametros in casos.items():
+            esperado = None
+            for modo in COUNT_MODES:
+                kwargs = {**base, **parametros, 'count_mode': modo}
+                resultado = Carrera.objects.datatable(**kwargs)
+                # Todos los modos deben retornar lo mismo
+                if esperado is None:
+                    esperado = resultado
+                elif resultado != esperado:
+                    raise CommandError(f'{nombre}: el modo {modo} retornó un resultado distinto.')
+                resultados[f'{nombre}.{modo}'] = self.medir(kwargs)
+
+        modo_paralelo = resolver_count_mode(Carrera.objects.all(), 'parallel')
+        return resultados, modo_paralelo != COUNT_MODE_SEQUENTIAL
+
+    def sembrar(self, cantidad):
+        modalidad = Modalidad.objects.create(nombre=nombre_para(0, 'Modalidad Conteo'))
+        carreras = []
+        for i in range(cantidad):
+            carrera = Carrera(nombre=nombre_para(i, PREFIJOS[i % len(PREFIJOS)]), modalidad=modalidad)
+            carrera.actualizar_campos_derivados()
+            carreras.append(carrera)
+        Carrera.objects.bulk_create(carreras, batch_size=1000)
+        return modalidad
+
+    def medir(self, kwargs):
+        """Consultas de ambas conexiones (el conteo paralelo copia el contexto)."""
+        segundos = []
+        consultas = 0
+        for i in range(self.calentamiento + self.iteraciones):
+            with instrumentar(RequestMetrics()) as metricas:
+                inicio = time.perf_counter()
+                Carrera.objects.datatable(**kwargs)
+                transcurrido = time.perf_counter() - inicio
+            if i >= self.calentamiento:
+                segundos.append(transcurrido)
+                consultas += metricas.consultas
+        return resumir(segundos, consultas)
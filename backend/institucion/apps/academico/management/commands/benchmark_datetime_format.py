@@ -0,0 +1,106 @@
+import datetime
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.academico.management.commands.benchmark_write_path import nombre_para
+from apps.academico.models import Carrera, Modalidad
+from apps.academico.serializers.serializer_carreras import CarreraSerializer
+from apps.core.datetime_format import DATETIME_FORMAT_STRATEGIES
+from apps.core.fast_serializer import get_representation_plan
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara las estrategias de formateo de created_at/updated_at '
+        '(python, memo, database) al representar un listado de carreras, '
+        'tanto desde values_list (plan compilado) como desde instancias. '
+        'Los datos se crean en una transacción que se revierte al final.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=10000)
+        parser.add_argument('--repeticiones', type=int, default=3)
+
+    def handle(self, *args, **options):
+        filas = options['filas']
+        repeticiones = options['repeticiones']
+
+        with transaction.atomic():
+            self.sembrar(filas)
+            resultados = {'filas': filas, 'vendor': connection.vendor}
+            for estrategia in DATETIME_FORMAT_STRATEGIES:
+                resultados[estrategia] = self.medir(estrategia, filas, repeticiones)
+            transaction.set_rollback(True)
+
+        self.stdout.write(json.dumps(resultados, indent=2))
+
+    def sembrar(self, filas):
+        """
+        Carreras con timestamps distintos (para no favorecer la memoización);
+        la mitad conserva updated_at == created_at, como un registro sin editar.
+        """
+        modalidad = Modalidad.objects.create(nombre='Modalidad Benchmark')
+        carreras = [
+            Carrera(nombre=nombre_para(i, 'Bench Fecha'), modalidad=modalidad)
+            for i in range(filas)
+        ]
+        for carrera in carreras:
+            carrera.actualizar_campos_derivados()
+        Carrera.objects.bulk_create(carreras, batch_size=1000)
+
+        base = timezone.now()
+        carreras = list(Carrera.objects.filter(modalidad=modalidad).select_related(None).only('id'))
+        for i, carrera in enumerate(carreras):
+            carrera.created_at = base - datetime.timedelta(seconds=i * 37, microseconds=i)
+            carrera.updated_at = carrera.created_at if i % 2 else base
+        Carrera.objects.bulk_update(carreras, ['created_at', 'updated_at'], batch_size=1000)
+
+    def medir(self, estrategia, filas, repeticiones):
+        """
+        Mejor tiempo de `repeticiones` para cada camino:
+            - values_list: consulta + render del plan compilado
+            - instancias: consulta + CarreraSerializer(many=True)
+        """
+        serializer_class = type(
+            f'CarreraSerializer_{estrategia}',
+            (CarreraSerializer,),
+            {'datetime_format': estrategia, '__module__': __name__},
+        )
+        plan = get_representation_plan(serializer_class, 'datatable')
+        resultado = {}
+
+        if estrategia == 'database' and connection.vendor != 'postgresql':
+            resultado['nota'] = 'to_char requiere Postgres; se usa memo.'
+
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            datos = Carrera.objects.datatable(fields=plan.paths, limit=filas, as_tuples=True)['data']
+            consulta = time.perf_counter()
+            plan.render(datos)
+            tiempos.append((consulta - inicio, time.perf_counter() - consulta))
+        consulta, render = min(tiempos, key=sum)
+        resultado['values_list'] = {
+            'ms_consulta': round(consulta * 1000, 2),
+            'ms_render': round(render * 1000, 2),
+            'ms_total': round((consulta + render) * 1000, 2),
+        }
+
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            instancias = list(Carrera.objects.all()[:filas])
+            consulta = time.perf_counter()
+            serializer_class(instancias, many=True, context={'action': 'datatable'}).data
+            tiempos.append((consulta - inicio, time.perf_counter() - consulta))
+        consulta, render = min(tiempos, key=sum)
+        resultado['instancias'] = {
+            'ms_consulta': round(consulta * 1000, 2),
+            'ms_render': round(render * 1000, 2),
+            'ms_total': round((consulta + render) * 1000, 2),
+        }
+        return resultado
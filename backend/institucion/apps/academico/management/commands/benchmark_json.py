@@ -0,0 +1,153 @@
+import datetime
+import io
+import json
+import platform
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.academico.management.commands.benchmark_api import PREFIJOS, commit_actual, resumir
+from apps.academico.management.commands.benchmark_write_path import nombre_para
+from apps.academico.models import Carrera, Modalidad
+from apps.academico.serializers.serializer_carreras import CarreraSerializer
+from apps.core import fast_json
+from apps.core.columnar import a_columnas
+from apps.core.export import _valor_exportable
+from apps.core.fast_serializer import get_representation_plan
+from apps.core.parsers import FastJSONParser
+from apps.core.renderers import FastJSONRenderer
+
+CAMPOS_EXPORT = ['id', 'nombre', 'modalidad_id', 'modalidad__nombre', 'estado', 'created_at', 'updated_at']
+
+
+class Command(BaseCommand):
+    help = (
+        'Micro-benchmark de JSON: JSONRenderer/JSONParser de DRF (módulo '
+        'json) frente a FastJSONRenderer/FastJSONParser (orjson) sobre la '
+        'salida real de CarreraSerializer (layout objects y columnar), '
+        'líneas NDJSON de export y el cuerpo de un bulk_create. Verifica que '
+        'ambos produzcan lo mismo. Los datos se crean en una transacción que '
+        'se revierte al final. Imprime JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanos', default='10,100,1000',
+                            help='Filas por payload, separadas por coma.')
+        parser.add_argument('--iteraciones', type=int, default=50)
+        parser.add_argument('--calentamiento', type=int, default=5)
+        parser.add_argument('--salida', help='Archivo donde guardar el JSON.')
+
+    def handle(self, *args, **options):
+        try:
+            tamanos = sorted({int(t) for t in options['tamanos'].split(',') if t.strip()})
+        except ValueError:
+            raise CommandError('--tamanos debe ser una lista de enteros separados por coma.')
+        self.iteraciones = options['iteraciones']
+        self.calentamiento = options['calentamiento']
+
+        with transaction.atomic():
+            self.sembrar(max(tamanos))
+            resultados = {}
+            for tamano in tamanos:
+                resultados.update(self.medir_tamano(tamano))
+            transaction.set_rollback(True)
+
+        aceleracion = {}
+        for caso, valores in resultados.items():
+            if caso.endswith('.drf'):
+                base = caso[:-len('.drf')]
+                rapido = resultados[f'{base}.orjson']['p50_ms']
+                aceleracion[base] = round(valores['p50_ms'] / rapido, 2) if rapido else None
+
+        reporte = {
+            'meta': {
+                'commit': commit_actual(),
+                'fecha': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                'vendor': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'orjson': fast_json.orjson.__version__ if fast_json.disponible() else None,
+                'iteraciones': self.iteraciones,
+            },
+            'resultados': resultados,
+            'aceleracion_p50': aceleracion,
+        }
+
+        contenido = json.dumps(reporte, indent=2, ensure_ascii=False)
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                archivo.write(contenido + '\n')
+        self.stdout.write(contenido)
+
+    def sembrar(self, cantidad):
+        modalidad = Modalidad.objects.create(nombre=nombre_para(0, 'Modalidad JSON'))
+        carreras = []
+        for i in range(cantidad):
+            carrera = Carrera(nombre=nombre_para(i, PREFIJOS[i % len(PREFIJOS)]), modalidad=modalidad)
+            carrera.actualizar_campos_derivados()
+            carreras.append(carrera)
+        Carrera.objects.bulk_create(carreras, batch_size=1000)
+
+    def medir_tamano(self, tamano):
+        instancias = list(Carrera.objects.all()[:tamano])
+        plan = get_representation_plan(CarreraSerializer, 'datatable')
+        filas = Carrera.objects.datatable(fields=plan.paths, limit=tamano, as_tuples=True)['data']
+        pagina = {'count': len(instancias), 'total': len(instancias), 'total_exact': True}
+
+        objetos = {**pagina, 'data': CarreraSerializer(instancias, many=True, context={'action': 'datatable'}).data}
+        columnar = a_columnas(dict(pagina), *plan.render_columnar(filas))
+        export = [
+            {campo: _valor_exportable(fila[campo]) for campo in CAMPOS_EXPORT}
+            for fila in Carrera.objects.values(*CAMPOS_EXPORT)[:tamano]
+        ]
+        bulk = JSONRenderer().render({
+            'items': [{'nombre': nombre_para(i, 'Bench Bulk'), 'modalidad': 1} for i in range(tamano)]
+        })
+
+        resultados = {}
+        for caso, payload in (('render.objects', objetos), ('render.columnar', columnar)):
+            resultados.update(self.comparar(
+                f'{caso}_{tamano}',
+                lambda renderer: renderer.render(payload),
+                JSONRenderer(), FastJSONRenderer(),
+            ))
+
+        default = DjangoJSONEncoder().default
+        encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        resultados.update(self.comparar(
+            f'export.ndjson_{tamano}',
+            lambda codificar: b''.join(codificar(fila) + b'\n' for fila in export),
+            lambda fila: encoder.encode(fila).encode(),
+            lambda fila: fast_json.dumps(fila, default),
+        ))
+
+        resultados.update(self.comparar(
+            f'parse.bulk_{tamano}',
+            lambda parser: parser.parse(io.BytesIO(bulk)),
+            JSONParser(), FastJSONParser(),
+        ))
+        return resultados
+
+    def comparar(self, caso, operacion, drf, rapido):
+        """Mide `operacion` con la implementación de DRF y la rápida; exige el mismo resultado."""
+        if operacion(drf) != operacion(rapido):
+            raise CommandError(f'{caso}: la salida con orjson difiere de la de DRF.')
+        return {
+            f'{caso}.drf': self.medir(lambda: operacion(drf)),
+            f'{caso}.orjson': self.medir(lambda: operacion(rapido)),
+        }
+
+    def medir(self, operacion):
+        segundos = []
+        for i in range(self.calentamiento + self.iteraciones):
+            inicio = time.perf_counter()
+            operacion()
+            transcurrido = time.perf_counter() - inicio
+            if i >= self.calentamiento:
+                segundos.append(transcurrido)
+        return resumir(segundos, 0)
@@ -0,0 +1,108 @@
+import json
+import time
+
+from django import forms
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.academico.forms.form_carreras import CarreraForm
+from apps.academico.forms.form_modalidad import ModalidadForm
+from apps.academico.models import Carrera, Modalidad
+
+
+def nombre_para(indice, prefijo):
+    """Nombre válido (solo letras) y único a partir de un índice."""
+    letras = ''
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(ord('a') + resto) + letras
+    return f"{prefijo} {letras}"
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide consultas y tiempo por operación de escritura (create/update) '
+        'a través de los formularios, con y sin la validación duplicada en '
+        'save(). Todo se ejecuta en una transacción que se revierte al final.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iteraciones', type=int, default=50)
+
+    def handle(self, *args, **options):
+        iteraciones = options['iteraciones']
+
+        with transaction.atomic():
+            base = Modalidad.objects.create(nombre='Modalidad Benchmark')
+            resultados = {
+                'create_modalidad': self.medir(
+                    iteraciones,
+                    lambda i: ModalidadForm(data={'nombre': nombre_para(i, 'Bench Mod')}),
+                ),
+                'create_carrera': self.medir(
+                    iteraciones,
+                    lambda i: CarreraForm(data={'nombre': nombre_para(i, 'Bench Car'), 'modalidad': base.pk}),
+                ),
+            }
+
+            modalidad = Modalidad.objects.create(nombre='Modalidad Editable')
+            carrera = Carrera.objects.create(nombre='Carrera Editable', modalidad=base)
+            resultados['update_modalidad'] = self.medir(
+                iteraciones,
+                lambda i: ModalidadForm(
+                    data={'nombre': nombre_para(i, 'Bench Upd')},
+                    instance=Modalidad.objects.get(pk=modalidad.pk),
+                ),
+            )
+            resultados['update_carrera'] = self.medir(
+                iteraciones,
+                lambda i: CarreraForm(
+                    data={'nombre': nombre_para(i, 'Bench Upd'), 'modalidad': base.pk},
+                    instance=Carrera.objects.get(pk=carrera.pk),
+                ),
+            )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(json.dumps(resultados, indent=2))
+
+    def guardar_sin_handoff(self, form):
+        """save_with_transaction sin marcar la instancia como validada."""
+        with transaction.atomic():
+            instance = forms.ModelForm.save(form, commit=False)
+            if hasattr(form, 'pre_save'):
+                form.pre_save(instance)
+            instance.save()
+            form.save_m2m()
+            if hasattr(form, 'post_save'):
+                form.post_save(instance)
+
+    def medir(self, iteraciones, crear_form):
+        """
+        'antes': save() del modelo vuelve a ejecutar full_clean.
+        'despues': save_with_transaction entrega la instancia ya validada.
+        La construcción del formulario (y su instancia) no se mide.
+        """
+        resultado = {}
+        for modo, desplazamiento in (('antes', 0), ('despues', iteraciones)):
+            consultas = 0
+            segundos = 0.0
+            for i in range(iteraciones):
+                form = crear_form(i + desplazamiento)
+                with CaptureQueriesContext(connection) as capturadas:
+                    inicio = time.perf_counter()
+                    if not form.is_valid():
+                        raise RuntimeError(form.get_errors_as_dict())
+                    if modo == 'antes':
+                        self.guardar_sin_handoff(form)
+                    else:
+                        form.save_with_transaction()
+                    segundos += time.perf_counter() - inicio
+                consultas += len(capturadas)
+            resultado[modo] = {
+                'consultas_por_operacion': round(consultas / iteraciones, 2),
+                'ms_por_operacion': round(segundos * 1000 / iteraciones, 3),
+            }
+        return resultado
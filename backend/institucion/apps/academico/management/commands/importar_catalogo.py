@@ -0,0 +1,63 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.importacion import IMPORT_FORMATS, inferir_formato, leer_filas
+from apps.academico.importacion import CarreraImportador, ModalidadImportador
+
+IMPORTADORES = {
+    'carreras': CarreraImportador,
+    'modalidades': ModalidadImportador,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa carreras o modalidades desde un archivo CSV, JSON o NDJSON. '
+        'Valida por lotes e inserta con bulk_create; reporta velocidad y '
+        'errores por fila.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo')
+        parser.add_argument('--modelo', choices=sorted(IMPORTADORES), required=True)
+        parser.add_argument('--formato', choices=IMPORT_FORMATS, help='Por defecto se infiere de la extensión.')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--conflictos', choices=['omitir', 'error'], default='omitir')
+        parser.add_argument('--dry-run', action='store_true', help='Valida sin escribir.')
+        parser.add_argument('--json', action='store_true', help='Imprime el resultado completo en JSON.')
+
+    def handle(self, *args, **options):
+        formato = options['formato'] or inferir_formato(options['archivo'])
+        if not formato:
+            raise CommandError('No se pudo inferir el formato; use --formato.')
+
+        importador = IMPORTADORES[options['modelo']](
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            conflictos=options['conflictos'],
+        )
+
+        try:
+            with open(options['archivo'], 'rb') as archivo:
+                resultado = importador.importar(leer_filas(archivo, formato))
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(resultado, indent=2, ensure_ascii=False))
+            if 'error' in resultado:
+                raise CommandError(resultado['error'])
+            return
+
+        for error in resultado['errors']:
+            self.stdout.write(f"Fila {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['total']} filas en {resultado['seconds']}s "
+            f"({resultado['rows_per_second']} filas/s): {resultado['created']} creadas, "
+            f"{resultado['skipped']} omitidas, {resultado['error_count']} con errores"
+            + (' [dry-run]' if resultado['dry_run'] else '')
+        ))
+        if 'error' in resultado:
+            raise CommandError(f"Importación interrumpida tras procesar {resultado['total']} filas: {resultado['error']}")
@@ -0,0 +1,121 @@
+import base64
+import json
+
+from asgiref.sync import async_to_sync
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.test import APIRequestFactory
+
+from apps.academico.management.commands.benchmark_write_path import nombre_para
+from apps.academico.models import Carrera, Modalidad
+from apps.academico.views.view_carreras import AsyncCarreraViewSet, CarreraViewSet
+from apps.academico.views.view_modalidad import ModalidadViewSet
+
+
+def cursor(payload):
+    """Token con la codificación de encode_cursor y un contenido arbitrario."""
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def archivo(nombre, contenido):
+    return SimpleUploadedFile(nombre, contenido)
+
+
+class Command(BaseCommand):
+    help = (
+        'Envía entradas mal formadas (tipos inesperados, filas que no son '
+        'objetos, tokens corruptos) a los endpoints de carreras y '
+        'modalidades y falla si alguno responde 5xx o lanza una excepción '
+        'en lugar de rechazarlas con 400, o si las rutas /async/ no aplican '
+        'los permisos de su viewset. Los datos se crean en una '
+        'transacción que se revierte al final.'
+    )
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory()
+        resultados = {}
+
+        with transaction.atomic():
+            modalidad = Modalidad.objects.create(nombre=nombre_para(0, 'Verificar Entrada'))
+            Carrera.objects.create(nombre=nombre_para(0, 'Verificar Entrada'), modalidad=modalidad)
+            # Nombres acentuados: UPPER() de SQLite o de Postgres con collation C no los convierte
+            acentuada = Modalidad.objects.create(nombre='Educación Verificada')
+            Carrera.objects.create(nombre='Ingeniería Verificada', modalidad=acentuada)
+
+            casos = [
+                # CharField convierte el número en texto y lo rechazan sus validadores
+                ('carreras.create_nombre_numerico', CarreraViewSet, 'post', 'create',
+                 {'nombre': 5, 'modalidad': modalidad.pk}, {}, (400,)),
+                ('modalidades.create_nombre_numerico', ModalidadViewSet, 'post', 'create',
+                 {'nombre': 7}, {}, (400,)),
+                ('carreras.create_nombre_lista', CarreraViewSet, 'post', 'create',
+                 {'nombre': ['x'], 'modalidad': modalidad.pk}, {}, (400,)),
+                # Duplicados acentuados: 400 de validación, no IntegrityError
+                ('modalidades.create_duplicado_acentuado', ModalidadViewSet, 'post', 'create',
+                 {'nombre': 'Educación Verificada'}, {}, (400,)),
+                ('modalidades.create_duplicado_acentuado_mayusculas', ModalidadViewSet, 'post', 'create',
+                 {'nombre': 'EDUCACIÓN VERIFICADA'}, {}, (400,)),
+                ('modalidades.bulk_create_duplicado_acentuado', ModalidadViewSet, 'post', 'bulk_create',
+                 {'items': [{'nombre': 'educación verificada'}]}, {}, (400,)),
+                ('carreras.create_duplicado_acentuado', CarreraViewSet, 'post', 'create',
+                 {'nombre': 'Ingeniería Verificada', 'modalidad': modalidad.pk}, {}, (400,)),
+                # Cursores bien codificados con contenido inválido
+                ('carreras.datatable_cursor_no_lista', CarreraViewSet, 'get', 'datatable',
+                 {'cursor': cursor([['nombre', 'id'], 5])}, {}, (400,)),
+                ('carreras.datatable_cursor_tipos', CarreraViewSet, 'get', 'datatable',
+                 {'cursor': cursor([['nombre', 'id'], ['x', 'abc']])}, {}, (400,)),
+                # Lotes con elementos que no son objetos o ids que no son enteros
+                ('carreras.bulk_create_no_objeto', CarreraViewSet, 'post', 'bulk_create',
+                 {'items': [1, {'nombre': 'Verificar Bulk', 'modalidad': modalidad.pk}]}, {}, (400,)),
+                ('carreras.bulk_update_id_lista', CarreraViewSet, 'put', 'bulk_update',
+                 {'items': [{'id': [1], 'nombre': 'Verificar Bulk'}, {'id': {'a': 1}}, {'id': True}]}, {}, (400,)),
+                ('modalidades.bulk_update_no_objeto', ModalidadViewSet, 'put', 'bulk_update',
+                 {'items': ['x']}, {}, (400,)),
+                # Filas ilegibles o con tipos inesperados: errores por fila
+                ('modalidades.import_ndjson_linea_invalida', ModalidadViewSet, 'post', 'import_file',
+                 {'file': archivo('m.ndjson', b'{"nombre": "Verificar Import"}\n{malo\n')}, {}, (200,)),
+                ('carreras.import_json_tipos', CarreraViewSet, 'post', 'import_file',
+                 {'file': archivo('c.json', b'[{"nombre": 5, "modalidad": 3}, {"nombre": null}, 7]')}, {}, (200,)),
+                # Archivo ilegible: 400 con el resultado parcial
+                ('modalidades.import_csv_ilegible', ModalidadViewSet, 'post', 'import_file',
+                 {'file': archivo('m.csv', b'nombre\n"' + b'x' * 200000 + b'"\n')}, {}, (400,)),
+                ('modalidades.import_json_invalido', ModalidadViewSet, 'post', 'import_file',
+                 {'file': archivo('m.json', b'{malo')}, {}, (400,)),
+            ]
+            for nombre, viewset, metodo, accion, datos, kwargs, esperados in casos:
+                resultados[nombre] = self.verificar(viewset, metodo, accion, datos, kwargs, esperados)
+            resultados['async.permisos'] = self.verificar_permisos_async()
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(json.dumps(resultados, indent=2, ensure_ascii=False))
+        fallidos = [nombre for nombre, resultado in resultados.items() if not resultado['ok']]
+        if fallidos:
+            raise CommandError(f'Entradas mal manejadas en: {", ".join(fallidos)}')
+
+    def verificar(self, viewset, metodo, accion, datos, kwargs, esperados):
+        vista = viewset.as_view({metodo: accion}, cache_responses=False, conditional_get=False)
+        multipart = isinstance(datos, dict) and any(hasattr(valor, 'read') for valor in datos.values())
+        request = getattr(self.factory, metodo)('/', datos, format='multipart' if multipart else 'json')
+        try:
+            with transaction.atomic():
+                response = vista(request, **kwargs)
+                response.render()
+                transaction.set_rollback(True)
+        except Exception as e:
+            return {'ok': False, 'detalle': f'{type(e).__name__}: {e}'}
+        return {'ok': response.status_code in esperados, 'status': response.status_code}
+
+    def verificar_permisos_async(self):
+        """Una ruta /async/ sin credenciales respeta permission_classes del viewset de origen."""
+        protegido = type('CarreraProtegida', (CarreraViewSet,), {'permission_classes': [IsAuthenticated]})
+        vista = type(
+            'AsyncCarreraProtegida', (AsyncCarreraViewSet,), {'viewset_class': protegido}
+        ).as_view(action='list')
+        try:
+            response = async_to_sync(vista)(self.factory.get('/'))
+        except Exception as e:
+            return {'ok': False, 'detalle': f'{type(e).__name__}: {e}'}
+        return {'ok': response.status_code in (401, 403), 'status': response.status_code}
@@ -0,0 +1,86 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+
+from apps.academico.management.commands.benchmark_write_path import nombre_para
+from apps.academico.models import Carrera, Modalidad
+from apps.academico.views.view_carreras import CarreraViewSet
+from apps.academico.views.view_modalidad import ModalidadViewSet
+from apps.core.query_guard import ConsultasRepetidasError, prohibir_n_mas_uno
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta los endpoints de lectura y restauración de carreras y '
+        'modalidades bajo prohibir_n_mas_uno y falla si alguno repite una '
+        'consulta por fila. Los datos se crean en una transacción que se '
+        'revierte al final; la cache de respuestas se desactiva.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=20)
+        parser.add_argument('--max-repeticiones', type=int, default=3)
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory()
+        self.max_repeticiones = options['max_repeticiones']
+        resultados = {}
+
+        with transaction.atomic():
+            modalidades = [
+                Modalidad.objects.create(nombre=nombre_para(i, 'Verificar Mod'))
+                for i in range(3)
+            ]
+            carreras = [
+                Carrera.objects.create(
+                    nombre=nombre_para(i, 'Verificar Car'),
+                    modalidad=modalidades[i % len(modalidades)],
+                )
+                for i in range(options['filas'])
+            ]
+            for carrera in carreras[::2]:
+                carrera.delete()
+
+            carrera = carreras[0]
+            modalidad = modalidades[0]
+            casos = [
+                ('carreras.list', CarreraViewSet, 'get', 'list', '/', {}),
+                ('carreras.datatable', CarreraViewSet, 'get', 'datatable', '/?limit=100', {}),
+                ('carreras.datatable_cursor', CarreraViewSet, 'get', 'datatable', '/?cursor=&limit=100', {}),
+                ('carreras.activas', CarreraViewSet, 'get', 'activas', '/?limit=100', {}),
+                ('carreras.inactivas', CarreraViewSet, 'get', 'inactivas', '/?limit=100', {}),
+                ('carreras.por_modalidad', CarreraViewSet, 'get', 'por_modalidad',
+                 f'/?modalidad_id={modalidad.pk}', {}),
+                ('carreras.retrieve', CarreraViewSet, 'get', 'retrieve', '/', {'pk': carreras[1].pk}),
+                ('carreras.restore', CarreraViewSet, 'patch', 'restore', '/', {'pk': carrera.pk}),
+                ('carreras.hard_delete', CarreraViewSet, 'delete', 'hard_delete', '/', {'pk': carrera.pk}),
+                ('modalidades.list', ModalidadViewSet, 'get', 'list', '/', {}),
+                ('modalidades.datatable', ModalidadViewSet, 'get', 'datatable', '/?limit=100', {}),
+                ('modalidades.retrieve', ModalidadViewSet, 'get', 'retrieve', '/', {'pk': modalidad.pk}),
+            ]
+            for nombre, viewset, metodo, accion, url, kwargs in casos:
+                resultados[nombre] = self.verificar(viewset, metodo, accion, url, kwargs)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(json.dumps(resultados, indent=2, ensure_ascii=False))
+        fallidos = [nombre for nombre, resultado in resultados.items() if not resultado['ok']]
+        if fallidos:
+            raise CommandError(f'Consultas N+1 en: {", ".join(fallidos)}')
+
+    def verificar(self, viewset, metodo, accion, url, kwargs):
+        vista = viewset.as_view({metodo: accion}, cache_responses=False, conditional_get=False)
+        request = getattr(self.factory, metodo)(url)
+        try:
+            with prohibir_n_mas_uno(self.max_repeticiones) as capturadas:
+                response = vista(request, **kwargs)
+                response.render()
+        except ConsultasRepetidasError as e:
+            return {'ok': False, 'detalle': str(e)}
+        return {
+            'ok': response.status_code < 400,
+            'status': response.status_code,
+            'consultas': len(capturadas),
+        }
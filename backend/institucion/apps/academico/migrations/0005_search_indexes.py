@@ -0,0 +1,52 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F
+
+from apps.core.search import UnaccentUpper
+
+
+def indices_busqueda():
+    """
+    Índices GIN para los motores 'trigram' y 'fulltext' de apps.core.search.
+    Las expresiones deben coincidir con las que generan los motores.
+    """
+    indices = []
+    for modelo in ('modalidad', 'carrera'):
+        indices.append((modelo, GinIndex(
+            OpClass(UnaccentUpper(F('nombre')), name='gin_trgm_ops'),
+            name=f"{modelo}_nombre_trgm_idx",
+        )))
+        indices.append((modelo, GinIndex(
+            SearchVector('nombre', config='es_unaccent'),
+            name=f"{modelo}_nombre_fts_idx",
+        )))
+    return indices
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for modelo, indice in indices_busqueda():
+        schema_editor.add_index(apps.get_model('academico', modelo), indice)
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for modelo, indice in indices_busqueda():
+        schema_editor.remove_index(apps.get_model('academico', modelo), indice)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0004_alter_carrera_unique_together'),
+        ('core', '0001_search_extensions'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
@@ -0,0 +1,76 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+
+from apps.core.search import UnaccentUpper
+
+
+def poblar_texto_busqueda(apps, schema_editor):
+    """Un UPDATE por modalidad (la tabla de modalidades es pequeña)."""
+    Modalidad = apps.get_model('academico', 'Modalidad')
+    Carrera = apps.get_model('academico', 'Carrera')
+    for modalidad in Modalidad.objects.all():
+        Carrera.objects.filter(modalidad=modalidad).update(
+            texto_busqueda=Concat(F('nombre'), Value(' '), Value(modalidad.nombre))
+        )
+
+
+def indices_anteriores():
+    return [
+        GinIndex(OpClass(UnaccentUpper(F('nombre')), name='gin_trgm_ops'), name='carrera_nombre_trgm_idx'),
+        GinIndex(SearchVector('nombre', config='es_unaccent'), name='carrera_nombre_fts_idx'),
+    ]
+
+
+def indices_nuevos():
+    return [
+        GinIndex(
+            OpClass(UnaccentUpper(F('texto_busqueda')), name='gin_trgm_ops'),
+            name='carrera_busqueda_trgm_idx',
+        ),
+        GinIndex(
+            SearchVector('texto_busqueda', config='es_unaccent'),
+            name='carrera_busqueda_fts_idx',
+        ),
+    ]
+
+
+def reemplazar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    Carrera = apps.get_model('academico', 'Carrera')
+    for indice in indices_anteriores():
+        schema_editor.remove_index(Carrera, indice)
+    for indice in indices_nuevos():
+        schema_editor.add_index(Carrera, indice)
+
+
+def restaurar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    Carrera = apps.get_model('academico', 'Carrera')
+    for indice in indices_nuevos():
+        schema_editor.remove_index(Carrera, indice)
+    for indice in indices_anteriores():
+        schema_editor.add_index(Carrera, indice)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0005_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carrera',
+            name='texto_busqueda',
+            field=models.CharField(default='', editable=False, help_text='Nombre de la carrera y de su modalidad, para búsquedas sin join', max_length=251, verbose_name='Texto de búsqueda'),
+        ),
+        migrations.RunPython(poblar_texto_busqueda, migrations.RunPython.noop),
+        migrations.RunPython(reemplazar_indices, restaurar_indices),
+    ]
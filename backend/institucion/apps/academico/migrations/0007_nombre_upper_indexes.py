@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-17 02:56
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0006_carrera_texto_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carrera',
+            index=models.Index(django.db.models.functions.text.Upper('nombre'), name='carrera_nombre_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modalidad',
+            index=models.Index(django.db.models.functions.text.Upper('nombre'), name='modalidad_nombre_upper_idx'),
+        ),
+    ]
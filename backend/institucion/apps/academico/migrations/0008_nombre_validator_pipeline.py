@@ -0,0 +1,24 @@
+# Generated by Django 5.0 on 2026-10-17 02:58
+
+import apps.academico.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0007_nombre_upper_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='carrera',
+            name='nombre',
+            field=models.CharField(max_length=150, validators=[apps.academico.validators.validate_nombre], verbose_name='Nombre de la carrera'),
+        ),
+        migrations.AlterField(
+            model_name='modalidad',
+            name='nombre',
+            field=models.CharField(max_length=100, unique=True, validators=[apps.academico.validators.validate_nombre], verbose_name='Nombre de la modalidad'),
+        ),
+    ]
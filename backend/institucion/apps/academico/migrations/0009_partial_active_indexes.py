@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-17 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0008_nombre_validator_pipeline'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carrera',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['-id'], name='carrera_activos_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carrera',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['nombre'], name='carrera_activos_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carrera',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['modalidad', 'nombre'], name='carrera_activos_mod_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modalidad',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['-id'], name='modalidad_activos_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modalidad',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['nombre'], name='modalidad_activos_nombre_idx'),
+        ),
+    ]
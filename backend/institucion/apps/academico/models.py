@@ -1,12 +1,10 @@
 from django.db import models
 from django.core.exceptions import ValidationError
-from apps.core.abstract_model import BaseModel
-from .validators import (
-    validate_nombre_no_vacio,
-    validate_nombre_sin_caracteres_especiales,
-    validate_longitud_minima_nombre,
-    validate_nombre_alfanumerico
-)
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Upper
+from apps.core.abstract_model import BaseModel, indice_activos
+from apps.core.cache_utils import bump_model_version_on_commit
+from .validators import validate_nombre
 
 
 class Modalidad(BaseModel):
@@ -17,21 +15,31 @@ class Modalidad(BaseModel):
         max_length=100,
         verbose_name="Nombre de la modalidad",
         unique=True,
-        validators=[
-            validate_nombre_no_vacio,
-            validate_nombre_sin_caracteres_especiales,
-            validate_longitud_minima_nombre,
-            validate_nombre_alfanumerico
-        ]
+        validators=[validate_nombre]
     )
 
-    class Meta:
+    class Meta(BaseModel.Meta):
         verbose_name = "Modalidad"
         verbose_name_plural = "Modalidades"
         ordering = ['nombre']
+        indexes = [
+            *BaseModel.Meta.indexes,
+            # Búsquedas de colisión sin distinguir mayúsculas (UPPER(nombre) IN ...)
+            models.Index(Upper('nombre'), name='modalidad_nombre_upper_idx'),
+            # Listados de activas ordenados por nombre
+            indice_activos('nombre', name='modalidad_activos_nombre_idx'),
+        ]
+
+    display_fields = ('nombre',)
+    lookup_table = True
+    lookup_key_field = 'nombre'
 
     def __str__(self):
-        return self.nombre
+        return self.display_from_values(self.nombre)
+
+    @classmethod
+    def display_from_values(cls, nombre):
+        return nombre
 
     def clean(self):
         """
@@ -48,10 +56,20 @@ class Modalidad(BaseModel):
         Sobrescribe save para ejecutar validaciones.
         """
         skip_validation = kwargs.pop('skip_validation', False)
-        if not skip_validation:
+        if not skip_validation and self.requiere_validacion():
             self.full_clean()
         super().save(*args, **kwargs)
 
+    def sincronizar_carreras(self):
+        """
+        Actualiza el texto de búsqueda de todas sus carreras
+        (incluidas las inactivas) en una sola sentencia UPDATE.
+        """
+        Carrera.all_objects.filter(modalidad=self).update(
+            texto_busqueda=Concat(F('nombre'), Value(' '), Value(self.nombre))
+        )
+        bump_model_version_on_commit(Carrera)
+
 
 class Carrera(BaseModel):
     """
@@ -60,12 +78,7 @@ class Carrera(BaseModel):
     nombre = models.CharField(
         max_length=150,
         verbose_name="Nombre de la carrera",
-        validators=[
-            validate_nombre_no_vacio,
-            validate_nombre_sin_caracteres_especiales,
-            validate_longitud_minima_nombre,
-            validate_nombre_alfanumerico
-        ]
+        validators=[validate_nombre]
     )
     modalidad = models.ForeignKey(
         Modalidad,
@@ -73,14 +86,37 @@ class Carrera(BaseModel):
         verbose_name="Modalidad",
         related_name="carreras"
     )
+    texto_busqueda = models.CharField(
+        max_length=251,
+        default='',
+        editable=False,
+        verbose_name="Texto de búsqueda",
+        help_text="Nombre de la carrera y de su modalidad, para búsquedas sin join"
+    )
+
+    campos_derivados = ['texto_busqueda']
 
-    class Meta:
+    class Meta(BaseModel.Meta):
         verbose_name = "Carrera"
         verbose_name_plural = "Carreras"
         ordering = ['nombre']
+        indexes = [
+            *BaseModel.Meta.indexes,
+            models.Index(Upper('nombre'), name='carrera_nombre_upper_idx'),
+            # Listados de activas ordenados por nombre, con o sin filtro de modalidad
+            indice_activos('nombre', name='carrera_activos_nombre_idx'),
+            indice_activos('modalidad', 'nombre', name='carrera_activos_mod_nombre_idx'),
+        ]
+
+    display_fields = ('nombre', 'modalidad__nombre')
+    select_related_fields = ('modalidad',)
 
     def __str__(self):
-        return f"{self.nombre} - {self.modalidad.nombre}"
+        return self.display_from_values(self.nombre, self.modalidad.nombre)
+
+    @classmethod
+    def display_from_values(cls, nombre, modalidad_nombre):
+        return f"{nombre} - {modalidad_nombre}"
 
     def clean(self):
         """
@@ -97,6 +133,15 @@ class Carrera(BaseModel):
         Sobrescribe save para ejecutar validaciones.
         """
         skip_validation = kwargs.pop('skip_validation', False)
-        if not skip_validation:
+        if not skip_validation and self.requiere_validacion():
             self.full_clean()
+        self.actualizar_campos_derivados()
         super().save(*args, **kwargs)
+
+    def actualizar_campos_derivados(self):
+        """Recalcula el texto de búsqueda desnormalizado."""
+        self.texto_busqueda = self.construir_texto_busqueda()
+
+    def construir_texto_busqueda(self):
+        """Mismo formato que Modalidad.sincronizar_carreras."""
+        return f"{self.nombre} {self.modalidad.nombre}"
@@ -14,7 +14,7 @@ class CarreraSerializer(BaseSerializer):
     
     class Meta:
         model = Carrera
-        fields = '__all__'
+        exclude = ['texto_busqueda']
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def __init__(self, *args, **kwargs):
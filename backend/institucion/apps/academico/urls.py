@@ -1,6 +1,6 @@
 from rest_framework.routers import DefaultRouter
-from .views.view_carreras import  CarreraViewSet
-from .views.view_modalidad import ModalidadViewSet
+from .views.view_carreras import  CarreraViewSet, AsyncCarreraViewSet
+from .views.view_modalidad import ModalidadViewSet, AsyncModalidadViewSet
 
 router = DefaultRouter(trailing_slash=False)
 
@@ -8,3 +8,7 @@ router.register(r'modalidades', ModalidadViewSet, basename='modalidad')
 router.register(r'carreras', CarreraViewSet, basename='carrera')
 
 urlpatterns = router.urls
+
+# Lecturas nativas de ASGI (mismas respuestas que las rutas síncronas)
+urlpatterns += AsyncModalidadViewSet.urls('async/modalidades', 'modalidad')
+urlpatterns += AsyncCarreraViewSet.urls('async/carreras', 'carrera')
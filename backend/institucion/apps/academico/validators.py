@@ -3,46 +3,107 @@ from django.utils.translation import gettext_lazy as _
 import re
 
 
+# Reglas precompiladas: se construyen una sola vez al importar el módulo
+PATRON_NOMBRE = re.compile(r'^[a-zA-ZáéíóúÁÉÍÓÚñÑüÜ\s]+$')
+CARACTERES_PROHIBIDOS = frozenset('<>{}[]\\|')
+LONGITUD_MINIMA = 3
+
+MENSAJES = {
+    'nombre_vacio': _('El nombre no puede estar vacío.'),
+    'caracteres_invalidos': _('El nombre contiene caracteres no permitidos.'),
+    'nombre_muy_corto': _('El nombre debe tener al menos 3 caracteres.'),
+    'nombre_invalido': _('El nombre solo puede contener letras y espacios.'),
+}
+
+
+def normalizar_nombre(valor):
+    """Igual que clean_nombre de los formularios: strip + title (5 -> '5', como CharField)."""
+    if valor is None:
+        return ''
+    return str(valor).strip().title()
+
+
+def errores_nombre(value):
+    """
+    Evalúa todas las reglas de nombre en una sola pasada (normaliza una vez)
+    y retorna la lista de códigos de error, en el mismo orden que los
+    validadores individuales.
+    """
+    if value is None:
+        value = ''
+    normalizado = value.strip()
+    codigos = []
+
+    if not normalizado:
+        codigos.append('nombre_vacio')
+    if not CARACTERES_PROHIBIDOS.isdisjoint(value):
+        codigos.append('caracteres_invalidos')
+    if len(normalizado) < LONGITUD_MINIMA:
+        codigos.append('nombre_muy_corto')
+    if not PATRON_NOMBRE.match(normalizado):
+        codigos.append('nombre_invalido')
+
+    return codigos
+
+
+def validar_nombres(values):
+    """
+    Validación por lotes (importaciones): retorna, para cada valor,
+    la lista de códigos de error (vacía si es válido). Los valores
+    repetidos se evalúan una sola vez.
+    """
+    cache = {}
+    resultado = []
+    for value in values:
+        if value not in cache:
+            cache[value] = errores_nombre(value)
+        resultado.append(cache[value])
+    return resultado
+
+
+def validate_nombre(value):
+    """
+    Validador único para campos nombre: aplica todas las reglas
+    y reporta todos los errores juntos.
+    """
+    codigos = errores_nombre(value)
+    if codigos:
+        raise ValidationError([
+            ValidationError(MENSAJES[codigo], code=codigo) for codigo in codigos
+        ])
+
+
+def _validar_regla(value, codigo):
+    if codigo in errores_nombre(value):
+        raise ValidationError(MENSAJES[codigo], code=codigo)
+
+
+# Validadores individuales: se conservan porque las migraciones los
+# referencian y para usos puntuales de una sola regla.
+
 def validate_nombre_no_vacio(value):
     """
     Valida que el nombre no esté vacío ni contenga solo espacios.
     """
-    if not value or not value.strip():
-        raise ValidationError(
-            _('El nombre no puede estar vacío.'),
-            code='nombre_vacio'
-        )
+    _validar_regla(value, 'nombre_vacio')
 
 
 def validate_nombre_sin_caracteres_especiales(value):
     """
     Valida que el nombre no contenga caracteres especiales peligrosos.
     """
-    caracteres_prohibidos = ['<', '>', '{', '}', '[', ']', '\\', '|']
-    if any(char in value for char in caracteres_prohibidos):
-        raise ValidationError(
-            _('El nombre contiene caracteres no permitidos.'),
-            code='caracteres_invalidos'
-        )
+    _validar_regla(value, 'caracteres_invalidos')
 
 
 def validate_longitud_minima_nombre(value):
     """
     Valida que el nombre tenga al menos 3 caracteres.
     """
-    if len(value.strip()) < 3:
-        raise ValidationError(
-            _('El nombre debe tener al menos 3 caracteres.'),
-            code='nombre_muy_corto'
-        )
+    _validar_regla(value, 'nombre_muy_corto')
 
 
 def validate_nombre_alfanumerico(value):
     """
     Valida que el nombre solo contenga letras y espacios.
     """
-    if not re.match(r'^[a-zA-ZáéíóúÁÉÍÓÚñÑüÜ\s]+$', value.strip()):
-        raise ValidationError(
-            _('El nombre solo puede contener letras y espacios.'),
-            code='nombre_invalido'
-        )
+    _validar_regla(value, 'nombre_invalido')
@@ -1,18 +1,37 @@
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
 from apps.core.viewset_base import BaseViewSet
+from apps.core.async_viewset import AsyncReadViewSet
+from apps.core.response_cache import cache_response
+from apps.core.conditional import conditional_response
 from ..models import Modalidad, Carrera
 from ..serializers.serializer_carreras import CarreraSerializer
+from ..importacion import CarreraImportador
 from ..forms.form_carreras import CarreraForm
 
 class CarreraViewSet(BaseViewSet):
     """ViewSet para gestionar carreras académicas."""
-    queryset = Carrera.objects.select_related('modalidad').all()
+    queryset = Carrera.objects.all()
     serializer_class = CarreraSerializer
     form_class = CarreraForm
-    search_fields = ['nombre', 'modalidad__nombre']
+    search_fields = ['texto_busqueda']
+    search_engine = 'trigram'
+    importador_class = CarreraImportador
+    export_fields = ['id', 'nombre', 'modalidad_id', 'modalidad__nombre', 'estado', 'created_at', 'updated_at']
+    query_budgets = {
+        'list': 3,
+        'datatable': 3,
+        'activas': 3,
+        'inactivas': 3,
+        'retrieve': 2,
+        'por_modalidad': 2,
+        'create': 5,
+        'update': 6,
+        'destroy': 3,
+        'restore': 3,
+        'hard_delete': 3,
+    }
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -25,9 +44,7 @@ class CarreraViewSet(BaseViewSet):
         if modalidad_id:
             queryset = queryset.filter(modalidad_id=modalidad_id)
         if search:
-            queryset = queryset.filter(
-                Q(nombre__icontains=search) | Q(modalidad__nombre__icontains=search)
-            )
+            queryset = queryset.filter(texto_busqueda__icontains=search)
         
         return queryset
     
@@ -47,6 +64,8 @@ class CarreraViewSet(BaseViewSet):
         return filters
     
     @action(detail=False, methods=['get'])
+    @conditional_response
+    @cache_response
     def por_modalidad(self, request):
         """Lista carreras por modalidad."""
         modalidad_id = request.query_params.get('modalidad_id')
@@ -56,6 +75,24 @@ class CarreraViewSet(BaseViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        queryset = self.queryset.filter(modalidad_id=modalidad_id, estado=True)
+        queryset = self.proyectar(self.queryset.filter(modalidad_id=modalidad_id, estado=True))
         serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+
+class AsyncCarreraViewSet(AsyncReadViewSet):
+    """Lecturas asíncronas de carreras (ver AsyncReadViewSet)."""
+    viewset_class = CarreraViewSet
+    extra_actions = ('por_modalidad',)
+
+    async def por_modalidad(self, request):
+        """Lista carreras por modalidad."""
+        modalidad_id = request.GET.get('modalidad_id')
+        if not modalidad_id:
+            return self.respuesta(
+                {'error': 'Se requiere modalidad_id'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.viewset.queryset.filter(modalidad_id=modalidad_id, estado=True)
+        return self.respuesta(await self.representar(queryset))
@@ -3,8 +3,10 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Q
 from apps.core.viewset_base import BaseViewSet
+from apps.core.async_viewset import AsyncReadViewSet
 from ..models import Modalidad, Carrera
 from ..serializers.serializer_modalidad import ModalidadSerializer
+from ..importacion import ModalidadImportador
 from ..forms.form_modalidad import ModalidadForm
 
 class ModalidadViewSet(BaseViewSet):
@@ -13,6 +15,20 @@ class ModalidadViewSet(BaseViewSet):
     serializer_class = ModalidadSerializer
     form_class = ModalidadForm
     search_fields = ['nombre']
+    search_engine = 'trigram'
+    importador_class = ModalidadImportador
+    query_budgets = {
+        'list': 3,
+        'datatable': 3,
+        'activas': 3,
+        'inactivas': 3,
+        'retrieve': 2,
+        'create': 5,
+        'update': 7,
+        'destroy': 5,
+        'restore': 3,
+        'hard_delete': 3,
+    }
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -45,4 +61,17 @@ class ModalidadViewSet(BaseViewSet):
                 {'error': 'No se puede eliminar una modalidad con carreras activas.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        return super().destroy(request, *args, **kwargs)
\ No newline at end of file
+        return super().destroy(request, *args, **kwargs)
+    
+    def get_bulk_destroy_errors(self, ids):
+        """Modalidades con carreras activas (una sola consulta)."""
+        con_carreras = Carrera.objects.filter(modalidad_id__in=ids).values_list('modalidad_id', flat=True)
+        return {
+            pk: 'No se puede eliminar una modalidad con carreras activas.'
+            for pk in set(con_carreras)
+        }
+
+
+class AsyncModalidadViewSet(AsyncReadViewSet):
+    """Lecturas asíncronas de modalidades (ver AsyncReadViewSet)."""
+    viewset_class = ModalidadViewSet
@@ -1,13 +1,105 @@
+import asyncio
+
 from django.db import models
 from django.db import transaction
 from django.core.exceptions import ValidationError
+from .keyset import (
+    CursorInvalido,
+    resolver_ordenamiento,
+    encode_cursor,
+    decode_cursor,
+    filtro_keyset,
+    valores_de_fila,
+)
+from .counting import (
+    COUNT_MODE_PARALLEL,
+    COUNT_MODE_WINDOW,
+    CAMPO_TOTAL_VENTANA,
+    acount_en_paralelo,
+    acount_queryset,
+    count_en_paralelo,
+    count_queryset,
+    resolver_count_mode,
+    separar_total,
+    total_en_ventana,
+)
+from .projection import aplicar_only
+from .search import get_search_engine
+from .cache_utils import bump_model_version_on_commit
+
+def indice_activos(*campos, name):
+    """
+    Índice parcial WHERE estado: coincide con el filtro de BaseManager, de
+    modo que las consultas de `objects` lo usan sin indexar los inactivos.
+    """
+    return models.Index(fields=list(campos), name=name, condition=models.Q(estado=True))
+
+
+class ConsultaDatatable:
+    """
+    Consultas de una página de datatable, todavía sin ejecutar:
+        - queryset: filtrado, para el conteo (con count_kwargs)
+        - pagina: queryset de la página a materializar
+        - completar(data, total, total_exact): arma el resultado
+        - count_mode: modo de conteo efectivo (ver resolver_count_mode)
+        - separar(data): en modo 'window', (data, total) sin la anotación
+    """
+
+    def __init__(self, queryset, count_kwargs, pagina, completar, count_mode, separar=None):
+        self.queryset = queryset
+        self.count_kwargs = count_kwargs
+        self.pagina = pagina
+        self.completar = completar
+        self.count_mode = count_mode
+        self.separar = separar
+
+
+async def alistar(queryset):
+    """list() asíncrono de un queryset."""
+    return [fila async for fila in queryset]
+
+
+def con_relaciones(queryset):
+    """Aplica el select_related declarado por el modelo (select_related_fields)."""
+    relaciones = getattr(queryset.model, 'select_related_fields', ())
+    return queryset.select_related(*relaciones) if relaciones else queryset
+
 
 class BaseManager(models.Manager):
     """
-    Manager que filtra objetos inactivos por defecto.
+    Manager que filtra objetos inactivos por defecto y carga las relaciones
+    declaradas en select_related_fields.
     """
     def get_queryset(self):
-        return super().get_queryset().filter(estado=True)
+        return con_relaciones(super().get_queryset().filter(estado=True))
+    
+    def datatable_queryset(self,
+                           filters=None,
+                           exclude=None,
+                           search=None,
+                           search_fields=None,
+                           search_engine=None):
+        """
+        Queryset con los filtros, exclusiones y búsqueda de datatable.
+        Lo comparten datatable y la exportación para aplicar las mismas reglas.
+        """
+        if filters and 'estado' in filters and filters['estado'] is False:
+            queryset = self.model.all_objects.get_queryset()
+        else:
+            # Inicia con el queryset base (solo activos)
+            queryset = self.get_queryset()
+        
+        if filters:
+            queryset = queryset.filter(**filters)
+        
+        if exclude:
+            queryset = queryset.exclude(**exclude)
+        
+        if search and search_fields:
+            engine = get_search_engine(search_engine, search_fields)
+            queryset = engine.apply(queryset, search)
+        
+        return queryset
     
     def datatable(self, 
                   fields=None, 
@@ -17,70 +109,246 @@ class BaseManager(models.Manager):
                   limit=None, 
                   offset=0,
                   search=None,
-                  search_fields=None):
+                  search_fields=None,
+                  cursor=None,
+                  use_cursor=False,
+                  count_strategy=None,
+                  search_engine=None,
+                  as_tuples=False,
+                  count_mode=None,
+                  only=None):
         """
+        Paginación por offset (por defecto) o por cursor (keyset) si
+        use_cursor=True. En modo cursor se ignora offset y se filtra a partir
+        de los valores de la última fila de la página anterior, por lo que el
+        costo de cualquier página es el mismo que el de la primera.
+
+        count_strategy: 'exact', 'estimated' o 'cached' (ver apps.core.counting).
+        Por defecto se usa settings.DATATABLE_COUNT_STRATEGY.
+
+        count_mode: cómo se ejecuta el conteo junto a la página:
+        'sequential' (uno después del otro), 'parallel' (el conteo en otro
+        hilo con su propia conexión) o 'window' (COUNT(*) OVER () en la misma
+        consulta). Por defecto se usa settings.DATATABLE_COUNT_MODE; si el
+        modo no aplica (p. ej. 'window' en modo cursor o 'parallel' dentro de
+        una transacción) se usa 'sequential' (ver resolver_count_mode).
+
+        search_engine: 'icontains' (por defecto), 'trigram' o 'fulltext'
+        (ver apps.core.search). Los motores con ranking ordenan por
+        relevancia cuando no se indica order_by.
+
+        as_tuples: con fields, retorna tuplas (values_list) en lugar de
+        diccionarios, en el orden de fields.
+
+        only: sin fields, rutas a cargar en las instancias (only()); p. ej.
+        las que lee el serializer (ver apps.core.projection).
+
         Retorna:
             dict con:
                 - data: Lista de registros (como diccionarios si fields está definido, sino objetos)
                 - count: Cantidad de registros retornados (con limit)
                 - total: Cantidad total de registros (sin limit, solo con filtros)
+                - total_exact: False si total es una estimación
+                - next_cursor: Token de la siguiente página (solo en modo cursor)
+
+        Lanza CursorInvalido si el cursor no puede decodificarse.
         """
-        from django.db.models import Q
+        consulta = self._preparar_datatable(
+            fields, filters, exclude, order_by, limit, offset, search, search_fields,
+            cursor, use_cursor, count_strategy, search_engine, as_tuples, count_mode, only
+        )
         
-        if filters and 'estado' in filters and filters['estado'] is False:
-            queryset = self.model.all_objects.get_queryset()
+        if consulta.count_mode == COUNT_MODE_PARALLEL:
+            conteo = count_en_paralelo(consulta.queryset, **consulta.count_kwargs)
+            data = list(consulta.pagina)
+            total, total_exact = conteo.result()
+        elif consulta.count_mode == COUNT_MODE_WINDOW:
+            data, total = consulta.separar(list(consulta.pagina))
+            total_exact = True
+            if total is None:
+                total, total_exact = count_queryset(consulta.queryset, **consulta.count_kwargs)
         else:
-            # Inicia con el queryset base (solo activos)
-            queryset = self.get_queryset()
+            total, total_exact = count_queryset(consulta.queryset, **consulta.count_kwargs)
+            data = list(consulta.pagina)
         
-        if filters:
-            queryset = queryset.filter(**filters)
+        return consulta.completar(data, total, total_exact)
+
+    async def adatatable(self, **kwargs):
+        """
+        Variante asíncrona de datatable (mismos parámetros y resultado):
+        cuenta con acount() y recorre la página con iteración asíncrona.
+        """
+        consulta = self._preparar_datatable(**kwargs)
         
-        if exclude:
-            queryset = queryset.exclude(**exclude)
+        if consulta.count_mode == COUNT_MODE_PARALLEL:
+            (total, total_exact), data = await asyncio.gather(
+                acount_en_paralelo(consulta.queryset, **consulta.count_kwargs),
+                alistar(consulta.pagina),
+            )
+        elif consulta.count_mode == COUNT_MODE_WINDOW:
+            data, total = consulta.separar(await alistar(consulta.pagina))
+            total_exact = True
+            if total is None:
+                total, total_exact = await acount_queryset(consulta.queryset, **consulta.count_kwargs)
+        else:
+            total, total_exact = await acount_queryset(consulta.queryset, **consulta.count_kwargs)
+            data = await alistar(consulta.pagina)
         
-        if search and search_fields:
-            search_query = Q()
-            for field in search_fields:
-                search_query |= Q(**{f"{field}__icontains": search})
-            queryset = queryset.filter(search_query)
+        return consulta.completar(data, total, total_exact)
+
+    def _preparar_datatable(self,
+                            fields=None,
+                            filters=None,
+                            exclude=None,
+                            order_by=None,
+                            limit=None,
+                            offset=0,
+                            search=None,
+                            search_fields=None,
+                            cursor=None,
+                            use_cursor=False,
+                            count_strategy=None,
+                            search_engine=None,
+                            as_tuples=False,
+                            count_mode=None,
+                            only=None):
+        """
+        Arma las consultas de datatable sin ejecutarlas, para que las
+        variantes síncrona y asíncrona compartan las mismas reglas.
+        """
+        queryset = self.datatable_queryset(
+            filters=filters,
+            exclude=exclude,
+            search=search,
+            search_fields=search_fields,
+            search_engine=search_engine
+        )
+        count_kwargs = {
+            'strategy': count_strategy,
+            'signature': {
+                'filters': filters,
+                'exclude': exclude,
+                'search': search,
+                'search_fields': search_fields,
+                'search_engine': search_engine,
+            },
+        }
+        
+        count_mode = resolver_count_mode(queryset, count_mode, count_strategy, cursor=use_cursor)
         
-        total = queryset.count()
+        only = None if fields else only
         
+        if use_cursor:
+            pagina, completar = self._datatable_cursor(queryset, fields, order_by, limit, cursor, as_tuples, only)
+            return ConsultaDatatable(queryset, count_kwargs, pagina, completar, count_mode)
+        
+        pagina = aplicar_only(queryset, only) if only else queryset
         # Aplica ordenamiento
         if order_by:
             if isinstance(order_by, str):
-                queryset = queryset.order_by(order_by)
+                pagina = pagina.order_by(order_by)
             elif isinstance(order_by, (list, tuple)):
-                queryset = queryset.order_by(*order_by)
+                pagina = pagina.order_by(*order_by)
         # Si no se especifica order_by, usa el ordenamiento del modelo o por defecto descendente por id
-        elif not queryset.ordered:
-            queryset = queryset.order_by('-id')
+        elif not pagina.ordered:
+            pagina = pagina.order_by('-id')
+        
+        ventana = count_mode == COUNT_MODE_WINDOW
+        if ventana:
+            # Se evalúa antes de LIMIT/OFFSET: cada fila trae el total filtrado
+            pagina = pagina.annotate(**{CAMPO_TOTAL_VENTANA: total_en_ventana()})
         
         # Aplica offset y limit (paginación)
         if offset:
-            queryset = queryset[offset:]
+            pagina = pagina[offset:]
         if limit:
-            queryset = queryset[:limit]
+            pagina = pagina[:limit]
         
         # Selecciona solo los campos especificados
+        extra = [CAMPO_TOTAL_VENTANA] if ventana else []
+        if fields and as_tuples:
+            pagina = pagina.values_list(*fields, *extra)
+        elif fields:
+            pagina = pagina.values(*fields, *extra)
+        
+        def completar(data, total, total_exact):
+            return {
+                'data': data,
+                'count': len(data),
+                'total': total,
+                'total_exact': total_exact
+            }
+        
+        separar = None
+        if ventana:
+            forma = ('tuplas' if as_tuples else 'dicts') if fields else 'objetos'
+            
+            def separar(data):
+                return separar_total(data, forma, offset)
+        
+        return ConsultaDatatable(queryset, count_kwargs, pagina, completar, count_mode, separar)
+
+    def _datatable_cursor(self, queryset, fields, order_by, limit, cursor, as_tuples=False, only=None):
+        """Página por keyset: WHERE (columnas) > (valores del cursor)."""
+        columnas = resolver_ordenamiento(queryset, order_by)
+        pagina = queryset.order_by(*columnas)
+        if only:
+            # El cursor se arma con los valores de ordenamiento de la última fila
+            pagina = aplicar_only(pagina, [*only, *[c.lstrip('-') for c in columnas]])
+        
+        if cursor:
+            valores = decode_cursor(cursor, columnas)
+            try:
+                pagina = pagina.filter(filtro_keyset(columnas, valores))
+            except (ValidationError, ValueError, TypeError):
+                # Valores que no corresponden al tipo de la columna (p. ej. id "abc")
+                raise CursorInvalido('Cursor inválido.')
+        
+        # Se pide una fila extra para saber si existe una página siguiente
+        limit = limit or 10
+        pagina = pagina[:limit + 1]
+        
+        faltantes = []
         if fields:
-            data = list(queryset.values(*fields))
-        else:
-            data = list(queryset)
+            faltantes = [c.lstrip('-') for c in columnas if c.lstrip('-') not in fields]
+            if as_tuples:
+                pagina = pagina.values_list(*fields, *faltantes)
+            else:
+                pagina = pagina.values(*fields, *faltantes)
         
-        return {
-            'data': data,
-            'count': len(data),
-            'total': total
-        }
+        def completar(data, total, total_exact):
+            next_cursor = None
+            if len(data) > limit:
+                data = data[:limit]
+                ultima = data[-1]
+                if as_tuples:
+                    ultima = dict(zip(list(fields) + faltantes, ultima))
+                next_cursor = encode_cursor(columnas, valores_de_fila(ultima, columnas))
+            
+            if faltantes:
+                if as_tuples:
+                    data = [fila[:len(fields)] for fila in data]
+                else:
+                    for fila in data:
+                        for campo in faltantes:
+                            fila.pop(campo, None)
+            
+            return {
+                'data': data,
+                'count': len(data),
+                'total': total,
+                'next_cursor': next_cursor,
+                'total_exact': total_exact
+            }
+        
+        return pagina, completar
 
 class AllObjectsManager(models.Manager):
     """
     Manager para acceder a todos los objetos, incluyendo inactivos.
     """
     def get_queryset(self):
-        return super().get_queryset()
+        return con_relaciones(super().get_queryset())
 
 class BaseModel(models.Model):
     """
@@ -104,13 +372,66 @@ class BaseModel(models.Model):
     all_objects = AllObjectsManager()
 
     class Meta:
+        # Las subclases deben heredar con `class Meta(BaseModel.Meta)` y
+        # extender indexes con [*BaseModel.Meta.indexes, ...]
         abstract = True
         ordering = ['-id'] 
         indexes = [
-            models.Index(fields=['created_at']),
-            models.Index(fields=['estado']),
+            indice_activos('-id', name='%(class)s_activos_id_idx'),
         ]
 
+    # Campos calculados por actualizar_campos_derivados (se incluyen en bulk_update)
+    campos_derivados = []
+
+    # Relaciones que los managers cargan con select_related (p. ej. las que
+    # usa __str__), para evitar una consulta por objeto
+    select_related_fields = ()
+
+    # Tablas pequeñas y poco modificadas: se mantienen en memoria del proceso
+    # y se resuelven sin consultas (ver apps.core.lookup_table).
+    # lookup_key_field indexa además por ese campo, normalizado con clave_nombre
+    lookup_table = False
+    lookup_key_field = None
+
+    # Rutas de values() necesarias para reconstruir str(obj) sin instanciar
+    # el modelo (ver display_from_values). None si no se declara.
+    display_fields = None
+
+    @classmethod
+    def display_from_values(cls, *valores):
+        """Equivalente a str(obj) a partir de los valores de display_fields."""
+        raise NotImplementedError
+
+    def actualizar_campos_derivados(self):
+        """
+        Recalcula campos desnormalizados. save() de las subclases lo invoca;
+        las operaciones masivas (que no pasan por save) deben llamarlo.
+        """
+
+    def _valores_validados(self):
+        return tuple(getattr(self, f.attname) for f in self._meta.concrete_fields)
+
+    def marcar_validado(self):
+        """
+        Registra que la instancia ya pasó por la validación de un BaseForm,
+        junto con una instantánea de sus valores.
+        """
+        self._instantanea_validada = self._valores_validados()
+
+    def requiere_validacion(self):
+        """
+        True salvo que la instancia venga validada por un formulario y no
+        haya cambiado desde entonces; en ese caso full_clean sería repetido.
+        """
+        instantanea = getattr(self, '_instantanea_validada', None)
+        return instantanea is None or instantanea != self._valores_validados()
+
+    def save(self, *args, **kwargs):
+        """Guarda e invalida los datos cacheados que dependen del modelo."""
+        super().save(*args, **kwargs)
+        self._instantanea_validada = None
+        bump_model_version_on_commit(type(self))
+
     def delete(self, using=None, keep_parents=False):
         """Soft delete: marca como inactivo en lugar de eliminar."""
         self.estado = False
@@ -119,6 +440,7 @@ class BaseModel(models.Model):
     def hard_delete(self):
         """Eliminación real de la base de datos."""
         super().delete()
+        bump_model_version_on_commit(type(self))
 
     def restore(self):
         """Restaura un objeto marcado como inactivo."""
@@ -0,0 +1,151 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
+from django.urls import path
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAcceptable, NotFound
+from rest_framework.negotiation import DefaultContentNegotiation
+
+from .columnar import LayoutNoSoportado
+from .fast_serializer import get_representation_plan
+from .instrumentation import medir_serializacion, registrar_vista
+from .keyset import CursorInvalido
+from .projection import CamposNoPermitidos
+from .renderers import FastJSONRenderer, get_renderer_classes
+from .response_cache import viewset_label
+
+
+class AsyncReadViewSet(View):
+    """
+    Lecturas nativas de ASGI (list, retrieve, datatable, activas, inactivas
+    y las acciones de extra_actions) con el ORM asíncrono: acount(), aget()
+    e iteración asíncrona, sin el salto sync->async por request.
+
+    La configuración (modelo, filtros, búsqueda, conteo, serializer y
+    presupuestos de consultas) se toma de `viewset_class`, por lo que la
+    respuesta es la misma que la del BaseViewSet síncrono. Antes de servir
+    aplica la autenticación, los permisos y el throttling de ese viewset;
+    no aplica la cache de respuestas ni los GET condicionales.
+    """
+    viewset_class = None  # BaseViewSet del que se toma la configuración
+    action = None  # Lo fija urls() por ruta
+    extra_actions = ()  # Acciones de lectura propias de la subclase (async def)
+    renderer_classes = get_renderer_classes([FastJSONRenderer])  # Sin BrowsableAPIRenderer
+
+    @classmethod
+    def urls(cls, prefix, basename):
+        """Rutas equivalentes a las del router de DRF (sin barra final)."""
+        acciones = ['datatable', 'activas', 'inactivas', *cls.extra_actions]
+        return [
+            path(prefix, cls.as_view(action='list'), name=f'{basename}-async-list'),
+            *[
+                path(f'{prefix}/{accion}', cls.as_view(action=accion), name=f'{basename}-async-{accion}')
+                for accion in acciones
+            ],
+            path(f'{prefix}/<int:pk>', cls.as_view(action='retrieve'), name=f'{basename}-async-detail'),
+        ]
+
+    @property
+    def model(self):
+        return self.viewset_class.queryset.model
+
+    async def get(self, request, *args, **kwargs):
+        # Instancia del viewset síncrono como fuente de configuración y de
+        # las políticas de acceso (authentication/permission/throttle_classes)
+        self.viewset = self.viewset_class(
+            action_map={'get': self.action}, args=args, kwargs=kwargs, format_kwarg=None
+        )
+        self.viewset.request = self.viewset.initialize_request(request, *args, **kwargs)
+        registrar_vista(
+            viewset_label(self), self.action, self.viewset_class.query_budgets.get(self.action)
+        )
+        try:
+            # La autenticación puede consultar la base de datos (usuario del token)
+            await sync_to_async(self.verificar_acceso)()
+        except APIException as e:
+            return self.respuesta_de_excepcion(e)
+        return await getattr(self, self.action)(request, **kwargs)
+
+    def verificar_acceso(self):
+        """Mismas verificaciones que APIView.initial del viewset síncrono."""
+        self.viewset.perform_authentication(self.viewset.request)
+        self.viewset.check_permissions(self.viewset.request)
+        self.viewset.check_throttles(self.viewset.request)
+
+    def respuesta_de_excepcion(self, exc):
+        """401/403/429 con el cuerpo y las cabeceras del manejador de DRF."""
+        response = self.viewset.handle_exception(exc)
+        contenido = self.respuesta(response.data, status=response.status_code)
+        for cabecera, valor in response.items():
+            # El Content-Type es el del renderer negociado
+            if cabecera.lower() != 'content-type':
+                contenido[cabecera] = valor
+        return contenido
+
+    def get_renderer(self):
+        """Renderer negociado con Accept o `?format=`; JSON si ninguno coincide."""
+        renderers = [renderer() for renderer in self.renderer_classes]
+        try:
+            renderer, _ = DefaultContentNegotiation().select_renderer(self.viewset.request, renderers)
+        except (NotAcceptable, NotFound):
+            renderer = renderers[0]
+        return renderer
+
+    def respuesta(self, data, status=status.HTTP_200_OK):
+        renderer = self.get_renderer()
+        with medir_serializacion():
+            contenido = renderer.render(data)
+        return HttpResponse(contenido, status=status, content_type=renderer.media_type)
+
+    async def representar(self, queryset):
+        """
+        Lista representada con el plan compilado de la acción (values_list
+        asíncrono); si el serializer no es compilable se serializa en un hilo.
+        """
+        plan = get_representation_plan(self.viewset.get_serializer_class(), self.action)
+        if plan is None:
+            queryset = self.viewset.proyectar(queryset)
+            return await sync_to_async(
+                lambda: self.viewset.get_serializer(list(queryset), many=True).data
+            )()
+        filas = [fila async for fila in queryset.values_list(*plan.paths)]
+        with medir_serializacion():
+            return plan.render(filas)
+
+    async def list(self, request):
+        return await self.datatable(request)
+
+    async def activas(self, request):
+        return await self.datatable(request, estado='true')
+
+    async def inactivas(self, request):
+        return await self.datatable(request, estado='false')
+
+    async def datatable(self, request, estado=None):
+        if estado is not None:
+            request.GET = request.GET.copy()
+            request.GET['estado'] = estado
+
+        try:
+            layout = self.viewset.get_layout(self.viewset.request)
+            params, plan = self.viewset.get_datatable_params(self.viewset.request)
+            result = await self.model.objects.adatatable(**params)
+        except (CursorInvalido, CamposNoPermitidos, LayoutNoSoportado) as e:
+            return self.respuesta({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if plan is None and not params['fields'] and result['data']:
+            # Serializer no compilable: puede acceder a la base de datos
+            result = await sync_to_async(self.viewset.representar_datatable)(result, plan, None, layout)
+        else:
+            result = self.viewset.representar_datatable(result, plan, params['fields'], layout)
+        return self.respuesta(result)
+
+    async def retrieve(self, request, pk):
+        try:
+            instance = await self.viewset.get_queryset().aget(pk=pk)
+        except (self.model.DoesNotExist, ValidationError, ValueError, TypeError):
+            return self.respuesta({'detail': NotFound.default_detail}, status=status.HTTP_404_NOT_FOUND)
+
+        data = await sync_to_async(lambda: self.viewset.get_serializer(instance).data)()
+        return self.respuesta(data)
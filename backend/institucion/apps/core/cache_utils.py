@@ -0,0 +1,101 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+# Backends cuyo contenido es propio de cada proceso
+CACHES_LOCALES = (LocMemCache, DummyCache)
+
+
+def model_version_key(model):
+    return f"model_version:{model._meta.label_lower}"
+
+
+def model_modified_key(model):
+    return f"model_modified:{model._meta.label_lower}"
+
+
+def cache_compartida():
+    """
+    True si la cache default la comparten todos los procesos (redis,
+    memcached, base de datos, archivos). Los sellos de versión viven en
+    ella: con una cache local (locmem, dummy) la escritura que atiende un
+    worker no invalida lo que guardaron los demás. settings.CACHE_SHARED
+    fuerza el resultado (p. ej. True cuando se sirve con un solo proceso).
+    """
+    forzado = getattr(settings, 'CACHE_SHARED', None)
+    if forzado is not None:
+        return forzado
+    return not isinstance(caches['default'], CACHES_LOCALES)
+
+
+def get_model_version(model):
+    """
+    Retorna el sello de versión actual del modelo.
+    Se inicializa con un timestamp para que, si la clave se pierde del
+    cache, la nueva versión nunca coincida con una anterior.
+    """
+    key = model_version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_model_version(model):
+    """Incrementa la versión del modelo invalidando todo lo que dependa de ella."""
+    key = model_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), timeout=None)
+    cache.set(model_modified_key(model), time.time(), timeout=None)
+
+
+def get_model_last_modified(model):
+    """
+    Timestamp de la última escritura del modelo.
+    Si no se conoce (cache recién iniciado) se asume el momento actual,
+    lo que solo obliga a los clientes a descargar de nuevo.
+    """
+    key = model_modified_key(model)
+    modified = cache.get(key)
+    if modified is None:
+        cache.add(key, time.time(), timeout=None)
+        modified = cache.get(key)
+    return modified
+
+
+def bump_model_version_on_commit(model):
+    """Incrementa la versión cuando la transacción actual se confirme."""
+    transaction.on_commit(lambda: bump_model_version(model))
+
+
+def related_models(model):
+    """Modelos referenciados por las ForeignKey del modelo."""
+    return [
+        field.related_model
+        for field in model._meta.concrete_fields
+        if field.is_relation and field.many_to_one
+    ]
+
+
+def get_dependency_version(model):
+    """
+    Versión compuesta del modelo y de los modelos relacionados.
+    Cambia cuando se escribe el modelo o cualquiera de sus ForeignKey
+    (p. ej. renombrar una Modalidad invalida lo cacheado de Carrera).
+    """
+    modelos = [model] + related_models(model)
+    return '.'.join(str(get_model_version(m)) for m in modelos)
+
+
+def get_dependency_last_modified(model):
+    """Última escritura (en segundos, redondeada hacia arriba) del modelo y sus ForeignKey."""
+    modelos = [model] + related_models(model)
+    return math.ceil(max(get_model_last_modified(m) for m in modelos))
@@ -0,0 +1,33 @@
+LAYOUT_OBJECTS = 'objects'
+LAYOUT_COLUMNAR = 'columnar'
+LAYOUTS = (LAYOUT_OBJECTS, LAYOUT_COLUMNAR)
+
+
+class LayoutNoSoportado(ValueError):
+    """El parámetro `layout` no es una de las opciones de LAYOUTS."""
+
+
+def parse_layout(valor):
+    """Layout de `?layout=` (por defecto 'objects'). Lanza LayoutNoSoportado."""
+    if not valor:
+        return LAYOUT_OBJECTS
+    if valor not in LAYOUTS:
+        raise LayoutNoSoportado(f'Layout no soportado. Opciones: {", ".join(LAYOUTS)}.')
+    return valor
+
+
+def a_columnas(result, columns, rows):
+    """
+    Reemplaza result['data'] por `columns` (nombres) y `rows` (una lista
+    de valores por fila, en el orden de columns). El resto de claves
+    (total, count, next_cursor...) se conserva.
+    """
+    result.pop('data', None)
+    result['columns'] = list(columns)
+    result['rows'] = rows
+    return result
+
+
+def filas_de_dicts(data, columns):
+    """Filas de una lista de dicts (p. ej. serializer.data) en el orden de columns."""
+    return [[fila[columna] for columna in columns] for fila in data]
@@ -0,0 +1,74 @@
+import hashlib
+from functools import wraps
+
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache_utils import cache_compartida, get_dependency_last_modified, get_dependency_version
+from .response_cache import request_signature, viewset_label
+
+
+def build_etag(view, request, kwargs):
+    """
+    ETag fuerte derivado de la versión de los modelos, la acción,
+    la firma de la petición y el tipo de contenido negociado.
+    No requiere consultar la base de datos.
+    """
+    partes = [
+        viewset_label(view),
+        view.action,
+        get_dependency_version(view.queryset.model),
+        request_signature(request, kwargs),
+        getattr(request, 'accepted_media_type', '') or '',
+    ]
+    digest = hashlib.md5(':'.join(str(p) for p in partes).encode('utf-8')).hexdigest()
+    return quote_etag(digest)
+
+
+def no_modificado(request, etag, last_modified):
+    """Evalúa If-None-Match y, si no viene, If-Modified-Since."""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in etags
+
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def conditional_response(view_method):
+    """
+    GET condicional para acciones de lectura de BaseViewSet.
+    Responde 304 sin ejecutar la consulta ni la serialización cuando el
+    cliente ya tiene la versión actual; en otro caso agrega ETag y
+    Last-Modified a la respuesta 200. Solo se aplica con una cache
+    compartida (ver cache_utils.cache_compartida).
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        # Sin cache compartida, un worker que no vio la escritura conservaría
+        # su versión y respondería 304 con datos ajenos indefinidamente
+        if (not self.conditional_get or request.method != 'GET'
+                or getattr(self, '_conditional_activo', False) or not cache_compartida()):
+            return view_method(self, request, *args, **kwargs)
+
+        etag = build_etag(self, request, kwargs)
+        last_modified = get_dependency_last_modified(self.queryset.model)
+
+        if no_modificado(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            self._conditional_activo = True
+            try:
+                response = view_method(self, request, *args, **kwargs)
+            finally:
+                self._conditional_activo = False
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    return wrapper
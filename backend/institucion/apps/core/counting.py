@@ -0,0 +1,227 @@
+import asyncio
+import contextvars
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+from django.db.models import Count, Window
+
+from .cache_utils import cache_compartida, get_dependency_version
+
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATED = 'estimated'
+COUNT_CACHED = 'cached'
+
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_ESTIMATED, COUNT_CACHED)
+
+# Cómo se ejecuta el conteo respecto de la consulta de la página
+COUNT_MODE_SEQUENTIAL = 'sequential'  # count() y luego la página
+COUNT_MODE_PARALLEL = 'parallel'  # count() en otro hilo (otra conexión)
+COUNT_MODE_WINDOW = 'window'  # COUNT(*) OVER () en la consulta de la página
+
+COUNT_MODES = (COUNT_MODE_SEQUENTIAL, COUNT_MODE_PARALLEL, COUNT_MODE_WINDOW)
+
+# Anotación con el total en el modo 'window'
+CAMPO_TOTAL_VENTANA = '_datatable_total'
+
+
+def default_count_strategy():
+    return getattr(settings, 'DATATABLE_COUNT_STRATEGY', COUNT_EXACT)
+
+
+def default_count_mode():
+    return getattr(settings, 'DATATABLE_COUNT_MODE', COUNT_MODE_SEQUENTIAL)
+
+
+def resolver_count_mode(queryset, count_mode=None, strategy=None, cursor=False):
+    """
+    Modo de conteo efectivo para el queryset filtrado. Vuelve a
+    'sequential' cuando el modo pedido no es correcto o no aporta:
+        - window: solo con conteo exacto, paginación por offset (en modo
+          cursor la ventana contaría solo las filas posteriores al cursor)
+          y sin DISTINCT.
+        - parallel: no dentro de una transacción (la otra conexión no
+          vería sus cambios) ni con SQLite en memoria.
+    """
+    count_mode = count_mode or default_count_mode()
+    if count_mode not in COUNT_MODES:
+        raise ValueError(f"Modo de conteo desconocido: {count_mode}")
+
+    if count_mode == COUNT_MODE_WINDOW:
+        exacto = (strategy or default_count_strategy()) == COUNT_EXACT
+        if not exacto or cursor or queryset.query.distinct:
+            return COUNT_MODE_SEQUENTIAL
+
+    if count_mode == COUNT_MODE_PARALLEL:
+        connection = connections[queryset.db]
+        if connection.in_atomic_block or (connection.vendor == 'sqlite' and connection.is_in_memory_db()):
+            return COUNT_MODE_SEQUENTIAL
+
+    return count_mode
+
+
+def count_queryset(queryset, strategy=None, signature=None):
+    """
+    Cuenta los registros del queryset según la estrategia indicada.
+
+    Retorna:
+        tupla (total, exacto) donde exacto indica si el total es exacto
+        o una estimación del planificador de Postgres.
+    """
+    strategy = strategy or default_count_strategy()
+    if strategy not in COUNT_STRATEGIES:
+        raise ValueError(f"Estrategia de conteo desconocida: {strategy}")
+
+    if strategy == COUNT_ESTIMATED:
+        estimado = estimate_count(queryset)
+        umbral = getattr(settings, 'DATATABLE_COUNT_ESTIMATE_THRESHOLD', 1000)
+        # Por debajo del umbral el conteo exacto es barato
+        if estimado is not None and estimado >= umbral:
+            return estimado, False
+        return queryset.count(), True
+
+    if strategy == COUNT_CACHED:
+        return cached_count(queryset, signature), True
+
+    return queryset.count(), True
+
+
+async def acount_queryset(queryset, strategy=None, signature=None):
+    """
+    Variante asíncrona de count_queryset. El conteo exacto (y 'cached' sin
+    cache compartida) usa acount(); 'estimated' y 'cached' (cursor crudo /
+    cache) corren su versión síncrona en un hilo.
+    """
+    strategy = strategy or default_count_strategy()
+    if strategy == COUNT_EXACT or (strategy == COUNT_CACHED and not cache_compartida()):
+        return await queryset.acount(), True
+    return await sync_to_async(count_queryset)(queryset, strategy, signature)
+
+
+# --------------------------------------
+# Modo 'parallel'
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def count_pool():
+    """Pool de hilos del conteo en paralelo; cada hilo mantiene su conexión."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'DATATABLE_COUNT_WORKERS', 4),
+                    thread_name_prefix='datatable-count',
+                )
+    return _pool
+
+
+def _en_hilo_de_conteo(funcion, *args, **kwargs):
+    # Como un request: descarta conexiones vencidas o rotas antes y después
+    # (con CONN_MAX_AGE=0 la conexión se cierra al terminar)
+    close_old_connections()
+    try:
+        return funcion(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+def count_en_paralelo(queryset, strategy=None, signature=None):
+    """
+    Inicia count_queryset en el pool y retorna el Future. El contexto se
+    copia para que la instrumentación del request cuente la consulta.
+    """
+    contexto = contextvars.copy_context()
+    return count_pool().submit(
+        contexto.run, _en_hilo_de_conteo, count_queryset, queryset, strategy, signature
+    )
+
+
+async def acount_en_paralelo(queryset, strategy=None, signature=None):
+    """Variante asíncrona: espera el Future del pool sin bloquear el event loop."""
+    return await asyncio.wrap_future(count_en_paralelo(queryset, strategy, signature))
+
+
+# --------------------------------------
+# Modo 'window'
+
+def total_en_ventana():
+    """COUNT(*) OVER (): total de filas filtradas, antes de LIMIT/OFFSET."""
+    return Window(expression=Count('*'))
+
+
+def separar_total(data, forma, offset=0):
+    """
+    Quita la anotación CAMPO_TOTAL_VENTANA de las filas de la página.
+    forma: 'tuplas' (último elemento), 'dicts' o 'objetos'.
+
+    Retorna:
+        tupla (data, total). total es None si la página está vacía por un
+        offset mayor que el total (la ventana no informa nada): hay que contar.
+    """
+    if not data:
+        return data, (None if offset else 0)
+
+    if forma == 'tuplas':
+        return [fila[:-1] for fila in data], data[0][-1]
+    if forma == 'dicts':
+        total = data[0][CAMPO_TOTAL_VENTANA]
+        for fila in data:
+            del fila[CAMPO_TOTAL_VENTANA]
+        return data, total
+
+    total = getattr(data[0], CAMPO_TOTAL_VENTANA)
+    for objeto in data:
+        delattr(objeto, CAMPO_TOTAL_VENTANA)
+    return data, total
+
+
+def cached_count(queryset, signature=None):
+    """
+    Conteo exacto cacheado por firma de filtros + búsqueda.
+    La clave incluye la versión del modelo, por lo que cualquier escritura
+    desde BaseModel invalida los conteos anteriores. Si la cache no es
+    compartida (ver cache_compartida) la versión no se invalida entre
+    procesos y se cuenta sin cache.
+    """
+    if not cache_compartida():
+        return queryset.count()
+    model = queryset.model
+    firma = json.dumps(signature or {}, sort_keys=True, default=str)
+    digest = hashlib.md5(firma.encode('utf-8')).hexdigest()
+    key = f"datatable_count:{model._meta.label_lower}:{get_dependency_version(model)}:{digest}"
+
+    total = cache.get(key)
+    if total is None:
+        total = queryset.count()
+        timeout = getattr(settings, 'DATATABLE_COUNT_CACHE_TIMEOUT', 60)
+        cache.set(key, total, timeout)
+    return total
+
+
+def estimate_count(queryset):
+    """
+    Estima el total con las filas que prevé el planificador de Postgres
+    (EXPLAIN). Los querysets de datatable siempre filtran por estado, así
+    que no se usa pg_class.reltuples: sin filtros, el planificador parte de
+    ese mismo valor. Retorna None si el motor no es Postgres.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
@@ -0,0 +1,65 @@
+from django.db.models import CharField, Func
+from django.utils import timezone
+
+FORMATO_FECHA_HORA = '%d/%m/%Y %H:%M:%S'
+# Equivalente de FORMATO_FECHA_HORA para to_char de Postgres
+FORMATO_FECHA_HORA_SQL = 'DD/MM/YYYY HH24:MI:SS'
+
+# Estrategias de formateo seleccionables por serializer:
+#   'python'   -> localtime + strftime por valor
+#   'memo'     -> DatetimeFormatter (zona horaria resuelta una vez, memoizado)
+#   'database' -> to_char en la consulta cuando las filas vienen de
+#                 values_list (plan de apps.core.fast_serializer) en Postgres;
+#                 en cualquier otro caso se usa 'memo'
+DATETIME_FORMAT_STRATEGIES = ('python', 'memo', 'database')
+
+
+def format_datetime(value):
+    """Formateo directo: localtime + strftime."""
+    if value:
+        local_time = timezone.localtime(value)
+        return local_time.strftime(FORMATO_FECHA_HORA)
+    return None
+
+
+class DatetimeFormatter:
+    """
+    Formatea fechas con el mismo resultado que format_datetime, pero resuelve
+    la zona horaria actual una sola vez y memoiza por timestamp (created_at y
+    updated_at suelen coincidir). Pensado para vivir lo que dura una
+    respuesta: una instancia por serialización.
+    """
+
+    def __init__(self, tz=None):
+        self.tz = tz or timezone.get_current_timezone()
+        self.cache = {}
+
+    def __call__(self, value):
+        if not value:
+            return None
+        texto = self.cache.get(value)
+        if texto is None:
+            if timezone.is_naive(value):
+                # Mismo error que localtime() para valores sin zona horaria
+                return format_datetime(value)
+            local = value.astimezone(self.tz)
+            texto = self.cache[value] = (
+                f'{local.day:02d}/{local.month:02d}/{local.year} '
+                f'{local.hour:02d}:{local.minute:02d}:{local.second:02d}'
+            )
+        return texto
+
+
+class ToCharLocal(Func):
+    """
+    to_char(campo AT TIME ZONE <zona actual>, FORMATO_FECHA_HORA_SQL).
+    La zona se toma al compilar la consulta, igual que localtime().
+    Solo Postgres.
+    """
+    function = 'to_char'
+    template = "%(function)s(%(expressions)s AT TIME ZONE %%s, %%s)"
+    output_field = CharField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = super().as_sql(compiler, connection, **extra_context)
+        return sql, (*params, timezone.get_current_timezone_name(), FORMATO_FECHA_HORA_SQL)
@@ -0,0 +1,70 @@
+from functools import partial
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql.base import Database
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pool import ConnectionPool, PoolAgotado, get_pool
+
+# Estado de transacción "sin transacción abierta" (psycopg2 y psycopg 3)
+TRANSACTION_STATUS_IDLE = 0
+
+
+class PostgresPool(ConnectionPool):
+    """ConnectionPool para conexiones de psycopg."""
+
+    def validar(self, conexion):
+        if conexion.closed:
+            return False
+        try:
+            with conexion.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except Database.Error:
+            return False
+        return True
+
+    def reiniciar(self, conexion):
+        """Revierte una transacción pendiente; descarta la conexión si falla."""
+        if conexion.closed:
+            return False
+        try:
+            if conexion.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                conexion.rollback()
+        except Database.Error:
+            return False
+        return conexion.info.transaction_status == TRANSACTION_STATUS_IDLE
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    """
+    Backend de PostgreSQL (ENGINE 'apps.core.db_pool') que toma las
+    conexiones de un pool del proceso en lugar de abrir una por request:
+    connect() obtiene una y close() la devuelve. Se configura con la clave
+    POOL de DATABASES (ver PostgresPool / ConnectionPool) y CONN_MAX_AGE
+    debe ser 0, para que Django la devuelva al terminar cada request.
+    """
+
+    def get_new_connection(self, conn_params):
+        try:
+            conexion = self.pool.obtener(partial(super().get_new_connection, conn_params))
+        except PoolAgotado as e:
+            raise Database.OperationalError(str(e)) from e
+        # Como en get_new_connection(), que no se ejecuta si la conexión se reutiliza
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return conexion
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.devolver(self.connection)
+
+    @property
+    def pool(self):
+        if self.settings_dict['CONN_MAX_AGE']:
+            raise ImproperlyConfigured('Con apps.core.db_pool, CONN_MAX_AGE debe ser 0.')
+        settings_dict = self.settings_dict
+        clave = (self.alias, settings_dict['HOST'], settings_dict['PORT'], settings_dict['NAME'], settings_dict['USER'])
+        return get_pool(clave, PostgresPool, nombre=self.alias, **settings_dict.get('POOL', {}))
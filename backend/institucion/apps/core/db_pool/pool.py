@@ -0,0 +1,206 @@
+import threading
+import time
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolAgotado(Exception):
+    """No se liberó ninguna conexión dentro del timeout de adquisición."""
+
+
+class ConnectionPool:
+    """
+    Pool acotado de conexiones del proceso, compartido por los hilos.
+
+    - max_size: máximo de conexiones abiertas (en uso + libres). Con todas
+      en uso, obtener() espera hasta `timeout` segundos y lanza PoolAgotado.
+    - min_size: conexiones libres que se conservan aunque superen max_idle.
+    - max_idle: segundos que una conexión libre (por encima de min_size)
+      se conserva antes de cerrarse.
+    - max_lifetime: segundos tras los cuales una conexión se cierra al
+      devolverse, aunque siga sana.
+    - check_idle: una conexión libre por más de estos segundos se valida
+      (validar()) antes de entregarse.
+
+    Las libres se entregan en orden LIFO: las más usadas siguen calientes y
+    las más antiguas son las que se cierran. Las subclases definen
+    validar(), reiniciar() y cerrar_conexion() según el driver.
+    """
+
+    def __init__(self, nombre='default', min_size=1, max_size=10, timeout=5.0,
+                 max_idle=300.0, max_lifetime=3600.0, check_idle=30.0):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError('Se requiere 0 <= min_size <= max_size y max_size >= 1.')
+        self.nombre = nombre
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_idle = check_idle
+
+        self._cond = threading.Condition()
+        self._libres = []  # (conexión, creada_en, devuelta_en), la última es la más reciente
+        self._creadas_en = {}  # id(conexión) -> creada_en, de las abiertas
+        self._abiertas = 0
+        self._en_uso = 0
+        self._stats = {
+            'adquisiciones': 0,
+            'esperas': 0,
+            'timeouts': 0,
+            'creadas': 0,
+            'cerradas': 0,
+            'descartadas': 0,
+            'segundos_espera': 0.0,
+        }
+
+    # --------------------------------------
+    # Hooks del driver
+
+    def validar(self, conexion):
+        """True si la conexión sigue sana (se invoca tras check_idle libre)."""
+        return True
+
+    def reiniciar(self, conexion):
+        """Deja la conexión lista para otro uso; False para descartarla."""
+        return True
+
+    def cerrar_conexion(self, conexion):
+        try:
+            conexion.close()
+        except Exception:
+            pass
+
+    # --------------------------------------
+    # Uso
+
+    def obtener(self, crear):
+        """
+        Conexión libre o, si hay cupo, una nueva creada con crear(). Espera
+        hasta `timeout` segundos a que se devuelva alguna; lanza PoolAgotado.
+        """
+        inicio = time.monotonic()
+        limite = inicio + self.timeout
+        espero = False
+        with self._cond:
+            self._stats['adquisiciones'] += 1
+
+        while True:
+            with self._cond:
+                while not self._libres and self._abiertas >= self.max_size:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolAgotado(
+                            f'Pool "{self.nombre}" agotado: {self.max_size} conexiones en uso '
+                            f'tras esperar {self.timeout} s.'
+                        )
+                    espero = True
+                    self._cond.wait(restante)
+
+                if espero:
+                    self._stats['esperas'] += 1
+                    self._stats['segundos_espera'] += time.monotonic() - inicio
+                    espero = False
+                self._en_uso += 1
+                if self._libres:
+                    conexion, _, devuelta_en = self._libres.pop()
+                else:
+                    conexion = devuelta_en = None
+                    self._abiertas += 1
+
+            if conexion is None:
+                return self._crear(crear)
+            if time.monotonic() - devuelta_en < self.check_idle or self.validar(conexion):
+                return conexion
+            # Conexión rota (p. ej. cerrada por el servidor): se descarta y se reintenta
+            self._retirar(conexion, en_uso=True)
+            with self._cond:
+                self._stats['descartadas'] += 1
+
+    def _crear(self, crear):
+        try:
+            conexion = crear()
+        except BaseException:
+            with self._cond:
+                self._abiertas -= 1
+                self._en_uso -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._creadas_en[id(conexion)] = time.monotonic()
+            self._stats['creadas'] += 1
+        return conexion
+
+    def devolver(self, conexion):
+        """Devuelve una conexión obtenida con obtener(); la cierra si no es reutilizable."""
+        ahora = time.monotonic()
+        creada_en = self._creadas_en.get(id(conexion), ahora)
+        reutilizable = ahora - creada_en < self.max_lifetime and self.reiniciar(conexion)
+
+        cerrar = []
+        with self._cond:
+            self._en_uso -= 1
+            if reutilizable:
+                self._libres.append((conexion, creada_en, ahora))
+            else:
+                cerrar.append(conexion)
+                self._stats['descartadas'] += 1
+            # Libres ociosas por encima de min_size (las más antiguas primero)
+            while (self._libres and len(self._libres) > self.min_size
+                   and ahora - self._libres[0][2] > self.max_idle):
+                cerrar.append(self._libres.pop(0)[0])
+            self._abiertas -= len(cerrar)
+            for conexion_cerrada in cerrar:
+                self._creadas_en.pop(id(conexion_cerrada), None)
+            self._stats['cerradas'] += len(cerrar)
+            self._cond.notify()
+
+        for conexion_cerrada in cerrar:
+            self.cerrar_conexion(conexion_cerrada)
+
+    def _retirar(self, conexion, en_uso=False):
+        with self._cond:
+            self._abiertas -= 1
+            if en_uso:
+                self._en_uso -= 1
+            self._creadas_en.pop(id(conexion), None)
+            self._stats['cerradas'] += 1
+            self._cond.notify()
+        self.cerrar_conexion(conexion)
+
+    def cerrar_libres(self):
+        """Cierra las conexiones libres (las que están en uso se cierran al devolverse)."""
+        with self._cond:
+            libres, self._libres = self._libres, []
+        for conexion, _, _ in libres:
+            self._retirar(conexion)
+
+    def stats(self):
+        with self._cond:
+            return {
+                **self._stats,
+                'abiertas': self._abiertas,
+                'en_uso': self._en_uso,
+                'libres': len(self._libres),
+                'max_size': self.max_size,
+            }
+
+
+def get_pool(clave, pool_class=ConnectionPool, **opciones):
+    """Pool del proceso para `clave` (se crea con `opciones` la primera vez)."""
+    pool = _pools.get(clave)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(clave)
+            if pool is None:
+                pool = _pools[clave] = pool_class(**opciones)
+    return pool
+
+
+def pool_stats():
+    """Estadísticas por nombre de pool (del proceso actual)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.nombre: pool.stats() for pool in pools}
@@ -0,0 +1,52 @@
+import csv
+import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.timezone import localtime
+
+from . import fast_json
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class _Eco:
+    """Buffer mínimo para csv.writer: retorna la línea en lugar de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+def _valor_exportable(value):
+    if isinstance(value, datetime.datetime):
+        return localtime(value).isoformat() if value.tzinfo else value.isoformat()
+    return value
+
+
+def iter_csv(rows, fields):
+    """Genera las líneas CSV (encabezado + una por fila) sin acumularlas."""
+    writer = csv.writer(_Eco())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([_valor_exportable(row[field]) for field in fields])
+
+
+def iter_ndjson(rows, fields):
+    """Genera un objeto JSON por línea (bytes UTF-8)."""
+    default = DjangoJSONEncoder().default
+    for row in rows:
+        yield fast_json.dumps({field: _valor_exportable(row[field]) for field in fields}, default) + b'\n'
+
+
+def iter_export(queryset, fields, formato, chunk_size=2000):
+    """
+    Proyecta el queryset con values() y lo recorre con un cursor del lado
+    del servidor (iterator), de modo que la memoria no depende del tamaño
+    de la tabla.
+    """
+    rows = queryset.values(*fields).iterator(chunk_size=chunk_size)
+    if formato == 'csv':
+        return iter_csv(rows, fields)
+    return iter_ndjson(rows, fields)
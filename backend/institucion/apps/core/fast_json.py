@@ -0,0 +1,33 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # Sin orjson se usa el módulo json de la biblioteca estándar
+    orjson = None
+
+# Las fechas pasan a `default` (no se formatean en orjson) para que la
+# salida coincida con la de los encoders de DRF y Django: p. ej. DRF
+# recorta los microsegundos a milisegundos y usa 'Z' para UTC.
+OPCIONES = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+
+def disponible():
+    return orjson is not None
+
+
+def dumps(data, default):
+    """
+    JSON compacto en bytes UTF-8 (sin escapar no ASCII). `default` convierte
+    lo que no es nativo (Decimal, fechas, lazy strings...), como el
+    `default` de un JSONEncoder. Lanza TypeError si no puede codificar.
+    """
+    if orjson is None:
+        return json.dumps(data, default=default, ensure_ascii=False, separators=(',', ':')).encode()
+    return orjson.dumps(data, default=default, option=OPCIONES)
+
+
+def loads(contenido):
+    """Decodifica bytes o str. Lanza ValueError si no es JSON válido."""
+    if orjson is None:
+        return json.loads(contenido)
+    return orjson.loads(contenido)
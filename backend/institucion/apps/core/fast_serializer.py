@@ -0,0 +1,164 @@
+import threading
+from operator import itemgetter
+
+from django.db import connection
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+
+from .datetime_format import DatetimeFormatter, ToCharLocal, format_datetime
+from .helper_serializer import BaseSerializer
+
+
+class PlanNoCompilable(Exception):
+    """El serializer tiene un campo que no puede leerse de values()."""
+
+
+class RepresentationPlan:
+    """
+    Plan de representación de solo lectura compilado una vez por
+    (serializer, acción): qué rutas pedir a values_list() y cómo convertir
+    cada tupla en el mismo dict que produciría el serializer.
+
+    Cada entrada es (clave, fabrica): fabrica() retorna el getter de la
+    fila y se invoca una vez por render, de modo que el estado por
+    respuesta (p. ej. el DatetimeFormatter) no se comparte entre requests.
+    """
+
+    def __init__(self):
+        self.paths = []
+        self.entries = []
+
+    def path_index(self, path):
+        if path not in self.paths:
+            self.paths.append(path)
+        return self.paths.index(path)
+
+    def render(self, rows):
+        entries = [(key, fabrica()) for key, fabrica in self.entries]
+        return [{key: getter(row) for key, getter in entries} for row in rows]
+
+    def render_columnar(self, rows):
+        """(columnas, filas): los mismos valores que render() sin un dict por fila."""
+        entries = [(key, fabrica()) for key, fabrica in self.entries]
+        getters = [getter for _, getter in entries]
+        return [key for key, _ in entries], [[getter(row) for getter in getters] for row in rows]
+
+
+def _fijo(getter):
+    return lambda: getter
+
+
+def _con_none(getter, transform):
+    def leer(row):
+        value = getter(row)
+        return None if value is None else transform(value)
+    return leer
+
+
+# Campos cuyo valor de values() ya coincide con to_representation
+CAMPOS_DIRECTOS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+)
+
+
+def _compilar_campo(plan, serializer, nombre, field, model):
+    if isinstance(field, serializers.SerializerMethodField):
+        return _compilar_metodo(plan, serializer, nombre, field, model)
+
+    if field.source == '*' or getattr(field, 'many', False):
+        raise PlanNoCompilable(nombre)
+
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if field.pk_field is not None:
+            raise PlanNoCompilable(nombre)
+        path = model._meta.get_field(field.source).attname
+        return _fijo(itemgetter(plan.path_index(path)))
+
+    if isinstance(field, serializers.RelatedField):
+        raise PlanNoCompilable(nombre)
+
+    getter = itemgetter(plan.path_index(field.source.replace('.', '__')))
+    if type(field) in CAMPOS_DIRECTOS:
+        return _fijo(getter)
+    return _fijo(_con_none(getter, field.to_representation))
+
+
+def _compilar_metodo(plan, serializer, nombre, field, model):
+    """
+    Solo los SerializerMethodField de BaseSerializer sin sobrescribir tienen
+    equivalente desde values(); cualquier otro impide compilar el plan.
+    """
+    metodo = field.method_name or f'get_{nombre}'
+    implementacion = getattr(type(serializer), metodo, None)
+
+    if metodo in ('get_created_at', 'get_updated_at') and implementacion is getattr(BaseSerializer, metodo):
+        return _compilar_fecha(plan, serializer, metodo[len('get_'):])
+
+    if metodo in ('get_display', 'get_id_display') and implementacion is getattr(BaseSerializer, metodo):
+        if not model.display_fields:
+            raise PlanNoCompilable(nombre)
+        indices = [plan.path_index(path) for path in model.display_fields]
+        display = model.display_from_values
+        if metodo == 'get_display':
+            return _fijo(lambda row: display(*[row[i] for i in indices]))
+        id_index = plan.path_index('id')
+        return _fijo(lambda row: f"{row[id_index]} - {display(*[row[i] for i in indices])}")
+
+    raise PlanNoCompilable(nombre)
+
+
+def _compilar_fecha(plan, serializer, campo):
+    """
+    Con datetime_format='database' en Postgres la fecha llega formateada
+    por to_char; si no, se formatea en Python según la estrategia.
+    """
+    estrategia = serializer.datetime_format
+    if estrategia == 'database' and connection.vendor == 'postgresql':
+        return _fijo(itemgetter(plan.path_index(ToCharLocal(campo))))
+
+    getter = itemgetter(plan.path_index(campo))
+    if estrategia == 'python':
+        return _fijo(lambda row: format_datetime(getter(row)))
+
+    def fabrica():
+        formatear = DatetimeFormatter()
+        return lambda row: formatear(getter(row))
+    return fabrica
+
+
+_planes = {}
+_planes_lock = threading.Lock()
+
+
+def get_representation_plan(serializer_class, action):
+    """
+    Retorna el plan compilado (o None si el serializer no es compilable).
+    Se compila una sola vez por (serializer_class, action).
+    """
+    key = (serializer_class, action)
+    if key in _planes:
+        return _planes[key]
+
+    with _planes_lock:
+        if key not in _planes:
+            _planes[key] = _compilar_plan(serializer_class, action)
+    return _planes[key]
+
+
+def _compilar_plan(serializer_class, action):
+    if not getattr(serializer_class, 'fast_path', False):
+        return None
+
+    serializer = serializer_class(context={'action': action})
+    model = serializer_class.Meta.model
+    plan = RepresentationPlan()
+    try:
+        for nombre, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            plan.entries.append((nombre, _compilar_campo(plan, serializer, nombre, field, model)))
+    except (PlanNoCompilable, SkipField):
+        return None
+    return plan
@@ -1,8 +1,10 @@
 from django import forms
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils.timezone import localtime
 
+from .lookup_table import LookupChoiceField
+
 
 class BaseForm(forms.ModelForm):
     """
@@ -10,11 +12,19 @@ class BaseForm(forms.ModelForm):
     Recuerda: Las validaciones SIEMPRE van en el formulario, NO en el serializer.
     """
 
+    # Campos únicos cuya unicidad ya verifica el contexto de validación;
+    # se omiten en validate_unique para no repetir la consulta.
+    unique_fields_in_context = ()
+
     class Meta:
         abstract = True
 
-    def __init__(self, *args, **kwargs):
-        """Inicializa el formulario y agrega clases CSS comunes."""
+    def __init__(self, *args, validation_context=None, **kwargs):
+        """
+        Inicializa el formulario y agrega clases CSS comunes.
+        validation_context: datos precargados para validar (ver build_validation_context).
+        """
+        self.validation_context = validation_context
         super().__init__(*args, **kwargs)
         for field_name, field in self.fields.items():
             # Agrega clases CSS Bootstrap por defecto
@@ -28,6 +38,50 @@ class BaseForm(forms.ModelForm):
             elif isinstance(field.widget, forms.CheckboxInput):
                 field.widget.attrs.update({'class': 'form-check-input'})
 
+    @classmethod
+    def build_validation_context(cls, rows):
+        """
+        Precarga en pocas consultas lo necesario para validar un lote de
+        filas (p. ej. colisiones de nombre). Se pasa a cada formulario del
+        lote como validation_context. Por defecto no precarga nada.
+        """
+        return None
+
+    def get_validation_context(self):
+        """
+        Contexto de validación del formulario. Si no se recibió uno (caso de
+        un solo registro) se construye con los datos enviados, de modo que
+        las validaciones hacen una sola consulta por formulario.
+        """
+        if self.validation_context is None:
+            self.validation_context = type(self).build_validation_context([self.data])
+        return self.validation_context
+
+    def _get_validation_exclusions(self):
+        """
+        Excluye de full_clean las ForeignKey ya resueltas con una tabla en
+        memoria: su existencia está verificada y validarlas de nuevo
+        consultaría la base de datos.
+        """
+        exclude = super()._get_validation_exclusions()
+        exclude.update(
+            name for name, field in self.fields.items()
+            if isinstance(field, LookupChoiceField) and field.lookup_table is not None
+        )
+        return exclude
+
+    def validate_unique(self):
+        """Omite las verificaciones de unicidad ya cubiertas por el contexto."""
+        # Django solo la llama si clean() llegó a ModelForm.clean
+        self._unique_validated = True
+        # Las exclusiones base: las ForeignKey sí participan de la unicidad
+        exclude = super()._get_validation_exclusions()
+        exclude.update(self.unique_fields_in_context)
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as e:
+            self._update_errors(e)
+
     def to_array(self):
         """
         Convierte el formulario completo a un diccionario para el frontend.
@@ -84,9 +138,36 @@ class BaseForm(forms.ModelForm):
         if not self.is_valid():
             raise ValidationError("El formulario contiene errores y no puede ser guardado.")
         
+        try:
+            return self._save_atomic(commit)
+        except IntegrityError:
+            # Otro request guardó el mismo valor entre la validación y el INSERT
+            self.add_integrity_error()
+            raise ValidationError("El formulario contiene errores y no puede ser guardado.")
+    
+    def add_integrity_error(self):
+        """
+        Traduce una violación de unicidad de la base de datos en errores del
+        formulario: en los campos que valida el contexto o, si no hay, en
+        __all__.
+        """
+        model = type(self.instance)
+        campos = [campo for campo in self.unique_fields_in_context if campo in self.fields]
+        for campo in campos:
+            self.add_error(campo, self.instance.unique_error_message(model, (campo,)))
+        if not campos:
+            self.add_error(None, 'El registro entra en conflicto con otro existente.')
+    
+    def _save_atomic(self, commit):
         with transaction.atomic():
             instance = super().save(commit=False)
             
+            # Si is_valid() validó también la unicidad, el save del modelo
+            # omite full_clean salvo que pre_save modifique la instancia.
+            # Un clean() que no llama a super() no la valida: full_clean corre.
+            if hasattr(instance, 'marcar_validado') and getattr(self, '_unique_validated', False):
+                instance.marcar_validado()
+            
             # Permite agregar lógica adicional antes de guardar
             if hasattr(self, 'pre_save'):
                 self.pre_save(instance)
@@ -1,5 +1,7 @@
+from django.utils.functional import cached_property
 from rest_framework import serializers
-from django.utils.timezone import localtime
+
+from .datetime_format import DatetimeFormatter, format_datetime
 
 
 class BaseSerializer(serializers.ModelSerializer):
@@ -7,6 +9,15 @@ class BaseSerializer(serializers.ModelSerializer):
     display = serializers.SerializerMethodField()
     id_display = serializers.SerializerMethodField()
 
+    # Permite que las acciones de listado usen el plan compilado de
+    # apps.core.fast_serializer en lugar de instanciar cada modelo
+    fast_path = True
+    # Estrategia para created_at/updated_at (ver apps.core.datetime_format)
+    datetime_format = 'memo'
+    # Rutas del modelo que lee cada SerializerMethodField propio, para
+    # deducir el only() de los listados (ver apps.core.projection)
+    campos_de_metodos = {}
+
     def get_fields(self):
         fields = super(BaseSerializer, self).get_fields()
         exclude_fields = self.context.get('exclude_fields', [])
@@ -15,17 +26,20 @@ class BaseSerializer(serializers.ModelSerializer):
         
         return fields
 
+    @cached_property
+    def datetime_formatter(self):
+        if self.datetime_format == 'python':
+            return format_datetime
+        return DatetimeFormatter()
+
+    def format_datetime(self, value):
+        return self.datetime_formatter(value)
+
     def get_created_at(self, obj):
-        if obj.created_at:
-            local_time = localtime(obj.created_at)
-            return local_time.strftime('%d/%m/%Y %H:%M:%S')
-        return None
+        return self.format_datetime(obj.created_at)
 
     def get_updated_at(self, obj):
-        if obj.updated_at:
-            local_time = localtime(obj.updated_at)
-            return local_time.strftime('%d/%m/%Y %H:%M:%S')
-        return None
+        return self.format_datetime(obj.updated_at)
 
     def get_display(self, obj):
         return str(obj)
@@ -0,0 +1,227 @@
+import csv
+import io
+import os
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from . import fast_json
+from .cache_utils import bump_model_version_on_commit
+
+IMPORT_FORMATS = ('csv', 'json', 'ndjson')
+
+
+class ErrorDeLectura(ValueError):
+    """El archivo no puede leerse; la importación se detiene en ese punto."""
+
+
+class FilaInvalida:
+    """Fila que no pudo decodificarse; se reporta como error de esa fila."""
+
+    def __init__(self, mensaje):
+        self.mensaje = mensaje
+
+
+def inferir_formato(nombre_archivo):
+    """Formato a partir de la extensión del archivo (o None)."""
+    extension = os.path.splitext(nombre_archivo or '')[1].lower().lstrip('.')
+    return extension if extension in IMPORT_FORMATS else None
+
+
+def leer_filas(archivo, formato):
+    """
+    Genera diccionarios a partir de un archivo binario.
+    CSV y NDJSON se leen en streaming; JSON debe ser una lista y se carga
+    completo, por lo que para archivos grandes conviene CSV o NDJSON.
+    Una línea NDJSON mal formada se entrega como FilaInvalida (error de esa
+    fila); un archivo ilegible (CSV corrupto, JSON inválido, codificación
+    distinta de UTF-8) lanza ErrorDeLectura.
+    """
+    texto = io.TextIOWrapper(archivo, encoding='utf-8-sig', newline='')
+    try:
+        yield from _leer_filas(texto, formato)
+    except csv.Error as e:
+        raise ErrorDeLectura(f'CSV inválido: {e}') from e
+    except UnicodeDecodeError as e:
+        raise ErrorDeLectura('El archivo debe estar codificado en UTF-8.') from e
+
+
+def _leer_filas(texto, formato):
+    if formato == 'csv':
+        yield from csv.DictReader(texto)
+    elif formato == 'ndjson':
+        for linea in texto:
+            if linea.strip():
+                try:
+                    yield fast_json.loads(linea)
+                except ValueError as e:
+                    yield FilaInvalida(f'JSON inválido: {e}')
+    elif formato == 'json':
+        try:
+            datos = fast_json.loads(texto.read())
+        except UnicodeDecodeError:
+            raise
+        except ValueError as e:
+            raise ErrorDeLectura(f'JSON inválido: {e}') from e
+        if not isinstance(datos, list):
+            raise ErrorDeLectura('El archivo JSON debe contener una lista de objetos.')
+        yield from datos
+    else:
+        raise ValueError(f'Formato no soportado. Opciones: {", ".join(IMPORT_FORMATS)}.')
+
+
+def en_lotes(iterable, tamano):
+    iterador = iter(iterable)
+    while True:
+        lote = list(islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+class BaseImportador:
+    """
+    Importación masiva por lotes: valida cada lote con las precargas de
+    `preparar` y lo inserta con bulk_create en su propia transacción.
+
+    Las subclases definen `model` e implementan `validar_lote`, que recibe
+    una lista de (numero_fila, dict) y retorna una lista de
+    (numero_fila, instancia, errores):
+        - instancia sin errores: se inserta
+        - errores (dict campo -> [mensajes]): se reporta la fila
+        - instancia y errores None: fila omitida (ya existía)
+
+    Con `ignore_conflicts` la base de datos descarta en silencio las filas
+    que violan la restricción única de `campo_conflicto` (p. ej. guardadas
+    por otro proceso tras la validación); se reportan como errores de fila
+    y no se cuentan en `created`.
+    """
+    model = None
+    ignore_conflicts = False
+    campo_conflicto = None
+
+    CONFLICTOS = ('omitir', 'error')
+
+    def __init__(self, chunk_size=1000, dry_run=False, conflictos='omitir'):
+        if conflictos not in self.CONFLICTOS:
+            raise ValueError(f'conflictos debe ser uno de: {", ".join(self.CONFLICTOS)}.')
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.conflictos = conflictos
+
+    def preparar(self):
+        """Precargas que se hacen una sola vez por importación."""
+
+    def validar_lote(self, lote):
+        raise NotImplementedError
+
+    def error_de_fila(self, fila):
+        if isinstance(fila, FilaInvalida):
+            return fila.mensaje
+        return 'La fila debe ser un objeto con columnas.'
+
+    def importar(self, filas):
+        """
+        Retorna:
+            dict con total, created, skipped, error_count, errors (limitados
+            a settings.IMPORT_MAX_ERRORS), seconds, rows_per_second y dry_run.
+            Si el archivo deja de poder leerse (ErrorDeLectura) incluye además
+            `error`: las filas de los lotes anteriores ya quedaron guardadas
+            y `created` las cuenta. `created` no incluye las filas que la
+            base de datos descartó por conflicto (ver ignore_conflicts).
+        """
+        max_errores = getattr(settings, 'IMPORT_MAX_ERRORS', 1000)
+        inicio = time.perf_counter()
+        resultado = {
+            'total': 0,
+            'created': 0,
+            'skipped': 0,
+            'error_count': 0,
+            'errors': [],
+            'dry_run': self.dry_run,
+        }
+
+        self.preparar()
+
+        lotes = en_lotes(enumerate(filas, start=1), self.chunk_size)
+        while True:
+            try:
+                lote = next(lotes, None)
+            except ErrorDeLectura as e:
+                # Los lotes anteriores ya se confirmaron: se reportan junto al error
+                resultado['error'] = str(e)
+                break
+            if lote is None:
+                break
+
+            validas = [(numero, fila) for numero, fila in lote if isinstance(fila, dict)]
+            invalidas = [
+                (numero, None, {'__all__': [self.error_de_fila(fila)]})
+                for numero, fila in lote if not isinstance(fila, dict)
+            ]
+            instancias = []  # (numero_fila, instancia)
+            filas_validadas = sorted(invalidas + self.validar_lote(validas), key=lambda r: r[0])
+            for numero, instancia, errores in filas_validadas:
+                if errores:
+                    self.registrar_error(resultado, numero, errores, max_errores)
+                elif instancia is None:
+                    resultado['skipped'] += 1
+                else:
+                    instancias.append((numero, instancia))
+
+            resultado['total'] += len(lote)
+            descartadas = []
+            if instancias and not self.dry_run:
+                with transaction.atomic():
+                    descartadas = self.insertar(instancias)
+                    bump_model_version_on_commit(self.model)
+            for numero, instancia in descartadas:
+                mensajes = instancia.unique_error_message(self.model, (self.campo_conflicto,)).messages
+                self.registrar_error(resultado, numero, {self.campo_conflicto: mensajes}, max_errores)
+            resultado['created'] += len(instancias) - len(descartadas)
+
+        segundos = time.perf_counter() - inicio
+        resultado['seconds'] = round(segundos, 3)
+        resultado['rows_per_second'] = round(resultado['total'] / segundos, 1) if segundos else None
+        return resultado
+
+    def registrar_error(self, resultado, numero, errores, max_errores):
+        resultado['error_count'] += 1
+        if len(resultado['errors']) < max_errores:
+            resultado['errors'].append({'row': numero, 'errors': errores})
+
+    def insertar(self, instancias):
+        """
+        Inserta (numero_fila, instancia) con bulk_create y retorna las que la
+        base de datos descartó por conflicto. Con ignore_conflicts el INSERT
+        no informa cuáles se omitieron: se comparan los valores de
+        campo_conflicto existentes antes y después.
+        """
+        objetos = [instancia for _, instancia in instancias]
+        if not self.ignore_conflicts:
+            self.model.objects.bulk_create(objetos)
+            return []
+
+        valores = [getattr(instancia, self.campo_conflicto) for instancia in objetos]
+        previos = self.valores_existentes(valores)
+        self.model.objects.bulk_create(objetos, ignore_conflicts=True)
+        insertados = self.valores_existentes(valores) - previos
+
+        descartadas = []
+        for numero, instancia in instancias:
+            valor = getattr(instancia, self.campo_conflicto)
+            if valor in insertados:
+                insertados.discard(valor)
+            else:
+                descartadas.append((numero, instancia))
+        return descartadas
+
+    def valores_existentes(self, valores):
+        """Valores de campo_conflicto ya guardados (igualdad exacta, como la restricción)."""
+        return set(
+            self.model.all_objects
+            .filter(**{f'{self.campo_conflicto}__in': valores})
+            .values_list(self.campo_conflicto, flat=True)
+        )
@@ -0,0 +1,312 @@
+import hmac
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from rest_framework.permissions import SAFE_METHODS
+
+from .db_pool.pool import pool_stats
+from .response_cache import response_cache_stats
+
+logger = logging.getLogger(__name__)
+
+_metricas_actuales = ContextVar('metricas_actuales', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """Una acción ejecutó más consultas que su presupuesto."""
+
+
+class RequestMetrics:
+    """
+    Métricas de un request. El middleware la crea y la publica en un
+    ContextVar; BaseViewSet completa vista, acción y presupuesto.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.db = 0.0
+        self.serializacion = 0.0
+        self.total = 0.0
+        self.vista = None
+        self.accion = None
+        self.presupuesto = None
+        # El conteo en paralelo de datatable registra desde otro hilo
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        """execute_wrapper: cuenta y cronometra cada consulta."""
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            transcurrido = time.perf_counter() - inicio
+            with self._lock:
+                self.db += transcurrido
+                self.consultas += 1
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db * 1000:.2f};desc="{self.consultas} consultas"',
+            f'serializacion;dur={self.serializacion * 1000:.2f}',
+            f'app;dur={max(self.total - self.db - self.serializacion, 0) * 1000:.2f}',
+            f'total;dur={self.total * 1000:.2f}',
+        ])
+
+
+def medir_consulta(execute, sql, params, many, context):
+    """
+    execute_wrapper permanente: mide la consulta si hay un request
+    instrumentado en el contexto actual. Como el ContextVar se propaga a
+    los hilos de sync_to_async, también cubre el ORM asíncrono.
+    """
+    metricas = _metricas_actuales.get()
+    if metricas is None:
+        return execute(sql, params, many, context)
+    return metricas(execute, sql, params, many, context)
+
+
+def instalar_medicion(connection, **kwargs):
+    # Al inicio de la lista: execute_wrapper() de Django hace pop() del
+    # último elemento al salir, y no debe retirar este
+    if medir_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, medir_consulta)
+
+
+# Cada conexión nueva (de cualquier hilo) queda instrumentada
+connection_created.connect(instalar_medicion)
+
+
+def metricas_actuales():
+    """RequestMetrics del request en curso, o None fuera del middleware."""
+    return _metricas_actuales.get()
+
+
+@contextmanager
+def instrumentar(metricas):
+    """
+    Publica `metricas` como las del contexto actual: las consultas de
+    cualquier conexión (incluidos los hilos que copian el contexto) se
+    acumulan en ella.
+    """
+    # Conexiones abiertas antes de importar este módulo
+    for connection in connections.all(initialized_only=True):
+        instalar_medicion(connection)
+    token = _metricas_actuales.set(metricas)
+    try:
+        yield metricas
+    finally:
+        _metricas_actuales.reset(token)
+
+
+def registrar_vista(vista, accion, presupuesto=None):
+    metricas = metricas_actuales()
+    if metricas is not None:
+        metricas.vista = vista
+        metricas.accion = accion
+        metricas.presupuesto = presupuesto
+
+
+@contextmanager
+def medir_serializacion():
+    """Acumula el tiempo del bloque como serialización del request en curso."""
+    metricas = metricas_actuales()
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metricas is not None:
+            metricas.serializacion += time.perf_counter() - inicio
+
+
+# --------------------------------------
+# Registro del proceso (formato Prometheus)
+
+_registro_lock = threading.Lock()
+_registro = defaultdict(lambda: {
+    'requests': 0,
+    'consultas': 0,
+    'segundos_total': 0.0,
+    'segundos_db': 0.0,
+    'segundos_serializacion': 0.0,
+    'presupuesto_excedido': 0,
+})
+
+
+def _registrar(metricas, status, excedido):
+    clave = (metricas.vista, metricas.accion, str(status))
+    with _registro_lock:
+        entrada = _registro[clave]
+        entrada['requests'] += 1
+        entrada['consultas'] += metricas.consultas
+        entrada['segundos_total'] += metricas.total
+        entrada['segundos_db'] += metricas.db
+        entrada['segundos_serializacion'] += metricas.serializacion
+        entrada['presupuesto_excedido'] += int(excedido)
+
+
+def instrumentation_stats():
+    """Acumulados por (vista, acción, status) del proceso actual."""
+    with _registro_lock:
+        return {clave: dict(valores) for clave, valores in _registro.items()}
+
+
+def reset_instrumentation_stats():
+    with _registro_lock:
+        _registro.clear()
+
+
+def _etiquetas(**valores):
+    pares = ','.join(
+        '{}="{}"'.format(nombre, str(valor).replace('\\', '\\\\').replace('"', '\\"'))
+        for nombre, valor in valores.items()
+    )
+    return '{' + pares + '}'
+
+
+METRICAS_PROMETHEUS = (
+    # (nombre, tipo, ayuda, clave en el registro)
+    ('institucion_http_requests_total', 'counter', 'Requests atendidos.', 'requests'),
+    ('institucion_db_queries_total', 'counter', 'Consultas SQL ejecutadas.', 'consultas'),
+    ('institucion_request_seconds_total', 'counter', 'Tiempo total de respuesta.', 'segundos_total'),
+    ('institucion_db_seconds_total', 'counter', 'Tiempo en la base de datos.', 'segundos_db'),
+    ('institucion_serialization_seconds_total', 'counter', 'Tiempo de serialización.', 'segundos_serializacion'),
+    ('institucion_query_budget_exceeded_total', 'counter', 'Requests que excedieron su presupuesto de consultas.', 'presupuesto_excedido'),
+)
+
+METRICAS_POOL = (
+    # (nombre, tipo, ayuda, clave en ConnectionPool.stats()); ver apps.core.db_pool
+    ('institucion_db_pool_connections', 'gauge', 'Conexiones abiertas del pool.', 'abiertas'),
+    ('institucion_db_pool_in_use', 'gauge', 'Conexiones del pool en uso.', 'en_uso'),
+    ('institucion_db_pool_idle', 'gauge', 'Conexiones libres del pool.', 'libres'),
+    ('institucion_db_pool_max_size', 'gauge', 'Máximo de conexiones del pool.', 'max_size'),
+    ('institucion_db_pool_acquisitions_total', 'counter', 'Conexiones entregadas por el pool.', 'adquisiciones'),
+    ('institucion_db_pool_waits_total', 'counter', 'Adquisiciones que esperaron una conexión libre.', 'esperas'),
+    ('institucion_db_pool_wait_seconds_total', 'counter', 'Tiempo esperando una conexión libre.', 'segundos_espera'),
+    ('institucion_db_pool_timeouts_total', 'counter', 'Adquisiciones que agotaron el timeout.', 'timeouts'),
+    ('institucion_db_pool_created_total', 'counter', 'Conexiones abiertas por el pool.', 'creadas'),
+    ('institucion_db_pool_closed_total', 'counter', 'Conexiones cerradas por el pool.', 'cerradas'),
+)
+
+
+def render_prometheus():
+    """Texto en formato de exposición de Prometheus (version 0.0.4)."""
+    stats = instrumentation_stats()
+    lineas = []
+    for nombre, tipo, ayuda, clave in METRICAS_PROMETHEUS:
+        lineas.append(f'# HELP {nombre} {ayuda}')
+        lineas.append(f'# TYPE {nombre} {tipo}')
+        for (vista, accion, status), valores in sorted(stats.items()):
+            etiquetas = _etiquetas(view=vista, action=accion, status=status)
+            lineas.append(f'{nombre}{etiquetas} {valores[clave]}')
+
+    lineas.append('# HELP institucion_response_cache_total Aciertos/fallos de la cache de respuestas.')
+    lineas.append('# TYPE institucion_response_cache_total counter')
+    for vista, valores in sorted(response_cache_stats().items()):
+        for evento, total in sorted(valores.items()):
+            lineas.append(f'institucion_response_cache_total{_etiquetas(view=vista, result=evento)} {total}')
+
+    pools = pool_stats()
+    if pools:
+        for nombre, tipo, ayuda, clave in METRICAS_POOL:
+            lineas.append(f'# HELP {nombre} {ayuda}')
+            lineas.append(f'# TYPE {nombre} {tipo}')
+            for pool, valores in sorted(pools.items()):
+                lineas.append(f'{nombre}{_etiquetas(pool=pool)} {valores[clave]}')
+
+    return '\n'.join(lineas) + '\n'
+
+
+def metrics_autorizado(request):
+    """
+    Con METRICS_TOKEN se exige `Authorization: Bearer <token>`; sin él,
+    solo se responde con DEBUG o a una IP de INTERNAL_IPS (expone tráfico
+    por vista y el estado del pool de conexiones).
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        return hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+    return settings.DEBUG or request.META.get('REMOTE_ADDR') in settings.INTERNAL_IPS
+
+
+def metrics_view(request):
+    """Endpoint de Prometheus (ver metrics_autorizado)."""
+    if not metrics_autorizado(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# --------------------------------------
+# Middleware
+
+class InstrumentationMiddleware:
+    """
+    Mide consultas, tiempo de base de datos, serialización y tiempo total
+    de cada request; los expone en Server-Timing y en el registro del
+    proceso (ver metrics_view). Debe ir primero en MIDDLEWARE.
+
+    Si la vista declara un presupuesto de consultas y se excede, se
+    registra un warning y, con QUERY_BUDGET_RAISE, se lanza
+    QueryBudgetExceeded. Esto último solo en métodos seguros: una
+    escritura ya está confirmada cuando el middleware cuenta sus consultas,
+    y un 500 le haría creer al cliente que falló.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', True):
+            return self.get_response(request)
+
+        with instrumentar(RequestMetrics()) as metricas:
+            response = self.get_response(request)
+        return self.finalizar(request, response, metricas)
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', True):
+            return await self.get_response(request)
+
+        with instrumentar(RequestMetrics()) as metricas:
+            response = await self.get_response(request)
+        return self.finalizar(request, response, metricas)
+
+    def finalizar(self, request, response, metricas):
+        metricas.total = time.perf_counter() - metricas.inicio
+
+        if metricas.vista is None:
+            match = getattr(request, 'resolver_match', None)
+            metricas.vista = match.view_name if match else 'sin_ruta'
+            metricas.accion = request.method.lower()
+
+        excedido = metricas.presupuesto is not None and metricas.consultas > metricas.presupuesto
+        _registrar(metricas, response.status_code, excedido)
+        response['Server-Timing'] = metricas.server_timing()
+
+        if excedido:
+            mensaje = (
+                f'{metricas.vista}.{metricas.accion}: {metricas.consultas} consultas '
+                f'(presupuesto {metricas.presupuesto})'
+            )
+            logger.warning('Presupuesto de consultas excedido en %s', mensaje)
+            if getattr(settings, 'QUERY_BUDGET_RAISE', False) and request.method in SAFE_METHODS:
+                raise QueryBudgetExceeded(mensaje)
+
+        return response
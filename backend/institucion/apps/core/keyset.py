@@ -0,0 +1,87 @@
+import base64
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class CursorInvalido(ValueError):
+    """
+    Se lanza cuando el cursor recibido no puede decodificarse
+    o no corresponde al ordenamiento activo.
+    """
+
+
+def resolver_ordenamiento(queryset, order_by=None):
+    """
+    Retorna la lista de columnas de ordenamiento activas,
+    agregando 'id' como desempate si no está presente.
+    """
+    if order_by:
+        columnas = [order_by] if isinstance(order_by, str) else list(order_by)
+    else:
+        columnas = list(queryset.query.order_by or queryset.model._meta.ordering or ['-id'])
+
+    columnas = [c.replace('pk', 'id', 1) if c.lstrip('-') == 'pk' else c for c in columnas]
+
+    if not any(c.lstrip('-') == 'id' for c in columnas):
+        # El desempate sigue la dirección de la primera columna
+        columnas.append('-id' if columnas[0].startswith('-') else 'id')
+
+    return columnas
+
+
+def encode_cursor(columnas, valores):
+    """Codifica los valores de la última fila en un token opaco."""
+    payload = json.dumps([columnas, valores], cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, columnas):
+    """
+    Decodifica un token generado por encode_cursor.
+    Valida que haya sido construido con el mismo ordenamiento.
+    """
+    try:
+        relleno = '=' * (-len(token) % 4)
+        payload = base64.urlsafe_b64decode(token + relleno).decode('utf-8')
+        columnas_cursor, valores = json.loads(payload)
+        if not isinstance(valores, list):
+            raise TypeError
+    except (ValueError, TypeError):
+        raise CursorInvalido('Cursor inválido.')
+
+    if columnas_cursor != columnas or len(valores) != len(columnas):
+        raise CursorInvalido('El cursor no corresponde al ordenamiento actual.')
+
+    return valores
+
+
+def filtro_keyset(columnas, valores):
+    """
+    Construye el Q que selecciona las filas posteriores a `valores`
+    según el ordenamiento `columnas` (admite direcciones mixtas).
+    """
+    condicion = Q()
+    igualdad = Q()
+    for columna, valor in zip(columnas, valores):
+        campo = columna.lstrip('-')
+        lookup = 'lt' if columna.startswith('-') else 'gt'
+        condicion |= igualdad & Q(**{f"{campo}__{lookup}": valor})
+        igualdad &= Q(**{campo: valor})
+    return condicion
+
+
+def valores_de_fila(fila, columnas):
+    """Extrae los valores de ordenamiento de un dict o de una instancia."""
+    valores = []
+    for columna in columnas:
+        campo = columna.lstrip('-')
+        if isinstance(fila, dict):
+            valores.append(fila[campo])
+            continue
+        valor = fila
+        for parte in campo.split('__'):
+            valor = getattr(valor, parte)
+        valores.append(valor)
+    return valores
@@ -0,0 +1,157 @@
+import copy
+import threading
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import connections, router
+
+from .cache_utils import cache_compartida, get_model_version
+from .validation_context import clave_nombre
+
+_tablas = {}
+_tablas_lock = threading.Lock()
+
+
+class LookupTable:
+    """
+    Copia en memoria del proceso de una tabla pequeña y poco modificada
+    (incluidos los inactivos), indexada por id y por el nombre normalizado
+    de `model.lookup_key_field`.
+
+    Se recarga completa cuando cambia la versión del modelo (ver
+    apps.core.cache_utils), que BaseModel incrementa en cada escritura
+    confirmada; verificarla cuesta una lectura de cache en lugar de una
+    consulta. Dentro de una transacción con escrituras sin confirmar la
+    tabla no las ve: los ids desconocidos se buscan en la base de datos.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        # (versión, por_id, por_clave): se reemplaza completa, sin locks
+        self._datos = (None, {}, {})
+
+    def _vigente(self):
+        version = get_model_version(self.model)
+        datos = self._datos
+        if datos[0] == version:
+            return datos[1], datos[2]
+
+        por_id, por_clave = self._cargar()
+        # Dentro de una transacción la carga puede incluir filas sin
+        # confirmar que un rollback descartaría: se usa sin guardarla.
+        # La versión se leyó antes de cargar, así que una escritura
+        # confirmada durante la carga provoca otra recarga
+        if not connections[router.db_for_read(self.model)].in_atomic_block:
+            self._datos = (version, por_id, por_clave)
+        return por_id, por_clave
+
+    def _cargar(self):
+        objetos = list(self.model.all_objects.select_related(None))
+        campo = self.model.lookup_key_field
+        por_id = {objeto.pk: objeto for objeto in objetos}
+        por_clave = {
+            clave_nombre(getattr(objeto, campo)): objeto for objeto in objetos
+        } if campo else {}
+        return por_id, por_clave
+
+    def obtener(self, pk, activo=None):
+        """
+        Copia del registro con ese id, o None. activo=True/False exige
+        ese estado.
+        """
+        por_id, _ = self._vigente()
+        objeto = por_id.get(pk)
+        if objeto is None:
+            # Creado en la transacción actual (aún sin confirmar) o inexistente
+            objeto = self.model.all_objects.select_related(None).filter(pk=pk).first()
+        if objeto is None or (activo is not None and objeto.estado != activo):
+            return None
+        return copy.copy(objeto)
+
+    def buscar(self, nombre, activo=True):
+        """Copia del registro cuyo nombre coincide sin distinguir mayúsculas, o None."""
+        _, por_clave = self._vigente()
+        objeto = por_clave.get(clave_nombre(nombre))
+        if objeto is None or (activo is not None and objeto.estado != activo):
+            return None
+        return copy.copy(objeto)
+
+    def por_clave(self, activo=True):
+        """Diccionario nombre normalizado -> copia del registro (para lotes)."""
+        _, por_clave = self._vigente()
+        return {
+            clave: copy.copy(objeto)
+            for clave, objeto in por_clave.items()
+            if activo is None or objeto.estado == activo
+        }
+
+    def invalidar(self):
+        """Fuerza la recarga en el siguiente acceso."""
+        self._datos = (None, {}, {})
+
+
+def get_lookup_table(model):
+    """
+    Tabla en memoria del modelo, o None si no declara lookup_table o si la
+    cache no es compartida: sin ella, otro worker no vería la versión nueva
+    y seguiría usando registros desactivados o renombrados.
+    """
+    if not getattr(model, 'lookup_table', False) or not cache_compartida():
+        return None
+    tabla = _tablas.get(model)
+    if tabla is None:
+        with _tablas_lock:
+            tabla = _tablas.setdefault(model, LookupTable(model))
+    return tabla
+
+
+def registros_por_clave(model, activo=True):
+    """
+    Diccionario nombre normalizado (lookup_key_field) -> registro, desde la
+    tabla en memoria o, si no está disponible, con una consulta.
+    """
+    tabla = get_lookup_table(model)
+    if tabla is not None:
+        return tabla.por_clave(activo=activo)
+    queryset = model.all_objects.select_related(None)
+    if activo is not None:
+        queryset = queryset.filter(estado=activo)
+    return {clave_nombre(getattr(objeto, model.lookup_key_field)): objeto for objeto in queryset}
+
+
+class LookupChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField que resuelve el id enviado con la tabla en memoria del
+    modelo en lugar de consultar el queryset. Acepta solo registros activos
+    (como Model.objects); si el modelo no declara lookup_table o la cache no
+    es compartida se comporta como ModelChoiceField.
+    """
+
+    @property
+    def lookup_table(self):
+        return get_lookup_table(self.queryset.model)
+
+    def to_python(self, value):
+        tabla = self.lookup_table
+        modelo = self.queryset.model
+        # La tabla indexa por pk; ForeignKey.formfield pasa to_field_name='id'
+        if tabla is None or self.to_field_name not in (None, modelo._meta.pk.name):
+            return super().to_python(value)
+        if value in self.empty_values:
+            return None
+
+        if isinstance(value, modelo):
+            value = value.pk
+        try:
+            pk = modelo._meta.pk.to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            pk = None
+
+        objeto = tabla.obtener(pk, activo=True) if pk is not None else None
+        if objeto is None:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return objeto
@@ -0,0 +1,58 @@
+from django.db import migrations
+
+
+def crear_extensiones(apps, schema_editor):
+    """
+    Extensiones y objetos de búsqueda usados por apps.core.search.
+    Solo aplica en Postgres; en otros motores se usa icontains.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+
+    # unaccent() es STABLE; el wrapper IMMUTABLE permite usarlo en índices
+    schema_editor.execute(
+        """
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text AS
+        $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        """
+    )
+
+    # Configuración de texto completo en español insensible a tildes
+    schema_editor.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = pg_catalog.spanish);
+                ALTER TEXT SEARCH CONFIGURATION es_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word
+                    WITH public.unaccent, pg_catalog.spanish_stem;
+            END IF;
+        END
+        $$
+        """
+    )
+
+
+def eliminar_extensiones(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS es_unaccent")
+    schema_editor.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.RunPython(crear_extensiones, eliminar_extensiones),
+    ]
@@ -0,0 +1,27 @@
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from . import fast_json
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser con orjson (ver apps.core.fast_json). Como el de DRF con
+    STRICT_JSON, rechaza NaN e Infinity; además rechaza números que no caben
+    en un float (p. ej. 1e400). Delega en el de DRF si el cuerpo no es
+    UTF-8, si STRICT_JSON está desactivado o si orjson no está instalado.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not self.strict or not fast_json.disponible() or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return fast_json.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
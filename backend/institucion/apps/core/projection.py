@@ -0,0 +1,138 @@
+import threading
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+from .helper_serializer import BaseSerializer
+
+
+class CamposNoPermitidos(ValueError):
+    """El parámetro `fields` pide campos fuera de la lista permitida."""
+
+
+def campos_del_modelo(model):
+    """
+    Campos concretos del modelo salvo los derivados, por nombre y por
+    attname (`modalidad` y `modalidad_id`).
+    """
+    campos = []
+    for field in model._meta.concrete_fields:
+        if field.name in model.campos_derivados:
+            continue
+        campos.append(field.name)
+        if field.attname != field.name:
+            campos.append(field.attname)
+    return campos
+
+
+def validar_ruta(model, ruta):
+    """True si `ruta` (p. ej. 'modalidad__nombre') llega a un campo concreto."""
+    partes = ruta.split('__')
+    for i, parte in enumerate(partes):
+        try:
+            field = model._meta.get_field(parte)
+        except FieldDoesNotExist:
+            return False
+        if i == len(partes) - 1:
+            return field.concrete
+        if not (field.is_relation and field.many_to_one):
+            return False
+        model = field.related_model
+    return False
+
+
+def parse_fields(valor, permitidos):
+    """
+    Lista de campos de `?fields=a,b,c` (sin vacíos ni repetidos, en el orden
+    recibido), o None si no se envió. Lanza CamposNoPermitidos.
+    """
+    if not valor:
+        return None
+    campos = list(dict.fromkeys(c.strip() for c in valor.split(',') if c.strip()))
+    invalidos = [c for c in campos if c not in permitidos]
+    if invalidos:
+        raise CamposNoPermitidos(
+            f'Campos no permitidos: {", ".join(invalidos)}. '
+            f'Opciones: {", ".join(permitidos)}.'
+        )
+    return campos or None
+
+
+# --------------------------------------
+# Proyección del serializer (only())
+
+_rutas = {}
+_rutas_lock = threading.Lock()
+
+
+def rutas_de_serializer(serializer_class, action):
+    """
+    Rutas del modelo que el serializer lee al representar la acción, o None
+    si no pueden deducirse (p. ej. un SerializerMethodField propio sin
+    entrada en `campos_de_metodos`). Se calcula una vez por
+    (serializer_class, action).
+    """
+    key = (serializer_class, action)
+    if key not in _rutas:
+        with _rutas_lock:
+            if key not in _rutas:
+                _rutas[key] = _deducir_rutas(serializer_class, action)
+    return _rutas[key]
+
+
+def _deducir_rutas(serializer_class, action):
+    serializer = serializer_class(context={'action': action})
+    model = serializer_class.Meta.model
+    declaradas = getattr(serializer_class, 'campos_de_metodos', {})
+    rutas = ['id']
+    for nombre, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            rutas_campo = declaradas.get(nombre)
+            if rutas_campo is None:
+                rutas_campo = _rutas_de_metodo(serializer_class, nombre, field, model)
+        elif (field.source == '*' or getattr(field, 'many', False)
+                or isinstance(field, serializers.BaseSerializer)):
+            return None
+        else:
+            rutas_campo = [field.source.replace('.', '__')]
+        if rutas_campo is None:
+            return None
+        rutas.extend(rutas_campo)
+
+    rutas = list(dict.fromkeys(rutas))
+    if not all(validar_ruta(model, ruta) for ruta in rutas):
+        return None
+    return rutas
+
+
+def _rutas_de_metodo(serializer_class, nombre, field, model):
+    """Métodos de BaseSerializer sin sobrescribir: se sabe qué leen."""
+    metodo = field.method_name or f'get_{nombre}'
+    if getattr(serializer_class, metodo, None) is not getattr(BaseSerializer, metodo, object()):
+        return None
+    if metodo in ('get_created_at', 'get_updated_at'):
+        return [metodo[len('get_'):]]
+    if metodo in ('get_display', 'get_id_display') and model.display_fields:
+        return ['id', *model.display_fields]
+    return None
+
+
+def aplicar_only(queryset, rutas):
+    """
+    only() con las rutas indicadas. Las relaciones recorridas se cargan con
+    select_related (only() las exige) y se conserva su ForeignKey; el
+    select_related previo se reemplaza, porque una relación diferida no
+    puede recorrerse.
+    """
+    relaciones = []
+    for ruta in rutas:
+        partes = ruta.split('__')
+        for i in range(1, len(partes)):
+            relaciones.append('__'.join(partes[:i]))
+    relaciones = list(dict.fromkeys(relaciones))
+    queryset = queryset.select_related(None)
+    if relaciones:
+        queryset = queryset.select_related(*relaciones)
+    return queryset.only(*dict.fromkeys([*rutas, *relaciones]))
@@ -0,0 +1,57 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTAS = re.compile(r'\((?:\s*\?\s*,)*\s*\?\s*\)')
+_TRANSACCIONES = re.compile(r'^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b', re.IGNORECASE)
+
+
+class ConsultasRepetidasError(AssertionError):
+    """La misma consulta (salvo parámetros) se repitió más de lo permitido."""
+
+
+def normalizar_sql(sql):
+    """
+    Reemplaza literales por `?` y colapsa listas IN, de modo que las
+    consultas que solo difieren en parámetros queden iguales.
+    """
+    sql = _LITERALES.sub('?', sql)
+    return _LISTAS.sub('(...)', sql)
+
+
+def consultas_repetidas(consultas, max_repeticiones=3):
+    """
+    Retorna [(sql_normalizado, repeticiones)] de las consultas que se
+    repiten más de max_repeticiones veces (patrón N+1). Se ignoran las
+    sentencias de control de transacción.
+    """
+    conteo = Counter(
+        normalizar_sql(consulta['sql'])
+        for consulta in consultas
+        if not _TRANSACCIONES.match(consulta['sql'])
+    )
+    return [(sql, veces) for sql, veces in conteo.most_common() if veces > max_repeticiones]
+
+
+@contextmanager
+def prohibir_n_mas_uno(max_repeticiones=3, using=DEFAULT_DB_ALIAS):
+    """
+    Captura las consultas del bloque y lanza ConsultasRepetidasError si
+    alguna se repite más de max_repeticiones veces. Pensado para pruebas:
+
+        with prohibir_n_mas_uno():
+            client.get('/api/academico/carreras')
+    """
+    with CaptureQueriesContext(connections[using]) as capturadas:
+        yield capturadas
+
+    repetidas = consultas_repetidas(capturadas.captured_queries, max_repeticiones)
+    if repetidas:
+        detalle = '\n'.join(f'  {veces}x {sql}' for sql, veces in repetidas)
+        raise ConsultasRepetidasError(
+            f'Consultas repetidas (posible N+1, máximo {max_repeticiones}):\n{detalle}'
+        )
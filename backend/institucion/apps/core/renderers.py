@@ -0,0 +1,62 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import fast_json
+
+try:
+    import msgpack
+except ImportError:  # Dependencia opcional: sin msgpack solo se ofrece JSON
+    msgpack = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer con orjson (ver apps.core.fast_json): la misma salida que
+    el de DRF, con `encoder_class` para lo que no es nativo. Delega en el
+    de DRF si se pide indentación (p. ej. la API navegable), si
+    UNICODE_JSON, COMPACT_JSON o STRICT_JSON no tienen su valor por
+    defecto, o si orjson no puede codificar los datos (enteros de más de
+    64 bits). Un float NaN se codifica como null en lugar de fallar.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if (indent is not None or self.ensure_ascii or not self.compact or not self.strict
+                or not fast_json.disponible()):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            contenido = fast_json.dumps(data, default=self.encoder_class().default)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Como JSONRenderer: U+2028 y U+2029 escapados (subconjunto estricto de JavaScript)
+        return contenido.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer MessagePack (`Accept: application/msgpack` o `?format=msgpack`).
+    Los tipos que JSON no admite directamente (fechas, Decimal, UUID...) se
+    convierten igual que en JSONRenderer.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=JSONEncoder().default)
+
+
+def get_renderer_classes(base=None):
+    """Renderers `base` (por defecto los de DRF) más MessagePack si msgpack está instalado."""
+    clases = list(api_settings.DEFAULT_RENDERER_CLASSES if base is None else base)
+    if msgpack is not None:
+        clases.append(MessagePackRenderer)
+    return clases
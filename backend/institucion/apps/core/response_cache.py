@@ -0,0 +1,100 @@
+import hashlib
+import json
+import threading
+from collections import defaultdict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .cache_utils import cache_compartida, get_dependency_version
+
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+
+def _registrar(nombre, evento):
+    with _stats_lock:
+        _stats[nombre][evento] += 1
+
+
+def response_cache_stats():
+    """Contadores de aciertos/fallos por viewset (del proceso actual)."""
+    with _stats_lock:
+        return {nombre: dict(valores) for nombre, valores in _stats.items()}
+
+
+def reset_response_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def response_cache_timeout():
+    """
+    RESPONSE_CACHE_TIMEOUT, o 0 si la cache no es compartida: una escritura
+    solo invalidaría las entradas del worker que la atendió.
+    """
+    if not cache_compartida():
+        return 0
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60)
+
+
+def viewset_label(view):
+    return f"{type(view).__module__}.{type(view).__name__}"
+
+
+def request_signature(request, kwargs):
+    """Hash de los parámetros normalizados, los kwargs de la URL y el usuario."""
+    user = getattr(request, 'user', None)
+    scope = user.pk if user is not None and user.is_authenticated else 'anon'
+    params = sorted((k, v) for k, v in request.query_params.lists())
+    firma = json.dumps([params, sorted(kwargs.items()), scope], default=str)
+    return hashlib.md5(firma.encode('utf-8')).hexdigest()
+
+
+def build_response_cache_key(view, request, kwargs):
+    """Clave: viewset + acción + versión de los modelos + firma de la petición."""
+    version = get_dependency_version(view.queryset.model)
+    digest = request_signature(request, kwargs)
+    return f"response:{viewset_label(view)}:{view.action}:{version}:{digest}"
+
+
+def cache_response(view_method):
+    """
+    Cache de lectura para acciones GET de BaseViewSet.
+    Guarda response.data (no el contenido renderizado), de modo que un
+    acierto evita la consulta y la serialización pero respeta la
+    negociación de contenido. Las escrituras sobre el modelo o sus
+    ForeignKey cambian la versión de la clave e invalidan las entradas.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        timeout = response_cache_timeout()
+        # Evita cachear dos veces cuando una acción llama a otra (activas -> datatable)
+        if (not timeout or not self.cache_responses or request.method != 'GET'
+                or getattr(self, '_response_cache_activo', False)):
+            return view_method(self, request, *args, **kwargs)
+
+        key = build_response_cache_key(self, request, kwargs)
+        nombre = viewset_label(self)
+        cached = cache.get(key)
+        if cached is not None:
+            _registrar(nombre, 'hits')
+            response = Response(cached)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _registrar(nombre, 'misses')
+        self._response_cache_activo = True
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        finally:
+            self._response_cache_activo = False
+
+        if response.status_code == 200:
+            cache.set(key, response.data, timeout)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    return wrapper
@@ -0,0 +1,170 @@
+import re
+import unicodedata
+
+from django.db import connections
+from django.db.models import CharField, F, FloatField, Func, Q
+from django.db.models.functions import Greatest
+
+
+def normalizar_texto(value):
+    """Quita tildes y pasa a mayúsculas, igual que UPPER(f_unaccent(...))."""
+    descompuesto = unicodedata.normalize('NFKD', value)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).upper()
+
+
+class UnaccentUpper(Func):
+    """
+    UPPER(f_unaccent(campo)). f_unaccent es un wrapper IMMUTABLE de unaccent
+    creado en la migración core.0001, lo que permite indexar la expresión.
+    """
+    template = "UPPER(f_unaccent(%(expressions)s))"
+    output_field = CharField()
+
+
+class BaseSearchEngine:
+    """
+    Motor de búsqueda para datatable.
+    Las subclases implementan `filter` y opcionalmente `rank`.
+    """
+    ranked = False
+
+    def __init__(self, search_fields):
+        self.search_fields = list(search_fields or [])
+
+    def supported(self, queryset):
+        return True
+
+    def apply(self, queryset, search):
+        """Filtra el queryset y, si el motor rankea, lo ordena por relevancia."""
+        if not search or not self.search_fields:
+            return queryset
+
+        if not self.supported(queryset):
+            return IcontainsSearchEngine(self.search_fields).apply(queryset, search)
+
+        queryset = self.filter(queryset, search)
+
+        if self.ranked:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            queryset = queryset.annotate(search_rank=self.rank(search)).order_by(
+                '-search_rank', *ordering
+            )
+        return queryset
+
+    def filter(self, queryset, search):
+        raise NotImplementedError
+
+    def rank(self, search):
+        raise NotImplementedError
+
+
+class IcontainsSearchEngine(BaseSearchEngine):
+    """OR de field__icontains sobre search_fields (comportamiento original)."""
+
+    def filter(self, queryset, search):
+        search_query = Q()
+        for field in self.search_fields:
+            search_query |= Q(**{f"{field}__icontains": search})
+        return queryset.filter(search_query)
+
+
+class PostgresSearchEngine(BaseSearchEngine):
+    """Base de los motores que requieren extensiones de Postgres."""
+
+    def supported(self, queryset):
+        return connections[queryset.db].vendor == 'postgresql'
+
+
+class TrigramSearchEngine(PostgresSearchEngine):
+    """
+    Búsqueda por subcadena insensible a tildes usando índices GIN pg_trgm
+    sobre UPPER(f_unaccent(campo)). Rankea por similitud de trigramas.
+    """
+    ranked = True
+
+    def filter(self, queryset, search):
+        termino = normalizar_texto(search)
+        search_query = Q()
+        for i, field in enumerate(self.search_fields):
+            alias = f"_trgm_{i}"
+            queryset = queryset.alias(**{alias: UnaccentUpper(F(field))})
+            search_query |= Q(**{f"{alias}__contains": termino})
+        return queryset.filter(search_query)
+
+    def rank(self, search):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        termino = normalizar_texto(search)
+        similitudes = [
+            TrigramSimilarity(UnaccentUpper(F(field)), termino)
+            for field in self.search_fields
+        ]
+        if len(similitudes) == 1:
+            return similitudes[0]
+        return Greatest(*similitudes, output_field=FloatField())
+
+
+class FullTextSearchEngine(PostgresSearchEngine):
+    """
+    Búsqueda de texto completo con la configuración `es_unaccent`
+    (spanish + unaccent). Cada término se busca por prefijo para soportar
+    búsqueda mientras se escribe. Rankea con ts_rank.
+    """
+    ranked = True
+    config = 'es_unaccent'
+
+    def vector(self, field):
+        from django.contrib.postgres.search import SearchVector
+
+        return SearchVector(field, config=self.config)
+
+    def query(self, search):
+        from django.contrib.postgres.search import SearchQuery
+
+        terminos = re.findall(r'\w+', search)
+        raw = ' & '.join(f"{t}:*" for t in terminos)
+        return SearchQuery(raw, config=self.config, search_type='raw')
+
+    def filter(self, queryset, search):
+        if not re.search(r'\w', search):
+            return queryset.none()
+
+        consulta = self.query(search)
+        search_query = Q()
+        for i, field in enumerate(self.search_fields):
+            alias = f"_fts_{i}"
+            queryset = queryset.alias(**{alias: self.vector(field)})
+            search_query |= Q(**{alias: consulta})
+        return queryset.filter(search_query)
+
+    def rank(self, search):
+        from django.contrib.postgres.search import SearchRank
+
+        consulta = self.query(search)
+        ranks = [SearchRank(self.vector(field), consulta) for field in self.search_fields]
+        rank = ranks[0]
+        for otro in ranks[1:]:
+            rank = rank + otro
+        return rank
+
+
+SEARCH_ENGINES = {
+    'icontains': IcontainsSearchEngine,
+    'trigram': TrigramSearchEngine,
+    'fulltext': FullTextSearchEngine,
+}
+
+
+def get_search_engine(engine, search_fields):
+    """
+    Retorna una instancia del motor indicado por nombre o clase.
+    None usa el motor icontains.
+    """
+    if engine is None:
+        engine = 'icontains'
+    if isinstance(engine, str):
+        try:
+            engine = SEARCH_ENGINES[engine]
+        except KeyError:
+            raise ValueError(f"Motor de búsqueda desconocido: {engine}")
+    return engine(search_fields)
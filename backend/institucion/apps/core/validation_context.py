@@ -0,0 +1,58 @@
+from collections import defaultdict
+
+from django.db.models import Value
+from django.db.models.functions import Upper
+
+
+def clave_nombre(nombre):
+    """
+    Clave de comparación insensible a mayúsculas (equivalente a iexact).
+    Acepta valores sin limpiar: un número se compara como lo guardaría
+    CharField (5 -> '5').
+    """
+    if nombre is None:
+        return ''
+    return str(nombre).strip().upper()
+
+
+class UniqueNameContext:
+    """
+    Resuelve en una sola consulta las colisiones de nombre (insensibles a
+    mayúsculas, incluyendo registros inactivos) para un conjunto de nombres.
+    Los formularios lo consultan en lugar de hacer una consulta por fila y
+    registran los nombres aceptados para detectar duplicados dentro del lote.
+
+    La base de datos aplica UPPER() a ambos lados, como nombre__iexact: en
+    SQLite o con collation C, UPPER() no convierte letras acentuadas y
+    compararlo con str.upper() dejaría pasar "Educación" repetido. Los
+    nombres deben llegar normalizados como se guardarán.
+    """
+
+    def __init__(self, model, nombres, field='nombre', values=()):
+        self.model = model
+        self.field = field
+        self._por_clave = defaultdict(list)
+
+        buscados = {str(n).strip() for n in nombres if clave_nombre(n)}
+        if buscados:
+            filas = (
+                model.all_objects
+                .annotate(_clave_nombre=Upper(field))
+                .filter(_clave_nombre__in=[Upper(Value(n)) for n in sorted(buscados)])
+                .values('pk', field, *values)
+            )
+            for fila in filas:
+                self._por_clave[clave_nombre(fila[field])].append(fila)
+
+    def conflicto(self, nombre, exclude_pk=None):
+        """Retorna la fila que colisiona con `nombre` (excepto exclude_pk) o None."""
+        for fila in self._por_clave.get(clave_nombre(nombre), []):
+            if exclude_pk is None or fila['pk'] != exclude_pk:
+                return fila
+        return None
+
+    def registrar(self, nombre, pk=None, **extra):
+        """Registra un nombre aceptado en el lote para las filas siguientes."""
+        fila = {'pk': pk, self.field: nombre}
+        fila.update(extra)
+        self._por_clave[clave_nombre(nombre)].append(fila)
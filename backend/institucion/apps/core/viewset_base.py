@@ -1,6 +1,22 @@
+from django.conf import settings
+from django.core.exceptions import FieldError, ValidationError
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from .keyset import CursorInvalido
+from .response_cache import cache_response, viewset_label
+from .conditional import conditional_response
+from .cache_utils import bump_model_version_on_commit
+from .export import EXPORT_FORMATS, iter_export
+from .importacion import inferir_formato, leer_filas
+from .fast_serializer import get_representation_plan
+from .projection import CamposNoPermitidos, aplicar_only, campos_del_modelo, parse_fields, rutas_de_serializer
+from .columnar import LAYOUT_COLUMNAR, LAYOUT_OBJECTS, LayoutNoSoportado, a_columnas, filas_de_dicts, parse_layout
+from .renderers import get_renderer_classes
+from .instrumentation import medir_serializacion, metricas_actuales, registrar_vista
 
 
 class BaseViewSet(viewsets.ModelViewSet):
@@ -8,6 +24,31 @@ class BaseViewSet(viewsets.ModelViewSet):
     ViewSet base con operaciones comunes y soft delete.
     """
     form_class = None  # Debe definirse en la subclase
+    count_strategy = None  # 'exact', 'estimated' o 'cached'; None usa settings
+    count_mode = None  # 'sequential', 'parallel' o 'window'; None usa settings
+    projection_fields = None  # Permitidos en ?fields= (datatable y export); None: modelo + export_fields
+    search_engine = 'icontains'  # 'icontains', 'trigram' o 'fulltext'
+    cache_responses = True  # Cache de lectura (ver apps.core.response_cache)
+    conditional_get = True  # ETag / Last-Modified (ver apps.core.conditional)
+    export_fields = None  # Campos de export; None usa los campos concretos del modelo
+    export_chunk_size = 2000
+    importador_class = None  # Subclase de apps.core.importacion.BaseImportador
+    fast_list_actions = ('list', 'datatable', 'activas', 'inactivas')  # Ver apps.core.fast_serializer
+    query_budgets = {}  # Acción -> máximo de consultas (ver apps.core.instrumentation)
+    renderer_classes = get_renderer_classes()  # JSON (+ MessagePack si está instalado)
+    
+    def initial(self, request, *args, **kwargs):
+        """Identifica la acción y su presupuesto de consultas para la instrumentación."""
+        registrar_vista(viewset_label(self), self.action, self.query_budgets.get(self.action))
+        super().initial(request, *args, **kwargs)
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Renderiza dentro del viewset para medir la serialización."""
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if isinstance(response, Response) and metricas_actuales() is not None:
+            with medir_serializacion():
+                response.render()
+        return response
     
     def get_serializer_context(self):
         """Agrega la acción al contexto del serializer."""
@@ -20,7 +61,11 @@ class BaseViewSet(viewsets.ModelViewSet):
         form = self.form_class(data=request.data)
         
         if form.is_valid():
-            instance = form.save_with_transaction()
+            try:
+                instance = form.save_with_transaction()
+            except ValidationError:
+                # Conflicto de unicidad detectado por la base de datos
+                return Response({'errors': form.get_errors_as_dict()}, status=status.HTTP_400_BAD_REQUEST)
             serializer = self.get_serializer(instance)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         
@@ -35,7 +80,10 @@ class BaseViewSet(viewsets.ModelViewSet):
         form = self.form_class(data=request.data, instance=instance)
         
         if form.is_valid():
-            instance = form.save_with_transaction()
+            try:
+                instance = form.save_with_transaction()
+            except ValidationError:
+                return Response({'errors': form.get_errors_as_dict()}, status=status.HTTP_400_BAD_REQUEST)
             serializer = self.get_serializer(instance)
             return Response(serializer.data)
         
@@ -50,10 +98,18 @@ class BaseViewSet(viewsets.ModelViewSet):
         instance.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
     
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         """Lista registros usando datatable."""
         return self.datatable(request)
     
+    @conditional_response
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        """Obtiene un registro (cacheado hasta la próxima escritura)."""
+        return super().retrieve(request, *args, **kwargs)
+    
     @action(detail=True, methods=['patch'])
     def restore(self, request, pk=None):
         """Restaura un registro inactivo."""
@@ -86,6 +142,8 @@ class BaseViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
     
     @action(detail=False, methods=['get'])
+    @conditional_response
+    @cache_response
     def activas(self, request):
         """Lista solo registros activos."""
         request.query_params._mutable = True
@@ -94,6 +152,8 @@ class BaseViewSet(viewsets.ModelViewSet):
         return self.datatable(request)
     
     @action(detail=False, methods=['get'])
+    @conditional_response
+    @cache_response
     def inactivas(self, request):
         """Lista solo registros inactivos."""
         request.query_params._mutable = True
@@ -102,30 +162,416 @@ class BaseViewSet(viewsets.ModelViewSet):
         return self.datatable(request)
     
     @action(detail=False, methods=['get'])
+    @conditional_response
+    @cache_response
     def datatable(self, request):
-        """Endpoint para datatables con paginación y búsqueda."""
-        fields = request.query_params.get('fields', '').split(',') if request.query_params.get('fields') else None
-        search = request.query_params.get('search', None)
-        search_fields = getattr(self, 'search_fields', [])
-        limit = int(request.query_params.get('limit', 10))
-        offset = int(request.query_params.get('offset', 0))
-        
-        filters = self.get_datatable_filters(request)
-        
-        result = self.queryset.model.objects.datatable(
-            fields=fields,
-            filters=filters,
-            search=search,
-            search_fields=search_fields,
-            limit=limit,
-            offset=offset
+        """
+        Endpoint para datatables con paginación y búsqueda.
+        Si se envía el parámetro `cursor` (vacío para la primera página)
+        se usa paginación por cursor y la respuesta incluye `next_cursor`.
+        Con `layout=columnar` las filas se envían como listas de valores
+        (`columns` y `rows`) en lugar de `data`.
+        """
+        try:
+            layout = self.get_layout(request)
+            params, plan = self.get_datatable_params(request)
+            result = self.queryset.model.objects.datatable(**params)
+        except (CursorInvalido, CamposNoPermitidos, LayoutNoSoportado) as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(self.representar_datatable(result, plan, params['fields'], layout))
+    
+    def get_datatable_params(self, request):
+        """
+        Parámetros de BaseManager.datatable a partir del request, junto con
+        el plan de representación (None si no aplica). Los comparte la
+        variante asíncrona (ver apps.core.async_viewset).
+        Lanza CamposNoPermitidos si `fields` no está en la lista permitida
+        y LayoutNoSoportado si `layout` no es válido.
+        """
+        fields = self.get_requested_fields(request)
+        columnar = self.get_layout(request) == LAYOUT_COLUMNAR
+        plan = None if fields else self.get_representation_plan()
+        params = {
+            'fields': plan.paths if plan else fields,
+            'filters': self.get_datatable_filters(request),
+            'search': request.query_params.get('search', None),
+            'search_fields': getattr(self, 'search_fields', []),
+            'limit': int(request.query_params.get('limit', 10)),
+            'offset': int(request.query_params.get('offset', 0)),
+            'cursor': request.query_params.get('cursor') or None,
+            'use_cursor': 'cursor' in request.query_params,
+            'count_strategy': self.count_strategy,
+            'count_mode': self.count_mode,
+            'search_engine': self.search_engine,
+            # Con fields y layout columnar las tuplas de values_list ya son las filas
+            'as_tuples': plan is not None or bool(fields and columnar),
+            # Sin plan ni fields se serializan instancias: solo lo que se representa
+            'only': None if (fields or plan) else self.get_projection(),
+        }
+        return params, plan
+    
+    def representar_datatable(self, result, plan, fields=None, layout=LAYOUT_OBJECTS):
+        """
+        Convierte result['data'] con el plan, o con el serializer si no hay
+        plan ni `fields` (con fields ya viene de values()). En layout
+        columnar la respuesta lleva `columns` y `rows` en lugar de `data`.
+        """
+        columnar = layout == LAYOUT_COLUMNAR
+        with medir_serializacion():
+            if plan:
+                if columnar:
+                    return a_columnas(result, *plan.render_columnar(result['data']))
+                result['data'] = plan.render(result['data'])
+            elif fields:
+                if columnar:
+                    return a_columnas(result, fields, result['data'])
+            elif columnar:
+                serializer = self.get_serializer(result['data'], many=True)
+                columns = [nombre for nombre, field in serializer.child.fields.items() if not field.write_only]
+                return a_columnas(result, columns, filas_de_dicts(serializer.data, columns))
+            elif result['data']:
+                serializer = self.get_serializer(result['data'], many=True)
+                result['data'] = serializer.data
+        return result
+    
+    def get_layout(self, request):
+        """Layout de la respuesta de datatable (`?layout=`). Lanza LayoutNoSoportado."""
+        return parse_layout(request.query_params.get('layout'))
+    
+    def get_datatable_filters(self, request):
+        return {}
+    
+    def get_projection_fields(self):
+        """Campos que acepta ?fields=: los del modelo (sin derivados) y los de export."""
+        if self.projection_fields is not None:
+            return list(self.projection_fields)
+        model = self.queryset.model
+        return list(dict.fromkeys([*campos_del_modelo(model), *self.get_export_fields()]))
+    
+    def get_requested_fields(self, request):
+        """Campos de ?fields= validados, o None. Lanza CamposNoPermitidos."""
+        return parse_fields(request.query_params.get('fields'), self.get_projection_fields())
+    
+    def get_projection(self):
+        """Rutas que el serializer lee en la acción actual (None si no se deducen)."""
+        return rutas_de_serializer(self.get_serializer_class(), self.action)
+    
+    def proyectar(self, queryset):
+        """Aplica only() con lo que el serializer representa en la acción actual."""
+        rutas = self.get_projection()
+        return aplicar_only(queryset, rutas) if rutas else queryset
+    
+    def get_representation_plan(self):
+        """
+        Plan compilado para representar el listado desde values_list() sin
+        instanciar modelos; None si la acción o el serializer no lo admiten.
+        """
+        if self.action not in self.fast_list_actions:
+            return None
+        return get_representation_plan(self.get_serializer_class(), self.action)
+    
+    def get_export_fields(self):
+        """Campos exportados por defecto (sin los campos derivados)."""
+        if self.export_fields:
+            return list(self.export_fields)
+        model = self.queryset.model
+        return [
+            field.attname for field in model._meta.concrete_fields
+            if field.name not in model.campos_derivados
+        ]
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Exporta todos los registros en CSV (`output=csv`, por defecto) o
+        NDJSON (`output=ndjson`) como respuesta en streaming. Aplica los
+        mismos filtros y búsqueda que datatable y usa memoria constante.
+        """
+        formato = request.query_params.get('output', 'csv')
+        if formato not in EXPORT_FORMATS:
+            return Response(
+                {'error': f'Formato no soportado. Opciones: {", ".join(EXPORT_FORMATS)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            fields = self.get_requested_fields(request) or self.get_export_fields()
+        except CamposNoPermitidos as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        queryset = self.queryset.model.objects.datatable_queryset(
+            filters=self.get_datatable_filters(request),
+            search=request.query_params.get('search', None),
+            search_fields=getattr(self, 'search_fields', []),
+            search_engine=self.search_engine
         )
+        if not queryset.ordered:
+            queryset = queryset.order_by('-id')
         
-        if not fields and result['data']:
-            serializer = self.get_serializer(result['data'], many=True)
-            result['data'] = serializer.data
+        # values() resuelve los campos aquí, antes de enviar los encabezados:
+        # un campo inexistente no puede fallar a mitad del streaming
+        try:
+            filas = iter_export(queryset, fields, formato, chunk_size=self.export_chunk_size)
+        except FieldError as e:
+            return Response({'error': f'Campo no exportable: {e}'}, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response(result)
+        response = StreamingHttpResponse(filas, content_type=EXPORT_FORMATS[formato])
+        nombre = self.queryset.model._meta.model_name
+        response['Content-Disposition'] = f'attachment; filename="{nombre}.{formato}"'
+        return response
     
-    def get_datatable_filters(self, request):
+    @action(detail=False, methods=['post'])
+    def import_file(self, request):
+        """
+        Importa un archivo (campo multipart `file`) con importador_class.
+        Parámetros: `input` (csv, json o ndjson; por defecto se infiere de
+        la extensión), `conflictos` (omitir o error) y `dry_run`.
+        """
+        if self.importador_class is None:
+            return Response(
+                {'error': 'Este recurso no admite importación.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        archivo = request.FILES.get('file')
+        if archivo is None:
+            return Response(
+                {'error': 'Se requiere un archivo en el campo "file".'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        formato = request.data.get('input') or inferir_formato(archivo.name)
+        try:
+            importador = self.importador_class(
+                dry_run=str(request.data.get('dry_run', '')).lower() == 'true',
+                conflictos=request.data.get('conflictos', 'omitir')
+            )
+            resultado = importador.importar(leer_filas(archivo, formato))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Archivo ilegible a mitad de camino: 400 con lo ya importado
+        if 'error' in resultado:
+            return Response(resultado, status=status.HTTP_400_BAD_REQUEST)
+        return Response(resultado)
+    
+    # ------------------------------------------------------------------
+    # Operaciones masivas
+    # ------------------------------------------------------------------
+    
+    def get_bulk_items(self, request, key, objetos=False):
+        """
+        Extrae la lista del cuerpo: una lista directa o {key: [...]}.
+        Con objetos=True cada elemento debe ser un objeto (errores por fila).
+        Retorna (items, None) o (None, Response de error).
+        """
+        items = request.data.get(key) if isinstance(request.data, dict) else request.data
+        max_items = getattr(settings, 'BULK_MAX_ITEMS', 1000)
+        
+        if not isinstance(items, list) or not items:
+            return None, Response(
+                {'error': f'Se requiere una lista no vacía en "{key}".'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > max_items:
+            return None, Response(
+                {'error': f'Se permiten como máximo {max_items} elementos por lote.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if objetos:
+            errors = [
+                {'index': index, 'errors': {'__all__': ['El elemento debe ser un objeto.']}}
+                for index, item in enumerate(items) if not isinstance(item, dict)
+            ]
+            if errors:
+                return None, Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        return items, None
+    
+    def get_bulk_ids(self, request):
+        """Lista de ids enteros del cuerpo ({'ids': [...]})."""
+        ids, error = self.get_bulk_items(request, 'ids')
+        if error:
+            return None, error
+        try:
+            return [int(pk) for pk in ids], None
+        except (TypeError, ValueError):
+            return None, Response(
+                {'error': 'Los ids deben ser enteros.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    def validate_bulk_forms(self, forms, errors=None):
+        """
+        Valida los formularios en orden (el contexto de validación registra
+        cada fila aceptada) y retorna la lista de errores por fila.
+        """
+        errors = list(errors or [])
+        for index, form in enumerate(forms):
+            if form is not None and not form.is_valid():
+                errors.append({'index': index, 'errors': form.get_errors_as_dict()})
+        return sorted(errors, key=lambda error: error['index'])
+    
+    def save_bulk_forms(self, forms):
+        """Instancias sin guardar, con pre_save y campos derivados aplicados."""
+        instances = []
+        for form in forms:
+            instance = form.save(commit=False)
+            if hasattr(form, 'pre_save'):
+                form.pre_save(instance)
+            instance.actualizar_campos_derivados()
+            instances.append(instance)
+        return instances
+    
+    def bulk_integrity_error(self):
+        """
+        400 cuando la base de datos rechaza el lote (p. ej. un valor único
+        guardado por otro request tras la validación). No se guardó nada.
+        """
+        return Response(
+            {'error': 'El lote entra en conflicto con registros existentes; no se guardó ningún registro.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    def get_bulk_destroy_errors(self, ids):
+        """
+        Retorna {id: mensaje} con los registros que no pueden eliminarse.
+        Las subclases lo sobrescriben con sus reglas (en una sola consulta).
+        """
         return {}
+    
+    def bulk_ids_errors(self, ids, encontrados, mensajes=None):
+        """Errores por fila para ids inexistentes o rechazados."""
+        mensajes = mensajes or {}
+        errors = []
+        for index, pk in enumerate(ids):
+            if pk not in encontrados:
+                errors.append({'index': index, 'id': pk, 'errors': {'__all__': ['No encontrado.']}})
+            elif pk in mensajes:
+                errors.append({'index': index, 'id': pk, 'errors': {'__all__': [mensajes[pk]]}})
+        return errors
+    
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request):
+        """
+        Crea un lote de registros validando cada fila con form_class.
+        Si alguna fila es inválida no se guarda nada y se retornan los
+        errores por fila; si todas son válidas se insertan con bulk_create
+        en una sola transacción.
+        """
+        rows, error = self.get_bulk_items(request, 'items', objetos=True)
+        if error:
+            return error
+        
+        context = self.form_class.build_validation_context(rows)
+        forms = [self.form_class(data=row, validation_context=context) for row in rows]
+        
+        errors = self.validate_bulk_forms(forms)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        model = self.queryset.model
+        try:
+            with transaction.atomic():
+                instances = self.save_bulk_forms(forms)
+                model.objects.bulk_create(instances)
+                bump_model_version_on_commit(model)
+        except IntegrityError:
+            return self.bulk_integrity_error()
+        
+        serializer = self.get_serializer(instances, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['put'])
+    def bulk_update(self, request):
+        """
+        Actualiza un lote de registros activos (cada fila incluye su `id`).
+        Mismas reglas que bulk_create; escribe con bulk_update.
+        """
+        rows, error = self.get_bulk_items(request, 'items', objetos=True)
+        if error:
+            return error
+        
+        ids = [row.get('id') for row in rows]
+        # Un id que no es entero (p. ej. una lista) no puede buscarse: No encontrado
+        claves = [pk if isinstance(pk, int) and not isinstance(pk, bool) else None for pk in ids]
+        instancias = self.queryset.in_bulk([pk for pk in claves if pk is not None])
+        
+        context = self.form_class.build_validation_context(rows)
+        forms = []
+        errors = []
+        vistos = set()
+        for index, (pk, clave) in enumerate(zip(ids, claves)):
+            if clave not in instancias or clave in vistos:
+                mensaje = 'Id duplicado en el lote.' if clave in vistos else 'No encontrado.'
+                errors.append({'index': index, 'id': pk, 'errors': {'id': [mensaje]}})
+                forms.append(None)
+                continue
+            vistos.add(clave)
+            forms.append(self.form_class(
+                data=rows[index], instance=instancias[clave], validation_context=context
+            ))
+        
+        errors = self.validate_bulk_forms(forms, errors)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        model = self.queryset.model
+        campos = list(self.form_class._meta.fields) + list(model.campos_derivados) + ['updated_at']
+        try:
+            with transaction.atomic():
+                instances = self.save_bulk_forms(forms)
+                ahora = timezone.now()
+                for instance in instances:
+                    instance.updated_at = ahora
+                model.objects.bulk_update(instances, campos)
+                for form, instance in zip(forms, instances):
+                    if hasattr(form, 'post_save'):
+                        form.post_save(instance)
+                bump_model_version_on_commit(model)
+        except IntegrityError:
+            return self.bulk_integrity_error()
+        
+        serializer = self.get_serializer(instances, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['post', 'delete'])
+    def bulk_destroy(self, request):
+        """Soft delete masivo en una sola sentencia UPDATE."""
+        ids, error = self.get_bulk_ids(request)
+        if error:
+            return error
+        
+        model = self.queryset.model
+        encontrados = set(model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        errors = self.bulk_ids_errors(ids, encontrados, self.get_bulk_destroy_errors(ids))
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        with transaction.atomic():
+            count = model.objects.filter(pk__in=ids).update(estado=False, updated_at=timezone.now())
+            bump_model_version_on_commit(model)
+        
+        return Response({'count': count})
+    
+    @action(detail=False, methods=['patch'])
+    def bulk_restore(self, request):
+        """Restauración masiva en una sola sentencia UPDATE."""
+        ids, error = self.get_bulk_ids(request)
+        if error:
+            return error
+        
+        model = self.queryset.model
+        encontrados = set(model.all_objects.filter(pk__in=ids).values_list('pk', flat=True))
+        errors = self.bulk_ids_errors(ids, encontrados)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        with transaction.atomic():
+            count = model.all_objects.filter(pk__in=ids).update(estado=True, updated_at=timezone.now())
+            bump_model_version_on_commit(model)
+        
+        return Response({'count': count})
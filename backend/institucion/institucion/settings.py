@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from corsheaders.defaults import default_headers
 from corsheaders.defaults import default_methods
 
@@ -62,6 +63,7 @@ THIRD_PARTY_APPS = [
 INSTALLED_APPS += THIRD_PARTY_APPS
 
 MIDDLEWARE = [
+    'apps.core.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -104,6 +106,17 @@ REST_FRAMEWORK = {
 
     'PAGE_SIZE': 10,
 
+    # JSON con orjson (misma salida que los de DRF; ver apps.core.fast_json)
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
@@ -138,9 +151,80 @@ DATABASES = {
         'PASSWORD': env('POSTGRES_PASSWORD'),
         'HOST': env('POSTGRES_HOST'),
         'PORT': env('POSTGRES_PORT'),
+        # Con PgBouncer en modo transaction los cursores del lado del
+        # servidor (export) no sobreviven entre transacciones
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool('DB_DISABLE_SERVER_SIDE_CURSORS', default=False),
     }
 }
 
+# Conexiones: 'none' (una por request), 'persistent' (se reutilizan por
+# hilo durante DB_CONN_MAX_AGE segundos, con health checks) o 'pool' (pool
+# acotado del proceso; ver apps.core.db_pool)
+DB_CONNECTION_MODE = env('DB_CONNECTION_MODE', default='none')
+
+if DB_CONNECTION_MODE == 'persistent':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': env.bool('DB_CONN_HEALTH_CHECKS', default=True),
+    })
+elif DB_CONNECTION_MODE == 'pool':
+    DATABASES['default'].update({
+        'ENGINE': 'apps.core.db_pool',
+        'CONN_MAX_AGE': 0,  # Django devuelve la conexión al pool al terminar el request
+        'POOL': {
+            'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+            'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+            'timeout': env.float('DB_POOL_TIMEOUT', default=5.0),
+            'max_idle': env.float('DB_POOL_MAX_IDLE', default=300.0),
+            'max_lifetime': env.float('DB_POOL_MAX_LIFETIME', default=3600.0),
+            'check_idle': env.float('DB_POOL_CHECK_IDLE', default=30.0),
+        },
+    })
+elif DB_CONNECTION_MODE != 'none':
+    raise ImproperlyConfigured("DB_CONNECTION_MODE debe ser 'none', 'persistent' o 'pool'.")
+
+
+# Cache
+# Usar un backend compartido (p. ej. redis://) en producción para que la
+# invalidación por escrituras alcance a todos los workers.
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+# Con una cache local del proceso (locmem, dummy) la cache de respuestas, los
+# GET condicionales (ETag / Last-Modified) y las tablas en memoria
+# (lookup_table) se desactivan (ver apps.core.cache_utils.cache_compartida). True la declara
+# compartida, p. ej. al servir con un solo proceso.
+CACHE_SHARED = env.bool('CACHE_SHARED', default=None)
+
+# Estrategia de conteo de datatable: 'exact', 'estimated' o 'cached'
+DATATABLE_COUNT_STRATEGY = env('DATATABLE_COUNT_STRATEGY', default='exact')
+DATATABLE_COUNT_CACHE_TIMEOUT = env.int('DATATABLE_COUNT_CACHE_TIMEOUT', default=60)
+DATATABLE_COUNT_ESTIMATE_THRESHOLD = env.int('DATATABLE_COUNT_ESTIMATE_THRESHOLD', default=1000)
+# Ejecución del conteo junto a la página: 'sequential', 'parallel' o 'window'
+DATATABLE_COUNT_MODE = env('DATATABLE_COUNT_MODE', default='sequential')
+# Hilos (y conexiones) del modo 'parallel'
+DATATABLE_COUNT_WORKERS = env.int('DATATABLE_COUNT_WORKERS', default=4)
+
+# Cache de respuestas de lectura de BaseViewSet (segundos, 0 lo desactiva).
+# Solo se aplica con una cache compartida (CACHE_URL o CACHE_SHARED)
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=60)
+
+# Máximo de elementos por lote en las acciones bulk_* de BaseViewSet
+BULK_MAX_ITEMS = env.int('BULK_MAX_ITEMS', default=1000)
+
+# Máximo de errores por fila reportados por una importación
+IMPORT_MAX_ERRORS = env.int('IMPORT_MAX_ERRORS', default=1000)
+
+# Instrumentación (Server-Timing y /metrics); ver apps.core.instrumentation
+INSTRUMENTATION_ENABLED = env.bool('INSTRUMENTATION_ENABLED', default=True)
+# Si se define, /metrics exige `Authorization: Bearer <token>`; si no, solo
+# responde con DEBUG o a las IP de INTERNAL_IPS
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+INTERNAL_IPS = env.list('INTERNAL_IPS', default=[])
+# Lanzar QueryBudgetExceeded en lecturas (en lugar de solo registrar un warning)
+QUERY_BUDGET_RAISE = env.bool('QUERY_BUDGET_RAISE', default=env.bool('DEBUG', default=False))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -17,9 +17,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 from django.urls import include
+from apps.core.instrumentation import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api-auth/', include('rest_framework.urls')),
     path('api/academico/', include('apps.academico.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
@@ -2,7 +2,7 @@
  * Servicio para gestionar Carreras
  */
 
-import { get, post, put, patch, del } from '@/shared/core/api';
+import { get, getDatatable, post, put, patch, del } from '@/shared/core/api';
 import type { DatatableResponse, PaginationParams } from '@/shared/types/api';
 import type { Carrera, CarreraDetalle, CreateCarreraDto, UpdateCarreraDto } from '@/shared/types/carrera';
 
@@ -22,7 +22,7 @@ export const carreraService = {
    * GET /api/academico/carreras
    */
   async list(params?: ListCarrerasParams): Promise<DatatableResponse<Carrera>> {
-    return get<DatatableResponse<Carrera>>('/carreras', params);
+    return getDatatable<Carrera>('/carreras', params);
   },
 
   /**
@@ -30,7 +30,7 @@ export const carreraService = {
    * GET /api/academico/carreras/inactivas
    */
   async listInactivas(params?: ListCarrerasParams): Promise<DatatableResponse<Carrera>> {
-    return get<DatatableResponse<Carrera>>('/carreras/inactivas', params);
+    return getDatatable<Carrera>('/carreras/inactivas', params);
   },
 
   /**
@@ -3,7 +3,7 @@
  * Ejemplo de implementación usando api-core
  */
 
-import { get, post, put, patch, del } from '@/shared/core/api';
+import { get, getDatatable, post, put, patch, del } from '@/shared/core/api';
 import type { DatatableResponse, PaginationParams } from '@/shared/types/api';
 import type { Modalidad, CreateModalidadDto, UpdateModalidadDto } from '@/shared/types/modalidad';
 
@@ -16,7 +16,7 @@ export const modalidadService = {
    * GET /api/academico/modalidades
    */
   async list(params?: PaginationParams): Promise<DatatableResponse<Modalidad>> {
-    return get<DatatableResponse<Modalidad>>('/modalidades', params);
+    return getDatatable<Modalidad>('/modalidades', params);
   },
 
   /**
@@ -24,7 +24,7 @@ export const modalidadService = {
    * GET /api/academico/modalidades/inactivas
    */
   async listInactivas(params?: PaginationParams): Promise<DatatableResponse<Modalidad>> {
-    return get<DatatableResponse<Modalidad>>('/modalidades/inactivas', params);
+    return getDatatable<Modalidad>('/modalidades/inactivas', params);
   },
 
   /**
@@ -80,7 +80,7 @@ export const modalidadService = {
    * GET /api/academico/modalidades/activas
    */
   async getActivas(): Promise<Modalidad[]> {
-    const response = await get<DatatableResponse<Modalidad>>('/modalidades/activas');
+    const response = await getDatatable<Modalidad>('/modalidades/activas');
     return response.data;
   },
 };
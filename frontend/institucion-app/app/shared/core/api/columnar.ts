@@ -0,0 +1,59 @@
+/**
+ * Datatable en layout columnar
+ */
+
+import type {
+  ColumnarDatatableResponse,
+  DatatableResponse,
+  PaginationParams,
+} from '@/shared/types/api';
+import { get } from './client';
+
+/**
+ * Type guard para verificar si la respuesta viene en layout columnar
+ */
+export function isColumnar<T>(
+  response: ColumnarDatatableResponse | DatatableResponse<T>
+): response is ColumnarDatatableResponse {
+  return 'columns' in response && 'rows' in response;
+}
+
+/**
+ * Convierte una respuesta columnar (`columns` + `rows`) en la respuesta
+ * habitual de datatable con un objeto por fila en `data`
+ */
+export function decodeColumnar<T>(
+  response: ColumnarDatatableResponse
+): DatatableResponse<T> {
+  const { columns, rows, ...rest } = response;
+  const data = rows.map((row) => {
+    const item: Record<string, unknown> = {};
+    for (let i = 0; i < columns.length; i++) {
+      item[columns[i]] = row[i];
+    }
+    return item as T;
+  });
+
+  return { ...rest, data };
+}
+
+/**
+ * Función GET para endpoints de datatable (list, datatable, activas,
+ * inactivas). Pide `layout=columnar`, que evita repetir las claves en cada
+ * fila, y retorna la respuesta ya decodificada
+ *
+ * @param endpoint - Ruta del endpoint (ej: '/carreras' o '/carreras/inactivas')
+ * @param params - Parámetros de paginación, búsqueda y filtros
+ * @returns Promise con la respuesta de datatable
+ */
+export async function getDatatable<T>(
+  endpoint: string,
+  params?: PaginationParams
+): Promise<DatatableResponse<T>> {
+  const response = await get<ColumnarDatatableResponse | DatatableResponse<T>>(
+    endpoint,
+    { layout: 'columnar', ...params }
+  );
+
+  return isColumnar(response) ? decodeColumnar<T>(response) : response;
+}
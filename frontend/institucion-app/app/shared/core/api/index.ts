@@ -9,5 +9,8 @@ export { apiConfig } from '../config';
 // Cliente HTTP
 export { request, get, post, put, patch, del } from './client';
 
+// Datatable en layout columnar
+export { getDatatable, decodeColumnar } from './columnar';
+
 // Manejo de errores
 export { formatApiErrors, isApiError } from './errors';
@@ -15,6 +15,19 @@ export interface DatatableResponse<T> {
   data: T[];
   count: number; 
   total: number; 
+  total_exact?: boolean; // false si total es una estimación
+  next_cursor?: string | null; // Solo en paginación por cursor
+}
+
+// Respuesta de datatable con `layout=columnar`: una lista de valores por
+// fila en el orden de `columns` (ver decodeColumnar)
+export interface ColumnarDatatableResponse {
+  columns: string[];
+  rows: unknown[][];
+  count: number;
+  total: number;
+  total_exact?: boolean;
+  next_cursor?: string | null;
 }
 
 // Estructura de errores de la API
@@ -31,8 +44,10 @@ export interface ApiDetailError {
 export interface PaginationParams {
   limit?: number;
   offset?: number;
+  cursor?: string; // Vacío para la primera página en modo cursor
   search?: string;
   fields?: string;
+  layout?: 'objects' | 'columnar'; // Formato de la respuesta de datatable
   [key: string]: string | number | boolean | undefined;
 }
 